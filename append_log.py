@@ -1,10 +1,16 @@
-import datetime
+"""Add an entry to VERIFICATION_LOG.md.
 
-log_entry = f"""
-## {datetime.datetime.now().strftime('%Y-%m-%d')} - Feature Expansion: Cyber Deck Builder
-**Agent:** Jules
-**Action:** Implemented a new game module `Cyber Deck Builder` from scratch and registered it in `js/main.js`.
-**Outcome:** Added new Canvas-based game with card mechanics. Fixed block logic and input event propagation. Added verification script `verify_cyber_deck_builder.py`. Verified successfully.
+Entries are stored in verification/.harness/results.db and the log is rendered
+from there, so only new rows are appended:
+
+    python append_log.py --agent Jules --action "Implemented X" --outcome "Verified successfully." --notes "..."
 """
-with open('VERIFICATION_LOG.md', 'a') as f:
-    f.write(log_entry)
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "verification"))
+
+from harness_results import main
+
+if __name__ == "__main__":
+    sys.exit(main(["add", *sys.argv[1:]]))
@@ -916,6 +916,10 @@ export default class ArcadeHub {
         // Render
         if (this.renderer && this.camera) {
             this.renderer.render(this.scene, this.camera);
+            if (!this.firstFrameMarked) {
+                this.firstFrameMarked = true;
+                performance.mark('hub:first-frame');
+            }
         }
 
         // Logic
@@ -210,6 +210,37 @@ function showToast(msg) {
     ToastManager.getInstance().show(msg);
 }
 
+// --- Lifecycle Signals ---
+// Explicit milestones for tooling (e.g. the verification harness) to await
+// instead of guessing with fixed timeouts. Each signal keeps a counter so a
+// waiter can snapshot it before acting and resolve on the next occurrence.
+// Signals: hub-ready, game-initialized, first-frame-drawn, shutdown-complete, menu-ready.
+const lifecycle = {
+    counts: {},
+    last: {},
+    waiters: [],
+    emit(name, detail = {}) {
+        const count = (this.counts[name] || 0) + 1;
+        this.counts[name] = count;
+        this.last[name] = { ...detail, count, time: performance.now() };
+        this.waiters = this.waiters.filter(w => {
+            if (w.name !== name || count <= w.after) return true;
+            w.resolve(this.last[name]);
+            return false;
+        });
+        window.dispatchEvent(new CustomEvent(`minigamehub:${name}`, { detail: this.last[name] }));
+    },
+    count(name) {
+        return this.counts[name] || 0;
+    },
+    // Resolves on the first occurrence of `name` after the `after`-th one.
+    waitFor(name, after = 0) {
+        if (this.count(name) > after) return Promise.resolve(this.last[name]);
+        return new Promise(resolve => this.waiters.push({ name, after, resolve }));
+    }
+};
+let pendingFirstFrame = null;
+
 // --- Game Loop ---
 function mainLoop(timestamp) {
     const deltaTime = (timestamp - lastTime) / 1000;
@@ -233,6 +264,11 @@ function mainLoop(timestamp) {
                 if (currentGameInstance.update) currentGameInstance.update(deltaTime);
                 if (currentGameInstance.draw) currentGameInstance.draw();
             }
+            if (pendingFirstFrame) {
+                performance.mark(`game:${pendingFirstFrame}:first-frame`);
+                lifecycle.emit('first-frame-drawn', { gameId: pendingFirstFrame });
+                pendingFirstFrame = null;
+            }
             break;
         case AppState.PAUSED:
             // Keep drawing the game so it doesn't disappear, but do NOT update state
@@ -254,7 +290,11 @@ function mainLoop(timestamp) {
 async function transitionToState(newState, context = {}) {
     if (currentState === AppState.TRANSITIONING) return;
 
-    if (currentState === AppState.IN_GAME || currentState === AppState.PAUSED) {
+    // User Timing marks for exit latency: shutdown-start -> shutdown-end -> menu-ready.
+    const leavingGame = currentState === AppState.IN_GAME || currentState === AppState.PAUSED;
+    const leavingId = leavingGame ? lifecycle.last['game-initialized']?.gameId : null;
+    if (leavingGame) {
+        performance.mark(`game:${leavingId}:shutdown-start`);
         if (currentGameInstance && currentGameInstance.shutdown) {
             try { await currentGameInstance.shutdown(); } catch (e) { console.error("Error shutting down:", e); }
         }
@@ -263,7 +303,10 @@ async function transitionToState(newState, context = {}) {
             mobileControls = null;
         }
         currentGameInstance = null;
+        pendingFirstFrame = null;
         document.querySelectorAll(".game-container").forEach(el => el.classList.add("hidden"));
+        performance.mark(`game:${leavingId}:shutdown-end`);
+        lifecycle.emit('shutdown-complete');
     }
 
     if (newState === AppState.MENU) {
@@ -307,6 +350,8 @@ async function transitionToState(newState, context = {}) {
             document.getElementById('menu-grid')?.classList.remove('hidden');
         }
         currentState = AppState.MENU;
+        if (leavingId) performance.mark(`game:${leavingId}:menu-ready`);
+        lifecycle.emit('menu-ready');
     }
 
     if (newState === AppState.TROPHY_ROOM) {
@@ -334,10 +379,13 @@ async function transitionToState(newState, context = {}) {
                     trContainer.style.display = 'none';
                     transitionToState(AppState.MENU);
                 });
+                lifecycle.emit('game-initialized', { gameId: 'trophy-room', ok: true });
+                requestAnimationFrame(() => lifecycle.emit('first-frame-drawn', { gameId: 'trophy-room' }));
             });
         } catch (err) {
             console.error("Trophy Room Load Error", err);
             new PlaceholderGame().init(trContainer);
+            lifecycle.emit('game-initialized', { gameId: 'trophy-room', ok: false });
         }
         currentState = AppState.TROPHY_ROOM;
         return;
@@ -355,6 +403,7 @@ async function transitionToState(newState, context = {}) {
             return;
         }
 
+        performance.mark(`game:${gameId}:enter-start`);
         currentState = AppState.TRANSITIONING;
         if (arcadeHub) arcadeHub.pause();
         document.getElementById("menu").classList.add("hidden");
@@ -372,15 +421,22 @@ async function transitionToState(newState, context = {}) {
         soundManager.playSound('click');
         soundManager.setBGMVolume(0.02);
 
+        let initOk = true;
+        // User Timing marks for load profiling:
+        // enter-start -> import-start -> import-end -> construct-end -> init-end -> first-frame.
+        performance.mark(`game:${gameId}:import-start`);
         try {
             let GameClass = null;
             if (gameInfo.importFn) {
                 const module = await gameInfo.importFn();
                 GameClass = module.default;
             }
+            performance.mark(`game:${gameId}:import-end`);
             if (GameClass) {
                 currentGameInstance = new GameClass();
+                performance.mark(`game:${gameId}:construct-end`);
                 if (currentGameInstance.init) await currentGameInstance.init(container);
+                performance.mark(`game:${gameId}:init-end`);
 
                 if (!gameInfo.noDpad) {
                     mobileControls = new MobileControls(container);
@@ -388,6 +444,7 @@ async function transitionToState(newState, context = {}) {
                 gameStartTime = performance.now(); // Start Timer
             } else { throw new Error("Game class failed to load"); }
         } catch (err) {
+            initOk = false;
             console.error(`Failed to init ${gameId}:`, err);
             currentGameInstance = new PlaceholderGame();
             currentGameInstance.text = "ERROR";
@@ -401,6 +458,8 @@ async function transitionToState(newState, context = {}) {
             container.appendChild(btn);
         }
         currentState = AppState.IN_GAME;
+        pendingFirstFrame = gameId;
+        lifecycle.emit('game-initialized', { gameId, ok: initOk });
     }
 }
 
@@ -1015,6 +1074,7 @@ document.addEventListener('DOMContentLoaded', () => {
 
             // Hide Loader
             loader.classList.add('opacity-0');
+            performance.mark('hub:loader-hidden');
             setTimeout(() => loader.remove(), 1000);
 
             // Show Welcome Toast
@@ -1181,6 +1241,9 @@ document.addEventListener('DOMContentLoaded', () => {
         crt.className = 'crt-effect';
         document.body.appendChild(crt);
     }
+    // The #app-loader overlay may still be up here: it waits for a click and
+    // marks 'hub:loader-hidden' when dismissed.
+    lifecycle.emit('hub-ready');
 });
 
 // Expose Global API for Debugging
@@ -1196,6 +1259,10 @@ window.miniGameHub = {
     gameRegistry,
     goBack: () => transitionToState(AppState.MENU),
     getCurrentGame: () => currentGameInstance,
+    getState: () => currentState,
+    lifecycle,
     toggleView,
     get is3DView() { return is3DView; }
 };
+// Startup milestones for tooling (see verification/harness_startup.py).
+performance.mark('hub:api');
@@ -1,24 +1,72 @@
+import argparse
+import json
 import sys
-import time
 import os
 from playwright.sync_api import sync_playwright
-
-def verify_all_games():
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        context = browser.new_context()
+import harness_frames
+import harness_metrics
+import harness_replay
+from harness_browser import browser_context
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_server import REPO_ROOT, serve
+
+BENCH_OUT = os.path.join(REPO_ROOT, "verification", ".harness", "frame_bench.json")
+
+def benchmark_game(page, game_id, window_ms, warmup_ms, seed=None):
+    """Frame-time stats for `game_id` over a fixed window after a short warmup."""
+    if seed is not None:
+        harness_replay.arm(page, seed)
+    enter_game(page, game_id)
+    # Skip the first frames: they pay for shader compiles and asset decode.
+    page.wait_for_timeout(warmup_ms)
+    harness_frames.start(page)
+    page.wait_for_timeout(window_ms)
+    stats = harness_frames.frame_stats(harness_frames.stop(page))
+    exit_game(page)
+    return stats
+
+def write_bench_report(bench, args):
+    ranked = sorted(bench, key=lambda r: -(r.get("p95") or 0))
+    report = {
+        "budget_ms": round(harness_frames.FRAME_BUDGET_MS, 3),
+        "window_s": args.window,
+        "warmup_s": args.warmup,
+        "games": ranked,
+    }
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=2)
+
+    print("\n--- Frame Time Ranking (p95 desc, ms) ---")
+    print(f"{'game':<28} {'p50':>7} {'p95':>7} {'p99':>7} {'drop':>5} {'long':>5}")
+    for r in ranked:
+        if r.get("p95") is None:
+            print(f"{r['game']:<28} {r['status']}")
+            continue
+        flag = "  OVER BUDGET" if r["p95"] > harness_frames.FRAME_BUDGET_MS * 1.1 else ""
+        print(f"{r['game']:<28} {r['p50']:7.2f} {r['p95']:7.2f} {r['p99']:7.2f} "
+              f"{r['dropped']:5d} {r['long_tasks']:5d}{flag}")
+    print(f"Report written to {args.out}")
+
+def verify_all_games(args):
+    with serve() as base_url, sync_playwright() as p, browser_context(p) as context:
         page = context.new_page()
+        if args.deterministic:
+            harness_replay.install(page, args.seed)
 
-        # Capture ALL logs
-        page.on("console", lambda msg: print(f"CONSOLE: {msg.text}"))
-        page.on("pageerror", lambda exc: print(f"PAGE ERROR: {exc}"))
+        if args.bench:
+            # Benchmark runs only care about errors; full console echo skews timings.
+            page.on("pageerror", lambda exc: print(f"PAGE ERROR: {exc}"))
+        else:
+            # Capture ALL logs
+            page.on("console", lambda msg: print(f"CONSOLE: {msg.text}"))
+            page.on("pageerror", lambda exc: print(f"PAGE ERROR: {exc}"))
 
         print("Navigating to app...")
-        page.goto("http://localhost:8000/index.html")
+        page.goto(f"{base_url}/index.html")
 
-        # Wait longer and debug
         try:
-            page.wait_for_function("() => window.miniGameHub && window.miniGameHub.gameRegistry", timeout=15000)
+            wait_hub_ready(page)
         except Exception:
             print("Timed out waiting for miniGameHub.")
 
@@ -28,6 +76,9 @@ def verify_all_games():
             return Object.keys(window.miniGameHub?.gameRegistry || {});
         }""")
 
+        if args.games:
+            games = [g for g in games if g in args.games]
+
         if not games:
              print("No games found.")
              return
@@ -35,6 +86,9 @@ def verify_all_games():
         print(f"Found {len(games)} games to verify.")
 
         results = {}
+        bench = []
+        if args.bench:
+            harness_frames.install(page)
 
         for game_id in games:
             print(f"Verifying {game_id}...")
@@ -55,12 +109,25 @@ def verify_all_games():
             # Re-adding specific listeners might be tricky if not removed, but let's try just relying on the global print
             # and a simple check.
 
-            try:
-                # Transition to game
-                page.evaluate(f"window.miniGameHub.transitionToState('IN_GAME', {{ gameId: '{game_id}' }})")
+            if args.bench:
+                try:
+                    stats = benchmark_game(page, game_id, args.window * 1000, args.warmup * 1000,
+                                           args.seed if args.deterministic else None)
+                    bench.append({"game": game_id, "status": "OK", **stats})
+                    for key in ("p50", "p95", "p99"):
+                        harness_metrics.record(f"frame.{key}_ms", stats[key], game=game_id)
+                    harness_metrics.record("frame.dropped", stats["dropped"], game=game_id)
+                    harness_metrics.record("frame.long_tasks", stats["long_tasks"], game=game_id)
+                    results[game_id] = "PASS"
+                except Exception as e:
+                    print(f"  ❌ {game_id} crashed: {e}")
+                    bench.append({"game": game_id, "status": "CRASH"})
+                    results[game_id] = "CRASH"
+                continue
 
-                # Wait for game to init
-                time.sleep(2)
+            try:
+                # Transition to game and wait for its first frame
+                enter_game(page, game_id)
 
                 # Check for canvas or container visibility
                 visible = page.evaluate(f"""() => {{
@@ -77,16 +144,12 @@ def verify_all_games():
                     results[game_id] = "PASS" # Assuming no crash if we got here
 
                 # Go back to menu
-                page.evaluate("window.miniGameHub.transitionToState('MENU')")
-                time.sleep(1)
+                exit_game(page)
 
             except Exception as e:
                 print(f"  ❌ {game_id} crashed: {e}")
                 results[game_id] = "CRASH"
 
-
-        browser.close()
-
         # Summary
         print("\n--- Summary ---")
         pass_count = sum(1 for r in results.values() if r == "PASS")
@@ -95,5 +158,17 @@ def verify_all_games():
             if status != "PASS":
                 print(f"{gid}: {status}")
 
+        if args.bench:
+            write_bench_report(bench, args)
+
 if __name__ == "__main__":
-    verify_all_games()
+    parser = argparse.ArgumentParser(description="Enter every registered game; optionally benchmark frame times.")
+    parser.add_argument("games", nargs="*", help="registry IDs to include (default: all)")
+    parser.add_argument("--bench", action="store_true", help="record p50/p95/p99 frame times per game")
+    parser.add_argument("--window", type=float, default=5.0, help="measurement window per game, seconds")
+    parser.add_argument("--warmup", type=float, default=0.5, help="seconds to skip after the first frame")
+    parser.add_argument("--out", default=BENCH_OUT, help="JSON report path")
+    parser.add_argument("--deterministic", action="store_true",
+                        help="seed Math.random and run games on a virtual frame clock (see harness_replay.py)")
+    parser.add_argument("--seed", type=int, default=harness_replay.DEFAULT_SEED)
+    verify_all_games(parser.parse_args())
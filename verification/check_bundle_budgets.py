@@ -0,0 +1,8 @@
+# Launches every gameRegistry entry cold and fails when one exceeds its
+# network/bundle budget in bundle_budgets.json (see harness_bundle.py).
+import sys
+
+from harness_bundle import main
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,41 @@
+# Checks that harness_deps maps scripts to the games they actually enter, so
+# --changed-since and the result cache do not skip them after a game edit.
+import sys
+
+from harness_deps import affected, graph, script_inputs, script_targets
+
+EXPECTED = {
+    "verify_hub.py": {"snake-game"},            # '#snake-game' selector + card click
+    "verify_all.py": {"hall-of-fame"},          # card title click
+    "verify_all_games.py": set(graph().registry),
+}
+
+
+# Files reached by URL rather than import must still count as inputs.
+EXPECTED_INPUTS = {
+    "verify_sw.py": {"sw.js"},
+}
+
+
+def main():
+    failed = 0
+    for script, games in EXPECTED.items():
+        resolved = set(script_targets(script)["games"])
+        missing = games - resolved
+        if missing:
+            print(f"FAIL: {script} does not resolve to {sorted(missing)}")
+            failed += 1
+        else:
+            print(f"PASS: {script} -> {len(resolved)} games")
+    for script, files in EXPECTED_INPUTS.items():
+        missing = files - script_inputs(script)
+        if missing or script not in affected([script], files):
+            print(f"FAIL: {script} does not depend on {sorted(missing or files)}")
+            failed += 1
+        else:
+            print(f"PASS: {script} depends on {', '.join(sorted(files))}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
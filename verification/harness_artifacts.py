@@ -0,0 +1,270 @@
+"""Content-addressed store for verification screenshots.
+
+Scripts used to write a fresh PNG next to themselves on every run, so
+identical re-captures piled up in the tree. Captures now go through the store:
+
+    from harness_artifacts import save_screenshot
+
+    save_screenshot(page, "menu")            # step name within this script
+    await async_save_screenshot(page, "boss-modern")
+
+Blobs are keyed by the sha256 of the captured PNG and written once under
+verification/.harness/artifacts/blobs/. Each script gets its own manifest,
+manifests/<script>.json, mapping step -> blob, so parallel runner workers
+never contend for one file. A capture whose bytes are already stored costs one
+hash and no write.
+
+Lossless recompression (PIL optimize) and optional thumbnails run in a
+background thread pool after the capture returns; the blob keeps its
+content key because the decoded pixels are unchanged.
+
+    python verification/harness_artifacts.py ingest [--prune]   # adopt existing PNGs
+    python verification/harness_artifacts.py export <dir>       # <script>/<step>.png
+    python verification/harness_artifacts.py stats
+    python verification/harness_artifacts.py gc                  # drop unreferenced blobs
+"""
+import argparse
+import atexit
+import datetime
+import glob
+import hashlib
+import inspect
+import json
+import os
+import shutil
+import sys
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from harness_server import REPO_ROOT
+
+ARTIFACT_DIR_ENV = "HARNESS_ARTIFACT_DIR"
+THUMBNAILS_ENV = "HARNESS_THUMBNAILS"
+DEFAULT_ARTIFACT_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "artifacts")
+VERIFICATION_DIR = os.path.join(REPO_ROOT, "verification")
+THUMBNAIL_SIZE = (320, 180)
+
+
+def _caller_script():
+    """Name of the verification script that is capturing, e.g. verify_hub."""
+    for frame in inspect.stack()[2:]:
+        name = os.path.basename(frame.filename)
+        if name.endswith(".py") and not name.startswith("harness_"):
+            return name[:-3]
+    return os.path.splitext(os.path.basename(sys.argv[0] or "interactive"))[0]
+
+
+def _atomic_write(path, data, mode="wb"):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    with open(tmp, mode) as f:
+        f.write(data)
+    os.replace(tmp, path)
+
+
+class ArtifactStore:
+    """sha256-addressed blobs plus one step -> blob manifest per script."""
+
+    def __init__(self, root=None, thumbnails=None):
+        self.root = root or os.environ.get(ARTIFACT_DIR_ENV) or DEFAULT_ARTIFACT_DIR
+        if thumbnails is None:
+            thumbnails = os.environ.get(THUMBNAILS_ENV, "") not in ("", "0")
+        self.thumbnails = thumbnails
+        self._lock = threading.Lock()
+        self._manifests = {}
+        self._pool = None
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], f"{digest}.png")
+
+    def thumb_path(self, digest):
+        return os.path.join(self.root, "thumbs", digest[:2], f"{digest}.png")
+
+    def manifest_path(self, script):
+        return os.path.join(self.root, "manifests", f"{script}.json")
+
+    def manifest(self, script):
+        with self._lock:
+            if script not in self._manifests:
+                try:
+                    with open(self.manifest_path(script), encoding="utf-8") as f:
+                        self._manifests[script] = json.load(f)
+                except (OSError, ValueError):
+                    self._manifests[script] = {}
+            return self._manifests[script]
+
+    def put(self, script, step, data):
+        """Store PNG bytes for `script`/`step`; returns the digest."""
+        digest = hashlib.sha256(data).hexdigest()
+        path = self.blob_path(digest)
+        fresh = not os.path.exists(path)
+        if fresh:
+            _atomic_write(path, data)
+        manifest = self.manifest(script)
+        with self._lock:
+            manifest[step] = {
+                "sha256": digest,
+                "bytes": len(data),
+                "captured": datetime.datetime.now().isoformat(timespec="seconds"),
+            }
+            _atomic_write(self.manifest_path(script), json.dumps(manifest, indent=1, sort_keys=True), "w")
+        if fresh:
+            self._background(digest)
+        return digest
+
+    def path(self, script, step):
+        entry = self.manifest(script).get(step)
+        return self.blob_path(entry["sha256"]) if entry else None
+
+    def scripts(self):
+        return sorted(os.path.basename(p)[:-5] for p in glob.glob(os.path.join(self.root, "manifests", "*.json")))
+
+    def _background(self, digest):
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="artifacts")
+            atexit.register(self.flush)
+        self._pool.submit(self._post_process, digest)
+
+    def _post_process(self, digest):
+        from PIL import Image
+
+        path = self.blob_path(digest)
+        with Image.open(path) as im:
+            im.load()
+        tmp = f"{path}.{os.getpid()}.{threading.get_ident()}.opt"
+        im.save(tmp, format="PNG", optimize=True)
+        if os.path.getsize(tmp) < os.path.getsize(path):
+            os.replace(tmp, path)
+        else:
+            os.remove(tmp)
+        if self.thumbnails:
+            thumb = im.copy()
+            thumb.thumbnail(THUMBNAIL_SIZE)
+            os.makedirs(os.path.dirname(self.thumb_path(digest)), exist_ok=True)
+            thumb.save(self.thumb_path(digest), format="PNG", optimize=True)
+
+    def flush(self):
+        """Wait for pending recompression/thumbnail jobs."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=True)
+            self._pool = None
+
+    def referenced(self):
+        return {entry["sha256"] for script in self.scripts() for entry in self.manifest(script).values()}
+
+    def stats(self):
+        blobs = glob.glob(os.path.join(self.root, "blobs", "*", "*.png"))
+        entries = [e for s in self.scripts() for e in self.manifest(s).values()]
+        return {
+            "scripts": len(self.scripts()),
+            "captures": len(entries),
+            "blobs": len(blobs),
+            "captured_bytes": sum(e["bytes"] for e in entries),
+            "stored_bytes": sum(os.path.getsize(p) for p in blobs),
+        }
+
+    def gc(self):
+        keep = self.referenced()
+        removed = 0
+        for path in glob.glob(os.path.join(self.root, "blobs", "*", "*.png")):
+            digest = os.path.basename(path)[:-4]
+            if digest not in keep:
+                os.remove(path)
+                thumb = self.thumb_path(digest)
+                if os.path.exists(thumb):
+                    os.remove(thumb)
+                removed += 1
+        return removed
+
+
+_store = None
+
+
+def default_store():
+    global _store
+    if _store is None:
+        _store = ArtifactStore()
+    return _store
+
+
+def save_screenshot(page, step, script=None, store=None, **screenshot_options):
+    """Capture `page` into the artifact store; returns the blob path."""
+    store = store or default_store()
+    script = script or _caller_script()
+    digest = store.put(script, step, page.screenshot(**screenshot_options))
+    return store.blob_path(digest)
+
+
+async def async_save_screenshot(page, step, script=None, store=None, **screenshot_options):
+    store = store or default_store()
+    script = script or _caller_script()
+    digest = store.put(script, step, await page.screenshot(**screenshot_options))
+    return store.blob_path(digest)
+
+
+def ingest(store, directory=VERIFICATION_DIR, prune=False):
+    """Adopt loose PNGs under `directory` as `<folder or 'legacy'>/<stem>` captures."""
+    adopted = []
+    for path in sorted(glob.glob(os.path.join(directory, "*.png")) + glob.glob(os.path.join(directory, "*", "*.png"))):
+        if os.path.commonpath([path, store.root]) == store.root:
+            continue
+        rel = os.path.relpath(path, directory)
+        folder = os.path.dirname(rel)
+        if folder.startswith("."):
+            continue
+        script = folder.replace(os.sep, "_") if folder else "legacy"
+        with open(path, "rb") as f:
+            store.put(script, os.path.splitext(os.path.basename(rel))[0], f.read())
+        adopted.append(path)
+    store.flush()
+    if prune:
+        for path in adopted:
+            os.remove(path)
+    return adopted
+
+
+def export(store, out_dir, scripts=None):
+    """Materialise captures as <out_dir>/<script>/<step>.png (harness_visual layout)."""
+    count = 0
+    for script in scripts or store.scripts():
+        for step, entry in store.manifest(script).items():
+            dest = os.path.join(out_dir, script, f"{step}.png")
+            os.makedirs(os.path.dirname(dest), exist_ok=True)
+            shutil.copyfile(store.blob_path(entry["sha256"]), dest)
+            count += 1
+    return count
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the content-addressed screenshot store.")
+    parser.add_argument("--root", default=None, help=f"store directory (default ${ARTIFACT_DIR_ENV} or {DEFAULT_ARTIFACT_DIR})")
+    sub = parser.add_subparsers(dest="command", required=True)
+    ing = sub.add_parser("ingest", help="adopt PNGs already in verification/")
+    ing.add_argument("directory", nargs="?", default=VERIFICATION_DIR)
+    ing.add_argument("--prune", action="store_true", help="delete the originals once stored")
+    ing.add_argument("--thumbnails", action="store_true")
+    exp = sub.add_parser("export", help="copy captures out as <script>/<step>.png")
+    exp.add_argument("out_dir")
+    exp.add_argument("scripts", nargs="*")
+    sub.add_parser("stats")
+    sub.add_parser("gc", help="delete blobs no manifest references")
+    args = parser.parse_args(argv)
+    store = ArtifactStore(args.root, thumbnails=getattr(args, "thumbnails", None) or None)
+
+    if args.command == "ingest":
+        adopted = ingest(store, args.directory, args.prune)
+        print(f"Ingested {len(adopted)} PNGs{' (originals removed)' if args.prune else ''}.")
+    elif args.command == "export":
+        print(f"Exported {export(store, args.out_dir, args.scripts)} captures to {args.out_dir}.")
+    elif args.command == "gc":
+        print(f"Removed {store.gc()} unreferenced blobs.")
+    if args.command in ("ingest", "stats"):
+        s = store.stats()
+        saved = 1 - s["stored_bytes"] / s["captured_bytes"] if s["captured_bytes"] else 0
+        print(f"{s['captures']} captures from {s['scripts']} scripts in {s['blobs']} blobs: "
+              f"{s['captured_bytes'] / 1e6:.1f} MB captured, {s['stored_bytes'] / 1e6:.1f} MB stored ({saved:.0%} saved).")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
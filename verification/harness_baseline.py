@@ -0,0 +1,261 @@
+"""Performance baseline store and statistical regression gate.
+
+Harness metrics (frame times, heap, load times, ...) are stored per commit in
+verification/perf_baselines.json, one list of samples per metric key. A key is
+the metric name plus its tags, e.g. `frame.p95_ms[game=neon-swarm]`.
+
+    # collect 5 samples of a benchmark at the current commit
+    python verification/harness_baseline.py sample check_all_games.py -n 5 -- --bench --window 3
+
+    # or ingest whatever the last runner pass produced
+    python verification/harness_baseline.py record
+
+    # compare two commits; exits 1 when a metric regressed
+    python verification/harness_baseline.py compare --base main --head HEAD
+
+`compare` runs a one-sided Mann-Whitney U test per key (exact permutation
+distribution for small samples, normal approximation otherwise) and only
+flags a regression when it is both significant and larger than
+`--min-effect`, so a single noisy run cannot fail the gate.
+"""
+import argparse
+import datetime
+import itertools
+import json
+import math
+import os
+import statistics
+import subprocess
+import sys
+
+from harness_server import REPO_ROOT
+
+BASELINE_PATH = os.path.join(REPO_ROOT, "verification", "perf_baselines.json")
+LAST_RUN_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "last_run.json")
+
+# Harness bookkeeping, not properties of the games.
+IGNORED_PREFIXES = ("browser.", "ready.", "cdn.")
+# Everything else is treated as lower-is-better.
+HIGHER_IS_BETTER_SUFFIXES = ("fps", "hit_ratio")
+
+EXACT_LIMIT = 50000
+
+
+def metric_key(name, tags=None):
+    tags = {k: v for k, v in (tags or {}).items() if v is not None}
+    if not tags:
+        return name
+    return f"{name}[{','.join(f'{k}={tags[k]}' for k in sorted(tags))}]"
+
+
+def key_name(key):
+    return key.split("[", 1)[0]
+
+
+def higher_is_better(key):
+    return key_name(key).endswith(HIGHER_IS_BETTER_SUFFIXES)
+
+
+def resolve_commit(ref="HEAD"):
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short=12", ref], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+        return out.stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return ref
+
+
+class BaselineStore:
+    def __init__(self, path=BASELINE_PATH):
+        self.path = path
+        try:
+            with open(path, encoding="utf-8") as f:
+                self.data = json.load(f)
+        except (OSError, ValueError):
+            self.data = {"version": 1, "commits": {}}
+
+    def samples(self, commit):
+        return self.data["commits"].get(commit, {}).get("metrics", {})
+
+    def add(self, commit, rows):
+        """Append numeric metric rows to `commit`; returns the number stored."""
+        entry = self.data["commits"].setdefault(commit, {"metrics": {}})
+        entry["updated"] = datetime.datetime.now().isoformat(timespec="seconds")
+        stored = 0
+        for row in rows:
+            name, value = row.get("name", ""), row.get("value")
+            if name.startswith(IGNORED_PREFIXES) or not isinstance(value, (int, float)) or isinstance(value, bool):
+                continue
+            entry["metrics"].setdefault(metric_key(name, row.get("tags")), []).append(value)
+            stored += 1
+        return stored
+
+    def save(self):
+        tmp = f"{self.path}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.data, f, indent=1, sort_keys=True)
+        os.replace(tmp, self.path)
+
+
+def _ranks(values):
+    """1-based ranks with ties averaged."""
+    order = sorted(range(len(values)), key=values.__getitem__)
+    ranks = [0.0] * len(values)
+    i = 0
+    while i < len(order):
+        j = i
+        while j + 1 < len(order) and values[order[j + 1]] == values[order[i]]:
+            j += 1
+        for k in range(i, j + 1):
+            ranks[order[k]] = (i + j) / 2 + 1
+        i = j + 1
+    return ranks
+
+
+def mann_whitney_greater(base, head):
+    """One-sided Mann-Whitney U test that `head` tends to exceed `base`.
+
+    Returns (U, p). Small samples use the exact permutation distribution of
+    the rank sum (ties included); larger ones the tie-corrected normal
+    approximation with continuity correction.
+    """
+    na, nb = len(base), len(head)
+    n = na + nb
+    ranks = _ranks(list(base) + list(head))
+    rank_sum = sum(ranks[na:])
+    u = rank_sum - nb * (nb + 1) / 2
+
+    if math.comb(n, nb) <= EXACT_LIMIT:
+        extreme = total = 0
+        for combo in itertools.combinations(ranks, nb):
+            total += 1
+            if sum(combo) >= rank_sum - 1e-9:
+                extreme += 1
+        return u, extreme / total
+
+    ties = {}
+    for r in ranks:
+        ties[r] = ties.get(r, 0) + 1
+    tie_term = sum(t ** 3 - t for t in ties.values()) / (n * (n - 1))
+    sigma = math.sqrt(na * nb / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return u, 1.0
+    z = (u - na * nb / 2 - 0.5) / sigma
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
+
+
+def compare(base_samples, head_samples, alpha=0.05, min_effect=0.03, min_samples=3):
+    """Per-key verdicts comparing two {key: [samples]} maps."""
+    rows = []
+    for key in sorted(set(base_samples) & set(head_samples)):
+        base, head = base_samples[key], head_samples[key]
+        row = {"key": key, "n_base": len(base), "n_head": len(head),
+               "base_median": statistics.median(base), "head_median": statistics.median(head)}
+        denom = abs(row["base_median"]) or 1e-9
+        change = (row["head_median"] - row["base_median"]) / denom
+        row["change"] = change
+        if len(base) < min_samples or len(head) < min_samples:
+            row.update(p=None, verdict="insufficient")
+            rows.append(row)
+            continue
+        worse = change < 0 if higher_is_better(key) else change > 0
+        if higher_is_better(key):
+            _, p = mann_whitney_greater(head, base)
+        else:
+            _, p = mann_whitney_greater(base, head)
+        if p < alpha and abs(change) >= min_effect and worse:
+            verdict = "REGRESSION"
+        else:
+            # Improvement check runs the test the other way round.
+            _, p_better = (mann_whitney_greater(base, head) if higher_is_better(key)
+                           else mann_whitney_greater(head, base))
+            verdict = "improved" if p_better < alpha and abs(change) >= min_effect else "same"
+        row.update(p=p, verdict=verdict)
+        rows.append(row)
+    return rows
+
+
+def print_comparison(rows):
+    print(f"{'metric':<52} {'base':>10} {'head':>10} {'change':>8} {'p':>7}  verdict")
+    for r in sorted(rows, key=lambda r: (r["verdict"] != "REGRESSION", r["key"])):
+        p = "-" if r["p"] is None else f"{r['p']:.3f}"
+        print(f"{r['key']:<52} {r['base_median']:10.3f} {r['head_median']:10.3f} "
+              f"{r['change'] * 100:+7.1f}% {p:>7}  {r['verdict']}")
+    regressions = [r for r in rows if r["verdict"] == "REGRESSION"]
+    print(f"\n{len(rows)} metrics compared, {len(regressions)} regressions.")
+    return regressions
+
+
+def rows_from_last_run(path=LAST_RUN_PATH):
+    with open(path, encoding="utf-8") as f:
+        run = json.load(f)
+    # Replayed results carry metrics from the run that was cached.
+    return [m for r in run.get("results", []) if r.get("passed") and not r.get("cached")
+            for m in r.get("metrics", [])]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and compare performance baselines.")
+    parser.add_argument("--store", default=BASELINE_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    rec = sub.add_parser("record", help="ingest metrics from a runner summary")
+    rec.add_argument("path", nargs="?", default=LAST_RUN_PATH)
+    rec.add_argument("--commit", default="HEAD")
+
+    smp = sub.add_parser("sample", help="run a script N times and record its metrics")
+    smp.add_argument("script")
+    smp.add_argument("-n", "--repeat", type=int, default=5)
+    smp.add_argument("--commit", default="HEAD")
+    smp.add_argument("--timeout", type=float, default=600)
+
+    cmp_ = sub.add_parser("compare", help="flag statistically significant regressions")
+    cmp_.add_argument("--base", required=True)
+    cmp_.add_argument("--head", default="HEAD")
+    cmp_.add_argument("--alpha", type=float, default=0.05)
+    cmp_.add_argument("--min-effect", type=float, default=0.03, help="minimum relative change to flag")
+    cmp_.add_argument("--min-samples", type=int, default=3)
+
+    # Everything after `--` is passed through to the sampled script.
+    argv = list(sys.argv[1:] if argv is None else argv)
+    script_args = []
+    if "--" in argv:
+        script_args = argv[argv.index("--") + 1:]
+        argv = argv[:argv.index("--")]
+    args = parser.parse_args(argv)
+    store = BaselineStore(args.store)
+
+    if args.command == "record":
+        commit = resolve_commit(args.commit)
+        stored = store.add(commit, rows_from_last_run(args.path))
+        store.save()
+        print(f"Recorded {stored} samples for {commit}.")
+        return 0
+
+    if args.command == "sample":
+        from harness_runner import run_suite
+
+        commit = resolve_commit(args.commit)
+        stored = 0
+        for i in range(args.repeat):
+            result = run_suite([args.script], workers=1, timeout=args.timeout, script_args=script_args)[0]
+            if not result.passed:
+                print(f"Run {i + 1} failed; its metrics are discarded.\n{result.output[-2000:]}")
+                continue
+            stored += store.add(commit, result.metrics)
+            print(f"Run {i + 1}/{args.repeat}: {result.duration:.1f}s")
+        store.save()
+        print(f"Recorded {stored} samples for {commit}.")
+        return 0
+
+    base, head = resolve_commit(args.base), resolve_commit(args.head)
+    rows = compare(store.samples(base), store.samples(head), args.alpha, args.min_effect, args.min_samples)
+    if not rows:
+        print(f"No metrics in common between {base} and {head}.")
+        return 0
+    print(f"Comparing {base} -> {head}\n")
+    return 1 if print_comparison(rows) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""Pooled Chromium for verification scripts.
+
+Each runner worker launches Chromium once with a remote-debugging port and
+exports it as HARNESS_CDP_ENDPOINT. Scripts borrow it instead of cold-launching:
+
+    from harness_browser import browser_context
+
+    with sync_playwright() as p, browser_context(p) as context:
+        page = context.new_page()
+
+    # async scripts
+    async with async_playwright() as p, async_browser_context(p) as context:
+        page = await context.new_page()
+
+Every borrow gets a new BrowserContext, so cookies, localStorage and service
+workers never leak between scripts. Scripts that only swap their launch call
+can use `connect(p)` / `await async_connect(p)`, which return a Browser whose
+`new_page()` also opens a fresh context.
+
+Contexts from `browser_context()` also route CDN requests through the offline
+mirror (harness_cdn.py).
+
+Without an endpoint (running a script by hand) the helpers fall back to a
+normal `chromium.launch()`. Either way the acquisition time is recorded as
+`browser.acquire_ms`, tagged `pooled=True/False`, for the runner summary.
+"""
+import json
+import os
+import socket
+import time
+import urllib.request
+from contextlib import asynccontextmanager, contextmanager
+
+import harness_metrics
+from harness_cdn import async_mirror_context, mirror_context
+
+CDP_ENDPOINT_ENV = "HARNESS_CDP_ENDPOINT"
+
+# Flags the pooled browser is launched with. Scripts asking for other flags
+# (e.g. a fixed window size) get a private browser instead.
+POOL_ARGS = (
+    "--no-sandbox",
+    "--disable-setuid-sandbox",
+    "--autoplay-policy=no-user-gesture-required",
+)
+
+
+def _poolable(launch_kwargs):
+    extra = set(launch_kwargs.get("args") or ()) - set(POOL_ARGS)
+    others = set(launch_kwargs) - {"args", "headless"}
+    return not extra and not others and launch_kwargs.get("headless", True)
+
+
+def _endpoint(launch_kwargs):
+    endpoint = os.environ.get(CDP_ENDPOINT_ENV)
+    return endpoint if endpoint and _poolable(launch_kwargs) else None
+
+
+def _since_ms(start):
+    return round((time.perf_counter() - start) * 1000, 2)
+
+
+def connect(playwright, **launch_kwargs):
+    """Sync Browser from the worker pool, or a fresh launch outside the runner."""
+    endpoint = _endpoint(launch_kwargs)
+    start = time.perf_counter()
+    if endpoint:
+        browser = playwright.chromium.connect_over_cdp(endpoint)
+    else:
+        browser = playwright.chromium.launch(**{"headless": True, **launch_kwargs})
+    harness_metrics.record("browser.acquire_ms", _since_ms(start), pooled=bool(endpoint))
+    return browser
+
+
+async def async_connect(playwright, **launch_kwargs):
+    """Async twin of `connect()`."""
+    endpoint = _endpoint(launch_kwargs)
+    start = time.perf_counter()
+    if endpoint:
+        browser = await playwright.chromium.connect_over_cdp(endpoint)
+    else:
+        browser = await playwright.chromium.launch(**{"headless": True, **launch_kwargs})
+    harness_metrics.record("browser.acquire_ms", _since_ms(start), pooled=bool(endpoint))
+    return browser
+
+
+@contextmanager
+def browser_context(playwright, launch_kwargs=None, **context_options):
+    """Yield an isolated BrowserContext; closes it (and a private browser) on exit."""
+    browser = connect(playwright, **(launch_kwargs or {}))
+    context = browser.new_context(**context_options)
+    try:
+        with mirror_context(context):
+            yield context
+    finally:
+        context.close()
+        # For a pooled browser this only drops the CDP connection.
+        browser.close()
+
+
+@asynccontextmanager
+async def async_browser_context(playwright, launch_kwargs=None, **context_options):
+    browser = await async_connect(playwright, **(launch_kwargs or {}))
+    context = await browser.new_context(**context_options)
+    try:
+        async with async_mirror_context(context):
+            yield context
+    finally:
+        await context.close()
+        await browser.close()
+
+
+def _free_port():
+    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+class BrowserPool:
+    """One long-lived Chromium per worker process, reachable over CDP."""
+
+    def __init__(self, args=POOL_ARGS):
+        self.args = list(args)
+        self.endpoint = None
+        self.launch_ms = None
+        self._playwright = None
+        self._browser = None
+
+    def start(self, timeout=15):
+        from playwright.sync_api import sync_playwright
+
+        port = _free_port()
+        start = time.perf_counter()
+        self._playwright = sync_playwright().start()
+        self._browser = self._playwright.chromium.launch(
+            headless=True, args=[*self.args, f"--remote-debugging-port={port}"],
+        )
+        self.endpoint = f"http://127.0.0.1:{port}"
+        self._wait_ready(timeout)
+        self.launch_ms = _since_ms(start)
+        return self
+
+    def _wait_ready(self, timeout):
+        deadline = time.monotonic() + timeout
+        while True:
+            try:
+                with urllib.request.urlopen(f"{self.endpoint}/json/version", timeout=1) as resp:
+                    json.load(resp)
+                return
+            except OSError:
+                if time.monotonic() > deadline:
+                    self.stop()
+                    raise RuntimeError(f"Chromium did not expose CDP on {self.endpoint} within {timeout}s")
+                time.sleep(0.05)
+
+    def stop(self):
+        if self._browser:
+            self._browser.close()
+            self._browser = None
+        if self._playwright:
+            self._playwright.stop()
+            self._playwright = None
+        self.endpoint = None
@@ -0,0 +1,205 @@
+"""Per-game network and bundle budgets.
+
+verification/bundle_budgets.json holds one entry per gameRegistry ID, with
+"default" filling in missing keys:
+
+    max_bytes     bytes transferred between the transition and the first frame
+    max_requests  requests made in that window
+    max_parse_ms  V8 compile (parse + compile) time in that window
+
+Each game is launched from a freshly reloaded hub with the HTTP cache disabled,
+and harness_loadprof's CDP Network and Performance collection measures it.
+Any game over budget fails the run. check_bundle_budgets.py runs this check
+inside the harness runner.
+
+    python verification/harness_bundle.py [game-glob ...]
+    python verification/harness_bundle.py --update [--headroom 1.25]   # re-baseline from measurements
+    python verification/harness_bundle.py --seed-static                 # entries from the import graph
+
+`--seed-static` needs no browser. It sizes each entry from the game's module
+closure beyond what the hub already loads, with generous slack for assets
+fetched at init. CDN modules (three.module.js, cannon-es, ...) are sized from
+the harness_cdn mirror, or from a HEAD request's Content-Length when the
+network is up. A game with a CDN module neither can size gets no guessed
+budget: its entry lists the module under "unsized", and the check reports the
+game as skipped until `--update` records a measured budget. `--update`
+replaces any entry with measured values times the headroom.
+
+Measurements run with service workers blocked, so sw.js cannot serve shared
+modules from Cache Storage (and V8's code cache) after the first game.
+"""
+import argparse
+import json
+import math
+import os
+import sys
+import urllib.request
+
+import harness_metrics
+from harness_cdn import MirrorStore, has_network
+from harness_deps import EXTERNAL, HUB_PAGE, graph
+from harness_loadprof import NetworkLog, profile_game
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page
+
+BUDGETS_PATH = os.path.join(REPO_ROOT, "verification", "bundle_budgets.json")
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "bundle.json")
+
+CHECKS = (("max_bytes", "bytes"), ("max_requests", "requests"), ("max_parse_ms", "compile_ms"))
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_budgets(budgets, path=BUDGETS_PATH):
+    budgets["games"] = dict(sorted(budgets["games"].items()))
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(budgets, f, indent=2)
+        f.write("\n")
+
+
+def budget_for(budgets, game_id):
+    return {**budgets.get("default", {}), **budgets.get("games", {}).get(game_id, {})}
+
+
+def violations(report, budget):
+    problems = []
+    for key, field in CHECKS:
+        limit, value = budget.get(key), report.get(field)
+        if limit is not None and value is not None and value > limit:
+            problems.append(f"{field} {value:g} > {limit:g}")
+    return problems
+
+
+def _round_up(value, step):
+    return int(math.ceil(value / step) * step)
+
+
+def remote_size(url):
+    """Content-Length of `url` from a HEAD request, or None."""
+    if not url.startswith(("http://", "https://")) or not has_network():
+        return None
+    try:
+        with urllib.request.urlopen(urllib.request.Request(url, method="HEAD"), timeout=10) as resp:
+            length = resp.headers.get("Content-Length")
+    except OSError:
+        return None
+    return int(length) if length and length.isdigit() else None
+
+
+def node_size(node, mirror):
+    """Bytes of a closure node: the file on disk or the CDN body; None if unknown."""
+    if node.startswith(EXTERNAL):
+        url = node[len(EXTERNAL):]
+        entry = mirror.get(url)
+        return entry["size"] if entry and "size" in entry else remote_size(url)
+    path = os.path.join(REPO_ROOT, node)
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+def static_budget(game_id, hub_nodes, mirror=None):
+    """Generous entry from the modules a launch adds on top of the hub's own."""
+    nodes = graph().game_closure([game_id]) - hub_nodes
+    mirror = MirrorStore().index if mirror is None else mirror
+    sizes = {n: node_size(n, mirror) for n in nodes}
+    unsized = sorted(n[len(EXTERNAL):] for n, size in sizes.items() if size is None)
+    if unsized:
+        return {"unsized": unsized}
+    size = sum(sizes.values())
+    return {
+        "max_bytes": _round_up(max(64 * 1024, size * 2), 1024),
+        "max_requests": max(10, 2 * len(nodes) + 5),
+        "max_parse_ms": _round_up(50 + size / 1024, 10),
+    }
+
+
+def measured_budget(report, headroom):
+    return {
+        "max_bytes": _round_up(report["bytes"] * headroom, 1024),
+        "max_requests": int(math.ceil(report["requests"] * headroom)) + 1,
+        "max_parse_ms": _round_up(report["compile_ms"] * headroom + 10, 10),
+    }
+
+
+def measure(patterns):
+    reports = []
+    with hub_page(service_workers="block") as page:
+        cdp = cdp_session(page)
+        cdp.send("Performance.enable")
+        cdp.send("Network.enable")
+        cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+        network = NetworkLog(cdp)
+        for game_id in game_ids(page, patterns):
+            try:
+                reports.append(profile_game(page, cdp, network, game_id, cold=True))
+            except Exception as e:
+                reports.append({"game": game_id, "error": str(e)})
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fail when a game's launch exceeds its network/bundle budget.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--update", action="store_true", help="rewrite the measured games' budgets")
+    parser.add_argument("--headroom", type=float, default=1.25, help="multiplier applied by --update")
+    parser.add_argument("--seed-static", action="store_true", help="write entries from the import graph only")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+    budgets = load_budgets(args.budgets)
+
+    if args.seed_static:
+        g = graph()
+        hub_nodes = g.closure([HUB_PAGE])
+        mirror = MirrorStore().index
+        for game_id in g.registry:
+            budgets["games"][game_id] = static_budget(game_id, hub_nodes, mirror)
+        save_budgets(budgets, args.budgets)
+        unsized = [game_id for game_id, b in budgets["games"].items() if "unsized" in b]
+        print(f"Seeded {len(g.registry)} budgets in {args.budgets}")
+        if unsized:
+            print(f"{len(unsized)} games import CDN modules that could not be sized (seed the mirror "
+                  f"or run --update): {', '.join(sorted(unsized))}")
+        return 0
+
+    reports = measure(args.games)
+    for r in reports:
+        if "error" in r:
+            r["problems"] = [f"error: {r['error']}"]
+            continue
+        r["budget"] = budget_for(budgets, r["game"])
+        r["problems"] = [] if args.update or "unsized" in r["budget"] else violations(r, r["budget"])
+        if args.update:
+            budgets["games"][r["game"]] = measured_budget(r, args.headroom)
+        harness_metrics.record("bundle.over_budget", len(r["problems"]), game=r["game"])
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(reports, f, indent=2)
+    if args.update:
+        save_budgets(budgets, args.budgets)
+        print(f"Updated {sum(1 for r in reports if 'error' not in r)} budgets in {args.budgets}")
+
+    print(f"{'game':<28} {'KB':>8} {'/ max':>8} {'reqs':>5} {'/ max':>5} {'parse':>7} {'/ max':>6}  result")
+    for r in sorted(reports, key=lambda r: (not r["problems"], r["game"])):
+        if "error" in r:
+            print(f"{r['game']:<28} ERROR {r['error']}")
+            continue
+        b = r["budget"]
+        if "unsized" in b:
+            print(f"{r['game']:<28} {r['bytes'] / 1024:8.1f} {'-':>8} {r['requests']:5d} {'-':>5} "
+                  f"{r['compile_ms']:7.1f} {'-':>6}  SKIPPED (no budget; run --update)")
+            continue
+        print(f"{r['game']:<28} {r['bytes'] / 1024:8.1f} {b.get('max_bytes', 0) / 1024:8.0f} "
+              f"{r['requests']:5d} {b.get('max_requests', 0):5d} {r['compile_ms']:7.1f} {b.get('max_parse_ms', 0):6.0f}  "
+              f"{'; '.join(r['problems']) or 'OK'}")
+    failed = [r for r in reports if r["problems"]]
+    skipped = [r for r in reports if "unsized" in r.get("budget", {})]
+    print(f"\n{len(failed)}/{len(reports)} games over budget, {len(skipped)} without a budget. Report: {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,160 @@
+"""Incremental result cache for the verification runner.
+
+A script's cache key is a sha256 over:
+
+* the script and every file in its transitive input closure (harness_deps),
+  hashed by content, and the URLs of the external modules it reaches. The
+  closure includes files loaded by URL, such as sw.js from js/main.js;
+* the index.html importmap and the CDN mirror fingerprint and mode (read
+  with `configured_mode()`, which never probes the network);
+* the script arguments and the installed Playwright version.
+
+A script that loads index.html without naming a game resolves to every
+registry game (see harness_deps.script_targets), so its key covers the hub's
+whole reachable closure.
+
+If a passing result is stored under that key, the runner replays it (output,
+duration and metrics) instead of starting a browser. Only passing results are
+stored, and not those whose output shows a swallowed exception, so failures
+always re-run.
+
+Entries live in verification/.harness/results/<key[:2]>/<key>.json. Every hit
+touches the entry's mtime, and `prune()` evicts the least recently used
+entries beyond `max_entries`.
+
+    python verification/harness_runner.py            # uses the cache
+    python verification/harness_runner.py --rerun    # ignore it, still refresh it
+    python verification/harness_cache.py stats | clear
+"""
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shutil
+import sys
+from importlib import metadata
+
+import harness_deps
+from harness_cdn import OFF, MirrorStore, configured_mode
+from harness_server import REPO_ROOT
+
+CACHE_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "results")
+MAX_ENTRIES = 2000
+# Bump when the key derivation changes.
+KEY_VERSION = 3
+
+
+def _playwright_version():
+    try:
+        return metadata.version("playwright")
+    except metadata.PackageNotFoundError:
+        return "none"
+
+
+class ResultCache:
+    def __init__(self, root=CACHE_DIR, max_entries=MAX_ENTRIES):
+        self.root = root
+        self.max_entries = max_entries
+        self._file_hashes = {}
+        self._environment = None
+        self.hits = self.misses = 0
+
+    def _hash_file(self, rel):
+        if rel not in self._file_hashes:
+            h = hashlib.sha256()
+            try:
+                with open(os.path.join(REPO_ROOT, rel), "rb") as f:
+                    for chunk in iter(lambda: f.read(1 << 16), b""):
+                        h.update(chunk)
+                self._file_hashes[rel] = h.hexdigest()
+            except OSError:
+                self._file_hashes[rel] = "missing"
+        return self._file_hashes[rel]
+
+    def environment(self):
+        """Inputs shared by every script: importmap, CDN mirror, Playwright."""
+        if self._environment is None:
+            # No network probe here: the runner resolves the mode before keying.
+            mode = configured_mode() or "auto"
+            self._environment = {
+                "version": KEY_VERSION,
+                "importmap": harness_deps.importmap(),
+                "cdn_mode": mode,
+                "cdn": MirrorStore().fingerprint() if mode != OFF else None,
+                "playwright": _playwright_version(),
+            }
+        return self._environment
+
+    def key(self, name, script_args=()):
+        h = hashlib.sha256()
+        h.update(json.dumps(self.environment(), sort_keys=True).encode())
+        h.update(json.dumps([name, list(script_args)]).encode())
+        for node in sorted(harness_deps.script_inputs(name)):
+            digest = node if node.startswith(harness_deps.EXTERNAL) else self._hash_file(node)
+            h.update(f"{node}\0{digest}\n".encode())
+        return h.hexdigest()
+
+    def _path(self, key):
+        return os.path.join(self.root, key[:2], f"{key}.json")
+
+    def get(self, key):
+        """Cached result dict for `key`, or None."""
+        path = self._path(key)
+        try:
+            with open(path, encoding="utf-8") as f:
+                entry = json.load(f)
+        except (OSError, ValueError):
+            self.misses += 1
+            return None
+        os.utime(path)
+        self.hits += 1
+        return entry
+
+    def put(self, key, result):
+        path = self._path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp = f"{path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(result, f)
+        os.replace(tmp, path)
+
+    def entries(self):
+        return glob.glob(os.path.join(self.root, "*", "*.json"))
+
+    def prune(self):
+        """Evict least recently used entries beyond max_entries; returns the count removed."""
+        entries = self.entries()
+        if len(entries) <= self.max_entries:
+            return 0
+        entries.sort(key=os.path.getmtime)
+        stale = entries[:len(entries) - self.max_entries]
+        for path in stale:
+            os.remove(path)
+        return len(stale)
+
+    def clear(self):
+        shutil.rmtree(self.root, ignore_errors=True)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Inspect the runner's result cache.")
+    parser.add_argument("command", choices=("stats", "clear", "key"))
+    parser.add_argument("scripts", nargs="*", help="scripts to print keys for (with `key`)")
+    args = parser.parse_args(argv)
+    cache = ResultCache()
+    if args.command == "clear":
+        cache.clear()
+        print(f"Cleared {cache.root}.")
+    elif args.command == "key":
+        for name in args.scripts:
+            print(f"{cache.key(name)}  {name}")
+    else:
+        entries = cache.entries()
+        size = sum(os.path.getsize(p) for p in entries)
+        print(f"{len(entries)} cached results ({size / 1e6:.1f} MB) in {cache.root}, limit {cache.max_entries}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
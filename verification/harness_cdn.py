@@ -0,0 +1,377 @@
+"""Offline CDN mirror for the verification harness.
+
+index.html and the standalone pages pull Tailwind, Phaser, three.js,
+simplex-noise, Matter.js, Font Awesome and Google Fonts from CDNs. On test
+boxes without network every one of those requests waits for a timeout. The
+mirror answers them from a content-addressed store on local disk through
+Playwright routing:
+
+    from harness_cdn import mirror_context
+
+    with mirror_context(context) as mirror:
+        page = context.new_page()
+        ...
+    # leaving the block raises UnmirroredRequestError if any CDN URL missed
+
+`browser_context()` / `async_browser_context()` in harness_browser.py install
+it automatically unless HARNESS_CDN_MODE=off.
+
+Modes (HARNESS_CDN_MODE):
+    offline  serve from the mirror; misses are aborted and reported
+    record   serve hits, fetch misses from the network and store them
+    off      no routing
+When unset the mode is offline if a mirror has been seeded. With an empty
+mirror it is off only if a CDN host is reachable (one short TCP probe per
+process tree, see `has_network()`); without network it stays offline, so the
+first CDN request fails loudly instead of every page waiting on timeouts.
+
+`seed` fetches every CDN URL in the top-level pages and every full-URL ES
+import under js/ (harness_deps' external nodes), following the imports of
+each mirrored module. Seed the mirror on a machine with network, then copy
+verification/.harness/cdn to the test boxes (or point HARNESS_CDN_DIR at a
+shared copy):
+
+    python verification/harness_cdn.py seed
+    python verification/harness_cdn.py stats
+"""
+import argparse
+import hashlib
+import json
+import os
+import re
+import socket
+import sys
+import threading
+import urllib.request
+from contextlib import asynccontextmanager, contextmanager
+from functools import lru_cache
+from urllib.parse import urljoin, urlsplit
+
+import harness_metrics
+from harness_server import REPO_ROOT
+
+CDN_DIR_ENV = "HARNESS_CDN_DIR"
+CDN_MODE_ENV = "HARNESS_CDN_MODE"
+DEFAULT_CDN_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "cdn")
+
+OFFLINE, RECORD, OFF = "offline", "record", "off"
+LOCAL_HOSTS = {"localhost", "127.0.0.1", "[::1]", "::1"}
+PROBE_HOST = ("cdn.jsdelivr.net", 443)
+PROBE_TIMEOUT = 1.5
+
+# Headers worth replaying; CORS is always granted so module scripts and
+# fonts loaded cross-origin are accepted.
+_KEPT_HEADERS = ("content-type",)
+_CORS = {"access-control-allow-origin": "*"}
+
+
+class UnmirroredRequestError(RuntimeError):
+    """A page requested an external URL that is not in the mirror."""
+
+    def __init__(self, urls):
+        self.urls = sorted(set(urls))
+        super().__init__(
+            f"{len(self.urls)} external URL(s) are not mirrored:\n  " + "\n  ".join(self.urls)
+            + "\nRun `python verification/harness_cdn.py seed` (or HARNESS_CDN_MODE=record) on a machine with network."
+        )
+
+
+def is_external(url):
+    parts = urlsplit(url)
+    return parts.scheme in ("http", "https") and parts.hostname not in LOCAL_HOSTS
+
+
+class MirrorStore:
+    """URL -> blob index over a sha256-addressed blob directory."""
+
+    def __init__(self, root=None):
+        self.root = root or os.environ.get(CDN_DIR_ENV) or DEFAULT_CDN_DIR
+        self.index_path = os.path.join(self.root, "index.json")
+        self._lock = threading.Lock()
+        self.index = self._load()
+
+    def _load(self):
+        try:
+            with open(self.index_path, encoding="utf-8") as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+    def blob_path(self, digest):
+        return os.path.join(self.root, "blobs", digest[:2], digest)
+
+    def get(self, url):
+        """(body, headers) for `url`, or None when it is not mirrored."""
+        entry = self.index.get(url)
+        if not entry:
+            return None
+        try:
+            with open(self.blob_path(entry["sha256"]), "rb") as f:
+                return f.read(), {**entry.get("headers", {}), **_CORS}
+        except OSError:
+            return None
+
+    def put(self, url, body, headers):
+        digest = hashlib.sha256(body).hexdigest()
+        path = self.blob_path(digest)
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp = f"{path}.{os.getpid()}.tmp"
+            with open(tmp, "wb") as f:
+                f.write(body)
+            os.replace(tmp, path)
+        kept = {k: v for k, v in ((k.lower(), v) for k, v in headers.items()) if k in _KEPT_HEADERS}
+        with self._lock:
+            # Other workers may have recorded URLs since we loaded the index.
+            self.index = {**self._load(), **self.index}
+            self.index[url] = {"sha256": digest, "size": len(body), "headers": kept}
+            self._save()
+        return digest
+
+    def _save(self):
+        os.makedirs(self.root, exist_ok=True)
+        tmp = f"{self.index_path}.{os.getpid()}.tmp"
+        with open(tmp, "w", encoding="utf-8") as f:
+            json.dump(self.index, f, indent=2, sort_keys=True)
+        os.replace(tmp, self.index_path)
+
+    def fingerprint(self):
+        """Stable hash of every mirrored URL and its content."""
+        h = hashlib.sha256()
+        for url in sorted(self.index):
+            h.update(f"{url}\0{self.index[url]['sha256']}\n".encode())
+        return h.hexdigest()
+
+
+class CdnMirror:
+    """Per-context routing state and hit/miss accounting."""
+
+    def __init__(self, store=None, mode=None):
+        self.store = store or MirrorStore()
+        self.mode = mode or default_mode(self.store)
+        self.hits = 0
+        self.misses = []
+        self.recorded = []
+        self.bytes_served = 0
+
+    def lookup(self, url):
+        cached = self.store.get(url)
+        if cached:
+            self.hits += 1
+            self.bytes_served += len(cached[0])
+        return cached
+
+    def handle(self, route):
+        url = route.request.url
+        cached = self.lookup(url)
+        if cached:
+            body, headers = cached
+            return route.fulfill(status=200, headers=headers, body=body)
+        if self.mode == RECORD:
+            response = route.fetch()
+            body = response.body()
+            if response.ok:
+                self.store.put(url, body, response.headers)
+                self.recorded.append(url)
+            return route.fulfill(response=response, body=body, headers={**response.headers, **_CORS})
+        self._miss(url)
+        return route.abort("internetdisconnected")
+
+    async def async_handle(self, route):
+        url = route.request.url
+        cached = self.lookup(url)
+        if cached:
+            body, headers = cached
+            return await route.fulfill(status=200, headers=headers, body=body)
+        if self.mode == RECORD:
+            response = await route.fetch()
+            body = await response.body()
+            if response.ok:
+                self.store.put(url, body, response.headers)
+                self.recorded.append(url)
+            return await route.fulfill(response=response, body=body, headers={**response.headers, **_CORS})
+        self._miss(url)
+        return await route.abort("internetdisconnected")
+
+    def _miss(self, url):
+        self.misses.append(url)
+        print(f"CDN MIRROR MISS: {url}", file=sys.stderr)
+
+    def report(self):
+        harness_metrics.record("cdn.hits", self.hits, mode=self.mode)
+        harness_metrics.record("cdn.misses", len(self.misses), mode=self.mode)
+        harness_metrics.record("cdn.bytes_served", self.bytes_served, mode=self.mode)
+        if self.recorded:
+            harness_metrics.record("cdn.recorded", len(self.recorded), mode=self.mode)
+
+    def check(self):
+        if self.misses:
+            raise UnmirroredRequestError(self.misses)
+
+
+@lru_cache(maxsize=None)
+def has_network():
+    """True if a CDN host accepts a TCP connection within PROBE_TIMEOUT."""
+    try:
+        socket.create_connection(PROBE_HOST, timeout=PROBE_TIMEOUT).close()
+        return True
+    except OSError:
+        return False
+
+
+def configured_mode(store=None):
+    """The mode implied by HARNESS_CDN_MODE or a seeded mirror, or None when
+    it would take a network probe to decide. Has no side effects."""
+    mode = os.environ.get(CDN_MODE_ENV)
+    if mode:
+        return mode
+    return OFFLINE if (store or MirrorStore()).index else None
+
+
+def default_mode(store=None):
+    mode = configured_mode(store)
+    if mode:
+        return mode
+    mode = OFF if has_network() else OFFLINE
+    # Scripts started from here inherit the answer instead of probing again.
+    os.environ[CDN_MODE_ENV] = mode
+    return mode
+
+
+@contextmanager
+def mirror_context(context, mode=None, store=None):
+    """Route external requests of a sync BrowserContext through the mirror."""
+    store = store or MirrorStore()
+    mode = mode or default_mode(store)
+    if mode == OFF:
+        yield None
+        return
+    mirror = CdnMirror(store, mode)
+    context.route(is_external, mirror.handle)
+    try:
+        yield mirror
+    finally:
+        mirror.report()
+    mirror.check()
+
+
+@asynccontextmanager
+async def async_mirror_context(context, mode=None, store=None):
+    store = store or MirrorStore()
+    mode = mode or default_mode(store)
+    if mode == OFF:
+        yield None
+        return
+    mirror = CdnMirror(store, mode)
+    await context.route(is_external, mirror.async_handle)
+    try:
+        yield mirror
+    finally:
+        mirror.report()
+    mirror.check()
+
+
+# --- Seeding ---
+
+_ATTR_URL = re.compile(r"""(?:src|href)\s*=\s*["'](https?://[^"']+)["']""", re.I)
+_IMPORTMAP = re.compile(r"""<script[^>]*type=["']importmap["'][^>]*>(.*?)</script>""", re.I | re.S)
+_PRECONNECT = re.compile(r"""<link[^>]*rel=["'](?:preconnect|dns-prefetch)["'][^>]*>""", re.I)
+_CSS_URL = re.compile(r"""url\(\s*["']?([^"')]+)["']?\s*\)""")
+
+
+def page_urls(root=REPO_ROOT):
+    """External script/style/importmap URLs referenced by top-level HTML pages."""
+    urls = set()
+    for name in sorted(os.listdir(root)):
+        if not name.endswith(".html"):
+            continue
+        with open(os.path.join(root, name), encoding="utf-8", errors="replace") as f:
+            html = f.read()
+        # preconnect hints name an origin, not a resource
+        urls.update(_ATTR_URL.findall(_PRECONNECT.sub("", html)))
+        for block in _IMPORTMAP.findall(html):
+            urls.update(re.findall(r'"(https?://[^"]+)"', block))
+    # Prefix mappings such as three/addons/ are filled in by record mode.
+    return sorted(u for u in urls if not u.endswith("/"))
+
+
+def module_urls():
+    """Full-URL ES modules imported from js/ (harness_deps' external nodes)."""
+    import harness_deps
+
+    g = harness_deps.graph()
+    nodes = {t for targets in g.edges.values() for t, _ in targets if t.startswith(harness_deps.EXTERNAL)}
+    return sorted(u for u in (n[len(harness_deps.EXTERNAL):] for n in nodes)
+                  if u.startswith(("http://", "https://")) and not u.endswith("/"))
+
+
+def _module_imports(url, body):
+    """Absolute URLs a mirrored JS module imports (relative or importmap specifiers)."""
+    import harness_deps
+
+    static, dynamic = harness_deps.parse_imports(body.decode("utf-8", "replace"))
+    found = []
+    for spec in static + dynamic:
+        if spec.startswith(("./", "../", "/")) or "://" in spec:
+            found.append(urljoin(url, spec))
+        else:
+            target = harness_deps.resolve(spec, "")[len(harness_deps.EXTERNAL):]
+            if "://" in target:
+                found.append(target)
+    return found
+
+
+def _download(url):
+    # Google Fonts serves woff2 only to browsers it recognises.
+    req = urllib.request.Request(url, headers={"User-Agent": "Mozilla/5.0 Chrome/120.0 Safari/537.36"})
+    with urllib.request.urlopen(req, timeout=30) as resp:
+        return resp.read(), dict(resp.headers)
+
+
+def seed(store, urls):
+    """Download `urls` (plus url() assets of stylesheets and the imports of
+    JS modules) into `store`."""
+    queue, seen, failed = list(urls), set(), []
+    while queue:
+        url = queue.pop(0)
+        if url in seen or url in store.index:
+            continue
+        seen.add(url)
+        try:
+            body, headers = _download(url)
+        except OSError as e:
+            failed.append((url, e))
+            continue
+        store.put(url, body, headers)
+        print(f"mirrored {len(body):>9} B  {url}")
+        if "css" in headers.get("Content-Type", "") or url.split("?")[0].endswith(".css"):
+            for ref in _CSS_URL.findall(body.decode("utf-8", "replace")):
+                if not ref.startswith("data:"):
+                    queue.append(urljoin(url, ref).split("#")[0])
+        elif "javascript" in headers.get("Content-Type", "") or url.split("?")[0].endswith((".js", ".mjs")):
+            queue += _module_imports(url, body)
+    for url, e in failed:
+        print(f"FAILED {url}: {e}", file=sys.stderr)
+    return not failed
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Manage the offline CDN mirror.")
+    parser.add_argument("command", choices=["seed", "stats"])
+    parser.add_argument("--dir", default=None, help=f"mirror directory (default {DEFAULT_CDN_DIR})")
+    args = parser.parse_args(argv)
+    store = MirrorStore(args.dir)
+
+    if args.command == "seed":
+        return 0 if seed(store, sorted(set(page_urls()) | set(module_urls()))) else 1
+
+    total = sum(e["size"] for e in store.index.values())
+    blobs = {e["sha256"] for e in store.index.values()}
+    for url, entry in sorted(store.index.items()):
+        print(f"{entry['size']:>9} B  {entry['sha256'][:12]}  {url}")
+    print(f"\n{len(store.index)} URLs, {len(blobs)} blobs, {total / 1e6:.2f} MB, fingerprint {store.fingerprint()[:16]}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,233 @@
+"""Structured console / pageerror collection with per-game deduplication.
+
+Instead of echoing every console message to stdout, attach a collector:
+
+    collector = ConsoleCollector()
+    collector.attach(page)            # or: await collector.async_attach(page)
+    ...
+    collector.close()
+    collector.print_matrix()
+
+Every console message and uncaught page error is streamed to
+verification/.harness/console/<script>.jsonl (rewritten per run). Each row
+carries a timestamp, the game that was running, the hub state, and a
+signature: the message with numbers and quoted values normalised, plus the top
+stack frame (or console source file) without line and column. The game and state come from the hub's
+lifecycle signals, which an init script forwards as tagged console messages,
+so no extra round trip is made per message.
+
+Only the first occurrence of each error signature per game is printed. At the
+end, `print_matrix()` summarises games x signatures. Aggregate over several
+scripts with:
+
+    python verification/harness_console.py [verification/.harness/console/*.jsonl]
+"""
+import argparse
+import glob
+import json
+import os
+import re
+import sys
+import time
+
+from harness_server import REPO_ROOT
+
+CONSOLE_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "console")
+CONSOLE_PATH_ENV = "HARNESS_CONSOLE_PATH"
+ERROR_LEVELS = ("error", "pageerror")
+MARKER = "__harness_lifecycle__"
+
+# Forwards hub lifecycle signals to the console stream so the collector knows
+# which game each message belongs to.
+FORWARDER_JS = """(() => {
+    if (window.__harnessConsoleForwarder) return;
+    window.__harnessConsoleForwarder = true;
+    for (const name of ['game-initialized', 'shutdown-complete', 'menu-ready']) {
+        window.addEventListener('minigamehub:' + name, (e) =>
+            console.debug('%s', JSON.stringify({ name, gameId: e.detail && e.detail.gameId })));
+    }
+})()""" % MARKER
+
+_LOCATION = re.compile(r":\d+(:\d+)?\)?$")
+_ORIGIN = re.compile(r"https?://(localhost|127\.0\.0\.1)(:\d+)?/")
+_QUOTED = re.compile(r"""(['"`])(?:(?!\1).){1,80}\1""")
+_NUMBER = re.compile(r"\b\d+(\.\d+)?\b")
+_HEX = re.compile(r"\b0x[0-9a-f]+\b|\b[0-9a-f]{8,}\b", re.I)
+
+
+def normalize_message(message):
+    first = (message or "").strip().splitlines()[0] if message and message.strip() else ""
+    first = _ORIGIN.sub("", first)
+    first = _HEX.sub("H", first)
+    first = _QUOTED.sub("'S'", first)
+    return _NUMBER.sub("N", first)[:200]
+
+
+def top_frame(stack):
+    for line in (stack or "").splitlines():
+        line = line.strip()
+        if line.startswith("at "):
+            return _LOCATION.sub("", _ORIGIN.sub("", line[3:])).rstrip(")").replace(" (", " ")
+    return ""
+
+
+def signature(message, stack="", source=""):
+    """Stable identity of an error: normalised message + top frame (or source file)."""
+    where = top_frame(stack) or _ORIGIN.sub("", source or "")
+    return f"{normalize_message(message)} @ {where or '?'}"
+
+
+def default_path():
+    if os.environ.get(CONSOLE_PATH_ENV):
+        return os.environ[CONSOLE_PATH_ENV]
+    script = os.path.splitext(os.path.basename(sys.argv[0] or "interactive"))[0]
+    return os.path.join(CONSOLE_DIR, f"{script}.jsonl")
+
+
+class ConsoleCollector:
+    def __init__(self, path=None, echo=True, levels=None):
+        """`levels` limits which console types are stored (errors are always kept)."""
+        self.path = path or default_path()
+        self.echo = echo
+        self.levels = set(levels) if levels else None
+        self.game = None
+        self.state = "MENU"
+        self.counts = {}        # (game, signature) -> count
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+        self._out = open(self.path, "w", buffering=1, encoding="utf-8")
+
+    # --- wiring ---
+
+    def attach(self, page):
+        page.add_init_script(FORWARDER_JS)
+        page.on("console", self.on_console)
+        page.on("pageerror", self.on_pageerror)
+        try:
+            page.evaluate(FORWARDER_JS)
+        except Exception:
+            pass  # page not navigated yet; the init script covers it
+        return self
+
+    async def async_attach(self, page):
+        await page.add_init_script(FORWARDER_JS)
+        page.on("console", self.on_console)
+        page.on("pageerror", self.on_pageerror)
+        try:
+            await page.evaluate(FORWARDER_JS)
+        except Exception:
+            pass
+        return self
+
+    def set_game(self, game_id, state="IN_GAME"):
+        """Manual override for pages that do not emit lifecycle signals."""
+        self.game, self.state = game_id, state
+
+    # --- handlers ---
+
+    def on_console(self, msg):
+        text = msg.text
+        if text.startswith(MARKER):
+            self._lifecycle(text[len(MARKER):].strip())
+            return
+        level = msg.type
+        if self.levels is not None and level not in self.levels and level not in ERROR_LEVELS:
+            return
+        location = msg.location or {}
+        url = location.get("url", "")
+        source = f"{url}:{location.get('lineNumber', 0)}" if url else ""
+        self._record(level, text, source=source, sig=signature(text, source=url))
+
+    def on_pageerror(self, error):
+        message = getattr(error, "message", None) or str(error)
+        stack = getattr(error, "stack", None) or ""
+        self._record("pageerror", message, stack=stack, sig=signature(message, stack))
+
+    def _lifecycle(self, payload):
+        try:
+            event = json.loads(payload)
+        except ValueError:
+            return
+        if event["name"] == "game-initialized":
+            self.game, self.state = event.get("gameId"), "IN_GAME"
+        elif event["name"] == "shutdown-complete":
+            self.state = "TRANSITIONING"
+        elif event["name"] == "menu-ready":
+            self.game, self.state = None, "MENU"
+
+    def _record(self, level, text, sig, source="", stack=""):
+        row = {"ts": round(time.time(), 3), "game": self.game, "state": self.state,
+               "level": level, "text": text[:2000], "signature": sig}
+        if source:
+            row["source"] = source
+        if stack:
+            row["stack"] = stack[:4000]
+        self._out.write(json.dumps(row) + "\n")
+        if level not in ERROR_LEVELS:
+            return
+        key = (self.game, sig)
+        self.counts[key] = self.counts.get(key, 0) + 1
+        if self.echo and self.counts[key] == 1:
+            print(f"{level.upper()} [{self.game or 'hub'}] {text.strip().splitlines()[0][:200] if text.strip() else ''}")
+
+    def errors_for(self, game_id):
+        return sum(n for (game, _), n in self.counts.items() if game == game_id)
+
+    def close(self):
+        self._out.close()
+
+    def print_matrix(self):
+        print_matrix(self.counts)
+
+
+def load_counts(paths):
+    """(game, signature) -> count over error rows of JSONL files."""
+    counts = {}
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                try:
+                    row = json.loads(line)
+                except ValueError:
+                    continue
+                if row.get("level") in ERROR_LEVELS:
+                    key = (row.get("game"), row["signature"])
+                    counts[key] = counts.get(key, 0) + 1
+    return counts
+
+
+def print_matrix(counts, max_columns=12):
+    """Compact games x signatures table; signatures are numbered and listed below it."""
+    if not counts:
+        print("No console errors or page errors.")
+        return
+    totals = {}
+    for (_, sig), n in counts.items():
+        totals[sig] = totals.get(sig, 0) + n
+    sigs = sorted(totals, key=lambda s: -totals[s])
+    shown = sigs[:max_columns]
+    games = sorted({g for g, _ in counts}, key=lambda g: (g is None, g or ""))
+    print(f"\n--- Error matrix ({len(games)} games x {len(sigs)} signatures) ---")
+    print(f"{'game':<28} " + " ".join(f"{'#' + str(i + 1):>5}" for i in range(len(shown))))
+    for game in games:
+        cells = [counts.get((game, s), 0) for s in shown]
+        print(f"{game or '(hub)':<28} " + " ".join(f"{c or '.':>5}" for c in cells))
+    print()
+    for i, sig in enumerate(shown):
+        affected = sum(1 for g in games if (g, sig) in counts)
+        print(f"#{i + 1:<3} x{totals[sig]:<5} in {affected:>3} games  {sig}")
+    if len(sigs) > len(shown):
+        print(f"... and {len(sigs) - len(shown)} rarer signatures")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Summarise collected console errors as a games x signatures matrix.")
+    parser.add_argument("paths", nargs="*", help=f"JSONL files (default: {CONSOLE_DIR}/*.jsonl)")
+    parser.add_argument("--columns", type=int, default=12)
+    args = parser.parse_args(argv)
+    paths = args.paths or sorted(glob.glob(os.path.join(CONSOLE_DIR, "*.jsonl")))
+    print_matrix(load_counts(paths), args.columns)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
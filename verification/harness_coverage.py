@@ -0,0 +1,285 @@
+"""JS and CSS coverage across the game sweep: shipped bytes that never run.
+
+One sweep is one session. CDP precise coverage (`Profiler.startPreciseCoverage`
+with block granularity) and CSS rule-usage tracking start before the hub
+reloads, so startup is covered too. Then every registry entry, System ones
+included, is entered, played for `--dwell` seconds and left. The session's
+in-scope ranges go to verification/.harness/coverage/<session>.json.
+
+The report merges every session file in that directory. A byte counts as used
+if any session executed it (JS) or any session matched its rule (CSS). So
+fuzz-style runs under different `--session` names add up, and `--fresh` starts
+over.
+
+For each file under the scope globs (default js/core/*, js/games/* and
+css/style.css) the report gives total bytes, never-used bytes, and the largest
+unused ranges with line numbers. In-scope files that no session loaded are
+listed as never loaded.
+
+    python verification/harness_coverage.py [--dwell 2] [--session NAME] [--fresh] [game-glob ...]
+    python verification/harness_coverage.py --report-only [--ranges 5] [--scope 'js/core/*']
+
+V8 reports JS offsets in UTF-16 code units. They are mapped back to UTF-8
+bytes of the file on disk.
+"""
+import argparse
+import fnmatch
+import glob
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+import harness_metrics
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page
+
+OUT_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "coverage")
+DEFAULT_SCOPE = ("js/core/*", "js/games/*", "css/style.css")
+MIN_RANGE_BYTES = 200
+
+
+def repo_path(url):
+    """Repo-relative path of a same-origin URL, or None."""
+    parts = urlsplit(url)
+    if parts.hostname not in ("localhost", "127.0.0.1"):
+        return None
+    path = parts.path.lstrip("/")
+    return path if os.path.isfile(os.path.join(REPO_ROOT, path)) else None
+
+
+def in_scope(path, scope):
+    return any(fnmatch.fnmatch(path, pattern) for pattern in scope)
+
+
+def scoped_files(scope):
+    found = []
+    for dirpath, dirnames, files in os.walk(REPO_ROOT):
+        dirnames[:] = [d for d in dirnames if not d.startswith(".") and d != "node_modules"]
+        for name in files:
+            path = os.path.relpath(os.path.join(dirpath, name), REPO_ROOT).replace(os.sep, "/")
+            if in_scope(path, scope):
+                found.append(path)
+    return sorted(found)
+
+
+# --- Capture ---
+
+def sweep(page, cdp, patterns, dwell_ms, scope):
+    sheets = {}
+    cdp.on("CSS.styleSheetAdded", lambda e: sheets.__setitem__(e["header"]["styleSheetId"],
+                                                                  e["header"].get("sourceURL", "")))
+    cdp.send("Profiler.enable")
+    cdp.send("Profiler.startPreciseCoverage", {"callCount": False, "detailed": True})
+    cdp.send("DOM.enable")
+    cdp.send("CSS.enable")
+    cdp.send("CSS.startRuleUsageTracking")
+    page.reload()
+    wait_hub_ready(page)
+
+    rule_usage = []
+    # System entries (trophy room, hall of fame, ...) are reachable modules too.
+    for game_id in game_ids(page, patterns):
+        try:
+            enter_game(page, game_id)
+            page.wait_for_timeout(dwell_ms)
+            exit_game(page)
+        except Exception as e:
+            print(f"  {game_id} failed: {e}")
+            try:
+                page.evaluate("window.miniGameHub.transitionToState('MENU')")
+            except Exception:
+                pass
+        rule_usage += cdp.send("CSS.takeCoverageDelta")["coverage"]
+    rule_usage += cdp.send("CSS.stopRuleUsageTracking")["ruleUsage"]
+    scripts = cdp.send("Profiler.takePreciseCoverage")["result"]
+    cdp.send("Profiler.stopPreciseCoverage")
+
+    session = {"js": {}, "css": {}}
+    for script in scripts:
+        path = repo_path(script["url"])
+        if path and in_scope(path, scope):
+            ranges = [[r["startOffset"], r["endOffset"], r["count"]] for f in script["functions"] for r in f["ranges"]]
+            session["js"].setdefault(path, []).append(ranges)
+    by_sheet = {}
+    for rule in rule_usage:
+        by_sheet.setdefault(rule["styleSheetId"], []).append([rule["startOffset"], rule["endOffset"], int(rule["used"])])
+    for sheet_id, rules in by_sheet.items():
+        path = repo_path(sheets.get(sheet_id, ""))
+        if path and in_scope(path, scope):
+            session["css"].setdefault(path, []).append(rules)
+    return session
+
+
+# --- Merge ---
+
+class SourceMap:
+    """UTF-16 code unit -> UTF-8 byte size and line number for a file on disk."""
+
+    def __init__(self, path):
+        with open(os.path.join(REPO_ROOT, path), encoding="utf-8", errors="replace") as f:
+            text = f.read()
+        self.unit_bytes = bytearray()
+        self.line_starts = [0]
+        for ch in text:
+            size = len(ch.encode("utf-8", errors="replace"))
+            if ord(ch) > 0xFFFF:
+                self.unit_bytes += bytes((size // 2, size - size // 2))
+            else:
+                self.unit_bytes.append(size)
+            if ch == "\n":
+                self.line_starts.append(len(self.unit_bytes))
+        self.units = len(self.unit_bytes)
+
+    def line(self, unit):
+        lo, hi = 0, len(self.line_starts) - 1
+        while lo < hi:
+            mid = (lo + hi + 1) // 2
+            if self.line_starts[mid] <= unit:
+                lo = mid
+            else:
+                hi = mid - 1
+        return lo + 1
+
+    def size(self, start, end):
+        return sum(self.unit_bytes[start:end])
+
+
+def paint_js(instance, units):
+    """Used mask of one script instance; the innermost V8 range decides each unit."""
+    used = bytearray(units)
+    for start, end, count in sorted(instance, key=lambda r: (r[0], -r[1])):
+        end = min(end, units)
+        if start < end:
+            used[start:end] = (b"\x01" if count else b"\x00") * (end - start)
+    return used
+
+
+def merge_file(kind, instances, source):
+    """(relevant, used) masks OR-ed over every session's instances of one file."""
+    relevant = bytearray(source.units) if kind == "css" else bytearray(b"\x01" * source.units)
+    used = bytearray(source.units)
+    for instance in instances:
+        if kind == "js":
+            mask = paint_js(instance, source.units)
+        else:
+            mask = bytearray(source.units)
+            for start, end, flag in instance:
+                end = min(end, source.units)
+                relevant[start:end] = b"\x01" * max(0, end - start)
+                if flag:
+                    mask[start:end] = b"\x01" * max(0, end - start)
+        merged = int.from_bytes(used, "little") | int.from_bytes(mask, "little")
+        used = bytearray(merged.to_bytes(source.units, "little"))
+    return relevant, used
+
+
+def unused_ranges(relevant, used, source):
+    """[(start_line, end_line, bytes)] of contiguous relevant-but-unused units, largest first."""
+    ranges, start = [], None
+    for i in range(source.units + 1):
+        dead = i < source.units and relevant[i] and not used[i]
+        if dead and start is None:
+            start = i
+        elif not dead and start is not None:
+            ranges.append((source.line(start), source.line(i - 1), source.size(start, i)))
+            start = None
+    return sorted(ranges, key=lambda r: -r[2])
+
+
+def load_sessions(directory):
+    merged = {"js": {}, "css": {}}
+    paths = sorted(glob.glob(os.path.join(directory, "*.json")))
+    paths = [p for p in paths if os.path.basename(p) != "report.json"]
+    for path in paths:
+        with open(path, encoding="utf-8") as f:
+            session = json.load(f)
+        for kind in ("js", "css"):
+            for file, instances in session.get(kind, {}).items():
+                merged[kind].setdefault(file, []).extend(instances)
+    return merged, len(paths)
+
+
+def report(merged, scope, max_ranges):
+    files, scoped = [], scoped_files(scope)
+    for kind, ext in (("js", ".js"), ("css", ".css")):
+        for path in (p for p in scoped if p.endswith(ext)):
+            source = SourceMap(path)
+            total = source.size(0, source.units)
+            instances = merged[kind].get(path)
+            if not instances:
+                files.append({"file": path, "kind": kind, "bytes": total, "unused_bytes": total,
+                              "loaded": False, "ranges": []})
+                continue
+            relevant, used = merge_file(kind, instances, source)
+            ranges = unused_ranges(relevant, used, source)
+            files.append({
+                "file": path, "kind": kind, "bytes": total, "loaded": True,
+                "unused_bytes": sum(r[2] for r in ranges),
+                "ranges": [{"lines": [a, b], "bytes": n} for a, b, n in ranges[:max_ranges] if n >= MIN_RANGE_BYTES],
+            })
+    return sorted(files, key=lambda f: -f["unused_bytes"])
+
+
+def print_report(files, top):
+    loaded = [f for f in files if f["loaded"]]
+    print(f"{'unused KB':>10} {'total KB':>9} {'unused':>7}  file")
+    for f in loaded[:top] if top else loaded:
+        print(f"{f['unused_bytes'] / 1024:10.1f} {f['bytes'] / 1024:9.1f} {f['unused_bytes'] / max(1, f['bytes']):7.0%}  {f['file']}")
+        for r in f["ranges"]:
+            a, b = r["lines"]
+            print(f"{'':>29}  lines {a}-{b}: {r['bytes'] / 1024:.1f} KB")
+    never = [f for f in files if not f["loaded"]]
+    if never:
+        print(f"\nNever loaded in any session ({len(never)} files, {sum(f['bytes'] for f in never) / 1024:.0f} KB):")
+        for f in never[:top] if top else never:
+            print(f"  {f['bytes'] / 1024:8.1f} KB  {f['file']}")
+        if top and len(never) > top:
+            print(f"  ... and {len(never) - top} more")
+    for kind in ("js", "css"):
+        group = [f for f in files if f["kind"] == kind]
+        total = sum(f["bytes"] for f in group)
+        unused = sum(f["unused_bytes"] for f in group)
+        if total:
+            print(f"{kind.upper()}: {unused / 1024:.0f} of {total / 1024:.0f} KB never used ({unused / total:.0%})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report JS/CSS bytes never used across game sweeps.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--dwell", type=float, default=2.0, help="seconds spent in each game")
+    parser.add_argument("--session", default="sweep", help="name of this run's session file")
+    parser.add_argument("--fresh", action="store_true", help="delete earlier sessions first")
+    parser.add_argument("--report-only", action="store_true", help="merge existing sessions without a sweep")
+    parser.add_argument("--scope", nargs="+", default=list(DEFAULT_SCOPE), help="repo path globs to report on")
+    parser.add_argument("--ranges", type=int, default=3, help="largest unused ranges listed per file")
+    parser.add_argument("--top", type=int, default=30, help="files listed (0 = all)")
+    parser.add_argument("--out", default=OUT_DIR)
+    args = parser.parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    if not args.report_only:
+        if args.fresh:
+            for path in glob.glob(os.path.join(args.out, "*.json")):
+                os.remove(path)
+        with hub_page() as page:
+            session = sweep(page, cdp_session(page), args.games, args.dwell * 1000, args.scope)
+        with open(os.path.join(args.out, f"{args.session}.json"), "w") as f:
+            json.dump(session, f)
+
+    merged, sessions = load_sessions(args.out)
+    files = report(merged, args.scope, args.ranges)
+    with open(os.path.join(args.out, "report.json"), "w") as f:
+        json.dump({"sessions": sessions, "scope": args.scope, "files": files}, f, indent=1)
+    for kind in ("js", "css"):
+        unused = sum(f["unused_bytes"] for f in files if f["kind"] == kind)
+        harness_metrics.record("coverage.unused_bytes", unused, kind=kind)
+    print(f"Merged {sessions} coverage sessions.\n")
+    print_report(files, args.top)
+    print(f"\nReport: {os.path.join(args.out, 'report.json')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
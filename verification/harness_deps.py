@@ -0,0 +1,302 @@
+"""Import graph for js/ and test-impact selection for the verification suite.
+
+The graph is built from the sources alone, without a bundler:
+
+* ES module edges: static `import ... from`, bare `import '...'`,
+  `export ... from` and dynamic `import('...')` across js/;
+* page edges: `<script src>`, stylesheet `<link href>` and inline module
+  imports in the repo's .html pages;
+* load edges: local files a page or module loads without importing them,
+  i.e. string-literal `serviceWorker.register()`, `new Worker()`,
+  `importScripts()` and `fetch()` URLs (so js/main.js -> sw.js);
+* bare specifiers (`three`, `three/addons/...`) resolve through the
+  index.html importmap and stay external.
+
+The games in js/main.js's registry are reached only through
+`importFn: () => import('./games/...')`, so the hub page's closure stops at
+those dynamic imports and each registry ID is a root of its own.
+
+Each verification script is mapped to what it exercises: the pages it opens,
+the games it names (registry IDs, `#<id>` container selectors or card
+titles; every ID when it walks `gameRegistry`, or when it opens the hub
+without naming any), js/ files it names directly, and the harness_ modules it
+imports.
+
+    python verification/harness_deps.py graph js/core/SoundManager.js   # reverse deps
+    python verification/harness_deps.py script verify_hub.py            # inputs of a script
+    python verification/harness_deps.py affected --since main           # scripts to run
+
+The runner takes `--changed-since REF` to run only the affected scripts.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import posixpath
+import re
+import subprocess
+import sys
+from functools import lru_cache
+
+from harness_server import REPO_ROOT
+
+VERIFICATION_DIR = os.path.join(REPO_ROOT, "verification")
+HUB_PAGE = "index.html"
+MAIN_JS = "js/main.js"
+
+_COMMENTS = re.compile(r"/\*.*?\*/|(?<![:'\"\\])//[^\n]*", re.S)
+_STATIC = re.compile(r"""(?:^|[;\s])(?:import|export)\s*(?:[\w*{}\s,$]+?\s*from\s*)?['"]([^'"\n]+)['"]""", re.M)
+_DYNAMIC = re.compile(r"""\bimport\(\s*['"]([^'"\n]+)['"]\s*\)""")
+_SCRIPT_SRC = re.compile(r"""<script\b[^>]*\bsrc=['"]([^'"]+)['"]""", re.I)
+_LINK_HREF = re.compile(r"""<link\b[^>]*\bhref=['"]([^'"]+\.css[^'"]*)['"]""", re.I)
+_INLINE_MODULE = re.compile(r"""<script\b[^>]*type=['"]module['"][^>]*>(.*?)</script>""", re.I | re.S)
+_IMPORTMAP = re.compile(r"""<script\b[^>]*type=['"]importmap['"][^>]*>(.*?)</script>""", re.I | re.S)
+_LOAD = re.compile(r"""\b(?:serviceWorker\.register|new\s+(?:Shared)?Worker|importScripts|fetch)\(\s*['"]([^'"\n]+)['"]""")
+_REGISTRY_ENTRY = re.compile(r"""^\s*'([\w-]+)':\s*\{.*?importFn:\s*\(\)\s*=>\s*import\(\s*'([^']+)'\s*\)""", re.M)
+
+_PY_HARNESS = re.compile(r"^\s*(?:from|import)\s+(harness_\w+)", re.M)
+_PY_PAGE = re.compile(r"""([\w-]+\.html)\b""")
+_PY_JS = re.compile(r"""\b(js/[\w./-]+\.js)\b""")
+_PY_STRING = re.compile(r"""['"]([a-z0-9][a-z0-9-]*)['"]""")
+_PY_ALL_GAMES = re.compile(r"gameRegistry|\bgame_ids\(")
+_PY_SELECTOR = re.compile(r"#([a-z0-9][a-z0-9-]*)")
+_PY_QUOTED = re.compile(r"""['"]([^'"\n]{2,60})['"]""")
+_REGISTRY_NAME = re.compile(r"""^\s*'([\w-]+)':\s*\{\s*name:\s*'((?:[^'\\]|\\.)*)'""", re.M)
+_PY_DATA = re.compile(r"""['"]([\w-]+\.json)['"]""")
+
+EXTERNAL = "external:"
+
+
+def _read(rel):
+    with open(os.path.join(REPO_ROOT, rel), encoding="utf-8", errors="replace") as f:
+        return f.read()
+
+
+def parse_imports(source):
+    """(static, dynamic) module specifiers in a JS source."""
+    source = _COMMENTS.sub("", source)
+    return _STATIC.findall(source), _DYNAMIC.findall(source)
+
+
+@lru_cache(maxsize=None)
+def importmap():
+    match = _IMPORTMAP.search(_read(HUB_PAGE))
+    try:
+        return json.loads(match.group(1)).get("imports", {}) if match else {}
+    except ValueError:
+        return {}
+
+
+def resolve(spec, importer):
+    """Repo-relative path for `spec` imported from `importer`, or an external: id."""
+    if spec.startswith(("./", "../", "/")):
+        base = "" if spec.startswith("/") else posixpath.dirname(importer)
+        return posixpath.normpath(posixpath.join(base, spec.lstrip("/") if not base else spec))
+    if "://" in spec:
+        return EXTERNAL + spec
+    mapping = importmap()
+    if spec in mapping:
+        return EXTERNAL + mapping[spec]
+    for prefix, target in mapping.items():
+        if prefix.endswith("/") and spec.startswith(prefix):
+            return EXTERNAL + target + spec[len(prefix):]
+    return EXTERNAL + spec
+
+
+def load_edges(source):
+    """Local files loaded by URL rather than imported; URLs resolve against the
+    document, and every page lives at the repo root."""
+    edges = []
+    for url in _LOAD.findall(_COMMENTS.sub("", source)):
+        if "://" in url or url.startswith("data:"):
+            continue
+        path = posixpath.normpath(url.split("?")[0].split("#")[0].lstrip("/"))
+        if os.path.isfile(os.path.join(REPO_ROOT, path)):
+            edges.append((path, False))
+    return edges
+
+
+def _page_edges(rel):
+    html = _read(rel)
+    edges = load_edges(html)
+    for url in _SCRIPT_SRC.findall(html) + _LINK_HREF.findall(html):
+        edges.append((resolve(url if "://" in url else "./" + url.split("?")[0], rel), False))
+    for body in _INLINE_MODULE.findall(html):
+        static, dynamic = parse_imports(body)
+        edges += [(resolve(s, rel), False) for s in static] + [(resolve(s, rel), True) for s in dynamic]
+    return edges
+
+
+class ImportGraph:
+    """File-level dependency graph over js/, css/ and the .html pages."""
+
+    def __init__(self):
+        self.edges = {}      # node -> [(target, dynamic)]
+        self.registry = {}   # game id -> module path
+        for dirpath, _, files in os.walk(os.path.join(REPO_ROOT, "js")):
+            for name in files:
+                if name.endswith((".js", ".mjs")):
+                    rel = os.path.relpath(os.path.join(dirpath, name), REPO_ROOT).replace(os.sep, "/")
+                    source = _read(rel)
+                    static, dynamic = parse_imports(source)
+                    self.edges[rel] = ([(resolve(s, rel), False) for s in static]
+                                       + [(resolve(s, rel), True) for s in dynamic] + load_edges(source))
+        for name in os.listdir(REPO_ROOT):
+            if name.endswith(".html"):
+                self.edges[name] = _page_edges(name)
+        self.names = {}      # card title -> game id
+        main = _read(MAIN_JS)
+        for game_id, spec in _REGISTRY_ENTRY.findall(main):
+            self.registry[game_id] = resolve(spec, MAIN_JS)
+        for game_id, name in _REGISTRY_NAME.findall(main):
+            if game_id in self.registry:
+                self.names[name.replace("\\'", "'")] = game_id
+
+    def closure(self, roots):
+        """Every node reachable from `roots`, not following the registry's lazy imports."""
+        registry_targets = set(self.registry.values())
+        seen, stack = set(), list(roots)
+        while stack:
+            node = stack.pop()
+            if node in seen:
+                continue
+            seen.add(node)
+            for target, dynamic in self.edges.get(node, ()):
+                if dynamic and node == MAIN_JS and target in registry_targets:
+                    continue
+                stack.append(target)
+        return seen
+
+    def game_closure(self, game_ids):
+        return self.closure(self.registry[g] for g in game_ids if g in self.registry)
+
+    def dependents(self, node):
+        """Nodes that (transitively) import `node`."""
+        reverse = {}
+        for src, targets in self.edges.items():
+            for target, _ in targets:
+                reverse.setdefault(target, set()).add(src)
+        seen, stack = set(), [node]
+        while stack:
+            for src in reverse.get(stack.pop(), ()):
+                if src not in seen:
+                    seen.add(src)
+                    stack.append(src)
+        return seen
+
+
+@lru_cache(maxsize=None)
+def graph():
+    return ImportGraph()
+
+
+def script_targets(name):
+    """What a verification script exercises: pages, registry IDs, js files, harness modules."""
+    source = _read(os.path.join("verification", name))
+    g = graph()
+    pages = {p for p in _PY_PAGE.findall(source) if os.path.exists(os.path.join(REPO_ROOT, p))}
+    if not pages or "hub_page(" in source:
+        pages.add(HUB_PAGE)
+    if _PY_ALL_GAMES.search(source):
+        games = set(g.registry)
+    else:
+        # Registry IDs, `#<id>` container selectors and card titles.
+        games = {s for s in _PY_STRING.findall(source) + _PY_SELECTOR.findall(source) if s in g.registry}
+        games |= {g.names[s] for s in _PY_QUOTED.findall(source) if s in g.names}
+        if not games and HUB_PAGE in pages:
+            # The hub can reach any game through clicks we cannot resolve.
+            games = set(g.registry)
+    js = {p for p in _PY_JS.findall(source) if os.path.exists(os.path.join(REPO_ROOT, p))}
+    return {
+        "pages": sorted(pages),
+        "games": sorted(games),
+        "js": sorted(js),
+        "harness": sorted(set(_PY_HARNESS.findall(source))),
+    }
+
+
+def harness_closure(modules):
+    """harness_ modules plus the harness_ modules they import."""
+    seen, stack = set(), list(modules)
+    while stack:
+        mod = stack.pop()
+        path = os.path.join(VERIFICATION_DIR, f"{mod}.py")
+        if mod in seen or not os.path.exists(path):
+            continue
+        seen.add(mod)
+        stack += _PY_HARNESS.findall(_read(os.path.relpath(path, REPO_ROOT)))
+    return seen
+
+
+def script_inputs(name):
+    """Repo-relative files (and external: URLs) a script depends on."""
+    targets = script_targets(name)
+    g = graph()
+    nodes = g.closure(targets["pages"] + targets["js"]) | g.game_closure(targets["games"])
+    nodes.add(f"verification/{name}")
+    nodes |= {f"verification/{m}.py" for m in harness_closure(targets["harness"])}
+    # Checked-in data the script or its harness modules read (budgets, masks, ...).
+    for path in [n for n in nodes if n.startswith("verification/")]:
+        for data in _PY_DATA.findall(_read(path)):
+            if os.path.exists(os.path.join(VERIFICATION_DIR, data)):
+                nodes.add(f"verification/{data}")
+    return nodes
+
+
+def changed_files(since, include_worktree=True):
+    """Files changed between `since` and HEAD (plus uncommitted changes)."""
+    def names(*args):
+        out = subprocess.run(["git", *args], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+        return {line.strip() for line in out.stdout.splitlines() if line.strip()}
+
+    changed = names("diff", "--name-only", f"{since}...HEAD")
+    if include_worktree:
+        changed |= names("diff", "--name-only", "HEAD")
+        changed |= names("ls-files", "--others", "--exclude-standard")
+    return changed
+
+
+def affected(names, changed):
+    """Subset of `names` whose inputs intersect `changed`, in input order."""
+    changed = set(changed)
+    return [n for n in names if script_inputs(n) & changed]
+
+
+def main(argv=None):
+    from harness_runner import discover
+
+    parser = argparse.ArgumentParser(description="Inspect the JS import graph and select affected scripts.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    grp = sub.add_parser("graph", help="show what a file imports and what depends on it")
+    grp.add_argument("path")
+    scr = sub.add_parser("script", help="show what a verification script exercises")
+    scr.add_argument("name")
+    aff = sub.add_parser("affected", help="list scripts affected by a diff")
+    aff.add_argument("--since", default="HEAD", help="git ref to diff against (default: uncommitted changes)")
+    aff.add_argument("patterns", nargs="*")
+    args = parser.parse_args(argv)
+    g = graph()
+
+    if args.command == "graph":
+        for target, dynamic in sorted(g.edges.get(args.path, ())):
+            print(f"  -> {target}{' (dynamic)' if dynamic else ''}")
+        dependents = sorted(g.dependents(args.path))
+        games = sorted(gid for gid, mod in g.registry.items() if mod == args.path or args.path in g.closure([mod]))
+        print(f"{len(dependents)} dependents; reached by {len(games)} registry games: {', '.join(games) or '-'}")
+    elif args.command == "script":
+        targets = script_targets(args.name)
+        for kind, items in targets.items():
+            print(f"{kind:<8} {', '.join(items) if len(items) <= 12 else f'{len(items)} entries'}")
+        print(f"{len(script_inputs(args.name))} input files")
+    else:
+        names = discover(args.patterns)
+        changed = changed_files(args.since)
+        selected = affected(names, changed)
+        print(f"{len(changed)} changed files -> {len(selected)}/{len(names)} scripts affected")
+        for name in selected:
+            print(f"  {name}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,111 @@
+"""Frame-time recording for verification scripts.
+
+`install()` injects a requestAnimationFrame timestamp recorder and a long-task
+observer into the page. Bracket a measurement window with `start()` /
+`stop()` and feed the result to `frame_stats()`:
+
+    install(page)
+    enter_game(page, "neon-swarm")
+    start(page)
+    page.wait_for_timeout(5000)
+    stats = frame_stats(stop(page))   # p50/p95/p99, dropped frames, long tasks
+"""
+import math
+
+FRAME_BUDGET_MS = 1000 / 60
+
+# Runs its own rAF loop next to the game's. When the game's frame work grows,
+# the interval between these callbacks grows with it. Under harness_replay's
+# virtual clock rAF timestamps are synthetic, so the real clock is read instead.
+RECORDER_JS = """() => {
+    if (window.__harnessFrames) return;
+    const state = window.__harnessFrames = { recording: false, frames: [], longTasks: [] };
+    const realNow = window.__harnessReplay && window.__harnessReplay.realNow;
+    const tick = (t) => {
+        if (state.recording) state.frames.push(realNow ? realNow() : t);
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+    try {
+        new PerformanceObserver((list) => {
+            if (!state.recording) return;
+            for (const e of list.getEntries()) state.longTasks.push({ start: e.startTime, duration: e.duration });
+        }).observe({ type: 'longtask' });
+    } catch (e) {
+        state.longTasksUnsupported = true;
+    }
+}"""
+
+_START_JS = """() => {
+    const s = window.__harnessFrames;
+    s.frames = []; s.longTasks = []; s.recording = true;
+}"""
+
+_STOP_JS = """() => {
+    const s = window.__harnessFrames;
+    s.recording = false;
+    return { frames: s.frames, longTasks: s.longTasks, longTasksUnsupported: !!s.longTasksUnsupported };
+}"""
+
+
+def install(page):
+    page.evaluate(RECORDER_JS)
+
+
+def start(page):
+    page.evaluate(_START_JS)
+
+
+def stop(page):
+    return page.evaluate(_STOP_JS)
+
+
+async def async_install(page):
+    await page.evaluate(RECORDER_JS)
+
+
+async def async_start(page):
+    await page.evaluate(_START_JS)
+
+
+async def async_stop(page):
+    return await page.evaluate(_STOP_JS)
+
+
+def percentile(values, pct):
+    """Linear-interpolated percentile of an unsorted sequence (pct in 0..100)."""
+    if not values:
+        return None
+    ordered = sorted(values)
+    k = (len(ordered) - 1) * pct / 100
+    lo, hi = math.floor(k), math.ceil(k)
+    if lo == hi:
+        return ordered[lo]
+    return ordered[lo] + (ordered[hi] - ordered[lo]) * (k - lo)
+
+
+def frame_stats(recording, budget_ms=FRAME_BUDGET_MS):
+    """Summarise a `stop()` result into frame-time statistics (all times in ms)."""
+    frames = recording.get("frames", [])
+    deltas = [b - a for a, b in zip(frames, frames[1:])]
+    long_tasks = recording.get("longTasks", [])
+    if not deltas:
+        return {"frames": len(frames), "p50": None, "p95": None, "p99": None, "max": None,
+                "mean": None, "fps": 0.0, "dropped": 0, "over_budget": 0,
+                "long_tasks": len(long_tasks), "long_task_ms": 0.0}
+    # A frame that takes N budgets long stands in for N-1 frames that never rendered.
+    dropped = sum(max(0, round(d / budget_ms) - 1) for d in deltas)
+    span = frames[-1] - frames[0]
+    return {
+        "frames": len(frames),
+        "p50": round(percentile(deltas, 50), 3),
+        "p95": round(percentile(deltas, 95), 3),
+        "p99": round(percentile(deltas, 99), 3),
+        "max": round(max(deltas), 3),
+        "mean": round(sum(deltas) / len(deltas), 3),
+        "fps": round(1000 * len(deltas) / span, 2) if span else 0.0,
+        "dropped": dropped,
+        "over_budget": sum(1 for d in deltas if d > budget_ms * 1.5),
+        "long_tasks": len(long_tasks),
+        "long_task_ms": round(sum(t["duration"] for t in long_tasks), 3),
+    }
@@ -0,0 +1,230 @@
+"""Seeded input fuzzer for every registered game.
+
+An injected driver runs a timer loop in the page. Each tick dispatches a batch
+of random events drawn from a seeded mulberry32 stream:
+
+* keyboard: keydown/keyup pairs on the keys games listen for (arrows,
+  WASD, Space, Enter, digits, ...). InputManager sees them through its
+  window listeners;
+* pointer/mouse: moves, presses and clicks at random points over the game
+  container;
+* touch: touchstart/move/end on the container and on the MobileControls
+  D-pad and action button. The context is created with `has_touch`, so
+  MobileControls renders them.
+
+Escape is excluded by default because it leaves the game.
+
+Every `--probe` ms one extra key event is timed. Latency runs from
+`dispatchEvent` to the first task after the next animation frame, i.e. after
+the game's update/draw for that frame. Uncaught errors and unhandled
+rejections are caught in the page together with the index of the event that
+preceded them, and grouped into crash signatures (see harness_console). The
+listeners are installed once per page by an init script; each game starts
+with an empty error buffer.
+
+Each game's seed derives from `--seed` and the game ID, so a single game
+reproduces with the same flags:
+
+    python verification/harness_fuzz.py [--rate 2000] [--seconds 5] [--seed 1] [game-glob ...]
+"""
+import argparse
+import json
+import os
+import sys
+import zlib
+
+import harness_metrics
+from harness_console import signature
+from harness_frames import percentile
+from harness_ready import enter_game, exit_game
+from harness_server import REPO_ROOT
+from harness_session import game_ids, hub_page
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "fuzz.json")
+TICK_MS = 4
+
+KEYS = ["ArrowUp", "ArrowDown", "ArrowLeft", "ArrowRight", "w", "a", "s", "d", " ", "Enter",
+        "Shift", "z", "x", "c", "e", "q", "r", "f", "1", "2", "3", "4", "Tab", "Backspace"]
+CODES = {" ": "Space", "Enter": "Enter", "Shift": "ShiftLeft", "Tab": "Tab", "Backspace": "Backspace"}
+
+# Installed once per page: the error listeners write into whichever game's
+# buffer FUZZ_JS last reset, instead of piling up one pair per game.
+FUZZ_INIT_JS = """(() => {
+    const state = window.__harnessFuzz = { dispatched: 0, errors: [], latencies: [], running: false, recent: [] };
+    state.onError = (message, stack) => state.errors.push({ message: String(message), stack: stack || '',
+        event: state.dispatched, recent: state.recent.slice() });
+    window.addEventListener('error', (e) => state.onError(e.message, e.error && e.error.stack));
+    window.addEventListener('unhandledrejection', (e) => state.onError(
+        'Unhandled rejection: ' + (e.reason && e.reason.message || e.reason), e.reason && e.reason.stack));
+})();"""
+
+FUZZ_JS = """([gameId, seed, rate, probeMs, keys, codes]) => {
+    let s = seed >>> 0;
+    const rand = () => {
+        s = (s + 0x6D2B79F5) >>> 0;
+        let t = s;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+    const pick = (a) => a[Math.floor(rand() * a.length)];
+    const container = document.getElementById(gameId) || document.body;
+    const state = Object.assign(window.__harnessFuzz, {
+        dispatched: 0, errors: [], latencies: [], running: true, recent: [],
+    });
+    const onError = state.onError;
+    const codeOf = (key) => codes[key] || (key.length === 1 ? (/[0-9]/.test(key) ? 'Digit' + key : 'Key' + key.toUpperCase()) : key);
+    const point = () => {
+        const r = container.getBoundingClientRect();
+        const w = r.width || innerWidth, h = r.height || innerHeight;
+        return { clientX: (r.left || 0) + rand() * w, clientY: (r.top || 0) + rand() * h };
+    };
+    const touchTargets = () => [container, ...document.querySelectorAll('#mobile-dpad > div, #mobile-action-btn')];
+    const held = new Set();
+
+    const fire = (target, event) => {
+        state.dispatched++;
+        state.recent.push(event.type);
+        if (state.recent.length > 20) state.recent.shift();
+        target.dispatchEvent(event);
+    };
+    const key = (type, k) => fire(document.activeElement || document.body,
+        new KeyboardEvent(type, { key: k, code: codeOf(k), bubbles: true, cancelable: true }));
+    const generators = [
+        () => { const k = pick(keys); key('keydown', k); held.add(k); },
+        () => { const k = held.size ? pick([...held]) : pick(keys); key('keyup', k); held.delete(k); },
+        () => { const p = point(); const t = document.elementFromPoint(p.clientX, p.clientY) || container;
+                fire(t, new PointerEvent('pointermove', { ...p, bubbles: true }));
+                fire(t, new MouseEvent('mousemove', { ...p, bubbles: true })); },
+        () => { const p = point(); const t = document.elementFromPoint(p.clientX, p.clientY) || container;
+                const type = pick(['down', 'up']);
+                fire(t, new PointerEvent('pointer' + type, { ...p, button: 0, bubbles: true }));
+                fire(t, new MouseEvent('mouse' + type, { ...p, button: 0, bubbles: true }));
+                if (type === 'up') fire(t, new MouseEvent('click', { ...p, button: 0, bubbles: true })); },
+        () => { const target = pick(touchTargets()); const r = target.getBoundingClientRect();
+                const touch = new Touch({ identifier: 1, target, clientX: r.left + rand() * r.width, clientY: r.top + rand() * r.height });
+                const type = pick(['touchstart', 'touchmove', 'touchend']);
+                const touches = type === 'touchend' ? [] : [touch];
+                fire(target, new TouchEvent(type, { touches, targetTouches: touches, changedTouches: [touch], bubbles: true, cancelable: true })); },
+    ];
+
+    const afterFrame = (cb) => requestAnimationFrame(() => {
+        const ch = new MessageChannel();
+        ch.port1.onmessage = cb;
+        ch.port2.postMessage(0);
+    });
+    let lastProbe = performance.now(), budget = 0, last = performance.now();
+    const loop = () => {
+        if (!state.running) return;
+        const now = performance.now();
+        budget += (now - last) * rate / 1000;
+        last = now;
+        for (; budget >= 1; budget--) {
+            try { pick(generators)(); } catch (e) { onError(e.message, e.stack); }
+        }
+        if (now - lastProbe >= probeMs) {
+            lastProbe = now;
+            const k = pick(keys);
+            const t0 = performance.now();
+            key('keydown', k);
+            afterFrame(() => { state.latencies.push(performance.now() - t0); key('keyup', k); });
+        }
+        setTimeout(loop, %d);
+    };
+    loop();
+}""" % TICK_MS
+
+_STOP_JS = """() => {
+    const s = window.__harnessFuzz;
+    s.running = false;
+    return { dispatched: s.dispatched, errors: s.errors, latencies: s.latencies };
+}"""
+
+
+def game_seed(seed, game_id):
+    return zlib.crc32(f"{seed}:{game_id}".encode())
+
+
+def fuzz_game(page, game_id, seed, rate, seconds, probe_ms, keys):
+    enter_game(page, game_id)
+    page.evaluate(FUZZ_JS, [game_id, game_seed(seed, game_id), rate, probe_ms, keys, CODES])
+    page.wait_for_timeout(seconds * 1000)
+    result = page.evaluate(_STOP_JS)
+    state = page.evaluate("window.miniGameHub.getState()")
+
+    crashes = {}
+    for error in result["errors"]:
+        sig = signature(error["message"], error["stack"])
+        entry = crashes.setdefault(sig, {"count": 0, "first_event": error["event"], "recent": error["recent"],
+                                         "stack": error["stack"]})
+        entry["count"] += 1
+    latencies = result["latencies"]
+    report = {
+        "game": game_id,
+        "seed": game_seed(seed, game_id),
+        "events": result["dispatched"],
+        "events_per_s": round(result["dispatched"] / seconds),
+        "latency_p50_ms": percentile(latencies, 50),
+        "latency_p95_ms": percentile(latencies, 95),
+        "latency_max_ms": max(latencies) if latencies else None,
+        "final_state": state,
+        "crashes": crashes,
+    }
+    if state == "IN_GAME":
+        exit_game(page)
+    else:
+        page.evaluate("window.miniGameHub.transitionToState('MENU')")
+    harness_metrics.record("fuzz.events_per_s", report["events_per_s"], game=game_id)
+    harness_metrics.record("fuzz.crash_signatures", len(crashes), game=game_id)
+    if report["latency_p95_ms"] is not None:
+        harness_metrics.record("fuzz.latency_p95_ms", round(report["latency_p95_ms"], 2), game=game_id)
+    return report
+
+
+def print_report(reports):
+    print(f"\n{'game':<28} {'ev/s':>7} {'lat p50':>8} {'lat p95':>8}  crashes")
+    for r in sorted(reports, key=lambda r: (-len(r.get("crashes", {})), r["game"])):
+        if "error" in r:
+            print(f"{r['game']:<28} ERROR {r['error']}")
+            continue
+        p50, p95 = r["latency_p50_ms"] or 0, r["latency_p95_ms"] or 0
+        print(f"{r['game']:<28} {r['events_per_s']:7d} {p50:8.1f} {p95:8.1f}  {len(r['crashes']) or '-'}")
+        for sig, c in r["crashes"].items():
+            print(f"    x{c['count']:<4} {sig}  (first after event #{c['first_event']})")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fuzz every game with seeded random input.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--seed", type=int, default=1)
+    parser.add_argument("--rate", type=int, default=2000, help="events per second")
+    parser.add_argument("--seconds", type=float, default=5.0, help="fuzzing time per game")
+    parser.add_argument("--probe", type=float, default=100, help="ms between latency probes")
+    parser.add_argument("--allow-escape", action="store_true", help="include Escape in the key pool")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+    keys = KEYS + (["Escape"] if args.allow_escape else [])
+
+    reports = []
+    with hub_page(init_scripts=[FUZZ_INIT_JS], has_touch=True) as page:
+        for game_id in game_ids(page, args.games, include_system=False):
+            try:
+                reports.append(fuzz_game(page, game_id, args.seed, args.rate, args.seconds, args.probe, keys))
+            except Exception as e:
+                reports.append({"game": game_id, "error": str(e)})
+                try:
+                    page.evaluate("window.miniGameHub.transitionToState('MENU')")
+                except Exception:
+                    pass
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"seed": args.seed, "rate": args.rate, "seconds": args.seconds, "games": reports}, f, indent=1)
+    print_report(reports)
+    crashed = [r for r in reports if r.get("crashes") or "error" in r]
+    print(f"\n{len(crashed)}/{len(reports)} games crashed under fuzzing (seed {args.seed}). Report: {args.out}")
+    return 1 if crashed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
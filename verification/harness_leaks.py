@@ -0,0 +1,129 @@
+"""JS heap / DOM / listener leak hunter.
+
+For every registry entry: run a warm-up cycle, then N `MENU -> IN_GAME -> MENU`
+cycles. After each cycle force GC over CDP and sample `Performance.getMetrics`.
+A least-squares line through the samples gives per-cycle growth, and a game is
+flagged when growth passes the threshold with a good fit (steady growth,
+not a one-off cache fill).
+
+    python verification/harness_leaks.py [-n 6] [--dwell 0.5] [game-glob ...]
+
+Results go to verification/.harness/leaks.json and are emitted as
+`leak.*_per_cycle` harness metrics.
+"""
+import argparse
+import json
+import os
+import sys
+
+import harness_metrics
+from harness_ready import enter_game, exit_game
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, collect_garbage, game_ids, hub_page, performance_metrics
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "leaks.json")
+
+# metric -> (short name, per-cycle growth that counts as a leak)
+TRACKED = {
+    "JSHeapUsedSize": ("heap_bytes", 256 * 1024),
+    "Nodes": ("dom_nodes", 20),
+    "JSEventListeners": ("listeners", 2),
+}
+MIN_R2 = 0.8
+
+
+def linear_fit(xs, ys):
+    """Least-squares (slope, intercept, r2)."""
+    n = len(xs)
+    if n < 2:
+        return 0.0, (ys[0] if ys else 0.0), 0.0
+    mx, my = sum(xs) / n, sum(ys) / n
+    sxx = sum((x - mx) ** 2 for x in xs)
+    sxy = sum((x - mx) * (y - my) for x, y in zip(xs, ys))
+    syy = sum((y - my) ** 2 for y in ys)
+    slope = sxy / sxx if sxx else 0.0
+    intercept = my - slope * mx
+    r2 = (sxy * sxy) / (sxx * syy) if sxx and syy else 0.0
+    return slope, intercept, r2
+
+
+def sample(cdp):
+    collect_garbage(cdp)
+    metrics = performance_metrics(cdp)
+    return {name: metrics.get(name, 0) for name in TRACKED}
+
+
+def hunt(page, cdp, game_id, cycles, dwell_ms):
+    # The first visit pays for module evaluation and one-time caches.
+    enter_game(page, game_id)
+    exit_game(page)
+    samples = [sample(cdp)]
+    for _ in range(cycles):
+        enter_game(page, game_id)
+        if dwell_ms:
+            page.wait_for_timeout(dwell_ms)
+        exit_game(page)
+        samples.append(sample(cdp))
+
+    report = {"game": game_id, "leaks": []}
+    xs = list(range(len(samples)))
+    for metric, (short, threshold) in TRACKED.items():
+        ys = [s[metric] for s in samples]
+        slope, _, r2 = linear_fit(xs, ys)
+        report[short] = {"per_cycle": round(slope, 2), "r2": round(r2, 3), "samples": ys}
+        harness_metrics.record(f"leak.{short}_per_cycle", round(slope, 2), game=game_id)
+        if slope > threshold and r2 >= MIN_R2:
+            report["leaks"].append(short)
+    return report
+
+
+def print_report(reports):
+    print(f"\n{'game':<28} {'heap KB/cyc':>12} {'nodes/cyc':>10} {'listeners/cyc':>14}  leaks")
+    ranked = sorted(reports, key=lambda r: -r.get("heap_bytes", {}).get("per_cycle", 0))
+    for r in ranked:
+        if "error" in r:
+            print(f"{r['game']:<28} ERROR {r['error']}")
+            continue
+        print(f"{r['game']:<28} {r['heap_bytes']['per_cycle'] / 1024:12.1f} "
+              f"{r['dom_nodes']['per_cycle']:10.1f} {r['listeners']['per_cycle']:14.2f}  "
+              f"{', '.join(r['leaks']) or '-'}")
+    leaking = [r for r in reports if r.get("leaks")]
+    print(f"\n{len(leaking)}/{len(reports)} games leak after shutdown().")
+    return leaking
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Detect per-cycle heap, DOM and listener growth per game.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("-n", "--cycles", type=int, default=6)
+    parser.add_argument("--dwell", type=float, default=0.5, help="seconds spent in game per cycle")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    reports = []
+    with hub_page() as page:
+        cdp = cdp_session(page)
+        cdp.send("Performance.enable")
+        for game_id in game_ids(page, args.games):
+            print(f"Cycling {game_id}...")
+            try:
+                reports.append(hunt(page, cdp, game_id, args.cycles, args.dwell * 1000))
+            except Exception as e:
+                print(f"  {game_id} failed: {e}")
+                reports.append({"game": game_id, "error": str(e), "leaks": []})
+                try:
+                    exit_game(page)
+                except Exception:
+                    pass
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"cycles": args.cycles, "thresholds": {v[0]: v[1] for v in TRACKED.values()},
+                   "games": reports}, f, indent=2)
+    leaking = print_report(reports)
+    print(f"Report written to {args.out}")
+    return 1 if leaking else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
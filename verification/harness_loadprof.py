@@ -0,0 +1,155 @@
+"""Load-time profiler for the lazily imported gameRegistry modules.
+
+`transitionToState` in js/main.js brackets each game start with User Timing
+marks: `game:<id>:import-start`, `import-end`, `init-end` and `first-frame`.
+For every registry entry this tool:
+
+* reloads the hub with the HTTP cache disabled and service workers blocked,
+  so the module map is cold and sw.js cannot serve modules from Cache
+  Storage (`--warm` keeps the page and the worker and measures repeat
+  visits instead);
+* records the requests made between the transition and the first frame over
+  CDP Network, with transfer size from `loadingFinished`;
+* diffs CDP `Performance.getMetrics` for V8 compile and script time;
+* adds the module's static closure from harness_deps as a cross-check.
+
+    python verification/harness_loadprof.py [--warm] [--top 20] [game-glob ...]
+
+Results go to verification/.harness/loadprof.json and are emitted as
+`load.*` harness metrics.
+"""
+import argparse
+import json
+import os
+import sys
+
+import harness_metrics
+from harness_deps import EXTERNAL, graph
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page, performance_metrics
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "loadprof.json")
+
+_MARKS_JS = """gameId => {
+    const prefix = `game:${gameId}:`;
+    const marks = Object.fromEntries(performance.getEntriesByType('mark')
+        .filter(m => m.name.startsWith(prefix))
+        .map(m => [m.name.slice(prefix.length), m.startTime]));
+    performance.clearMarks();
+    return marks;
+}"""
+
+
+class NetworkLog:
+    """Requests seen over CDP since the last `reset()`."""
+
+    def __init__(self, cdp):
+        self.requests = {}
+        cdp.on("Network.requestWillBeSent", self._sent)
+        cdp.on("Network.loadingFinished", self._finished)
+
+    def reset(self):
+        self.requests = {}
+
+    def _sent(self, event):
+        self.requests[event["requestId"]] = {"url": event["request"]["url"], "type": event.get("type"), "bytes": 0}
+
+    def _finished(self, event):
+        request = self.requests.get(event["requestId"])
+        if request:
+            request["bytes"] = event.get("encodedDataLength", 0)
+
+
+def static_closure(game_id):
+    """(local module count, bytes on disk, external URLs) reachable from the game module."""
+    nodes = graph().game_closure([game_id])
+    local = [n for n in nodes if not n.startswith(EXTERNAL)]
+    size = sum(os.path.getsize(os.path.join(REPO_ROOT, n)) for n in local if os.path.exists(os.path.join(REPO_ROOT, n)))
+    return len(local), size, len(nodes) - len(local)
+
+
+def _span(marks, start, end):
+    if start in marks and end in marks:
+        return round(marks[end] - marks[start], 2)
+    return None
+
+
+def profile_game(page, cdp, network, game_id, cold):
+    if cold:
+        page.reload()
+        wait_hub_ready(page)
+        page.evaluate("performance.clearMarks()")
+    network.reset()
+    before = performance_metrics(cdp)
+    enter_game(page, game_id)
+    after = performance_metrics(cdp)
+    marks = page.evaluate(_MARKS_JS, game_id)
+    requests = list(network.requests.values())
+    exit_game(page)
+
+    modules, static_bytes, externals = static_closure(game_id)
+    report = {
+        "game": game_id,
+        "import_ms": _span(marks, "import-start", "import-end"),
+        "init_ms": _span(marks, "import-end", "init-end"),
+        "ttff_ms": _span(marks, "import-start", "first-frame"),
+        "compile_ms": round((after.get("V8CompileDuration", 0) - before.get("V8CompileDuration", 0)) * 1000, 2),
+        "script_ms": round((after.get("ScriptDuration", 0) - before.get("ScriptDuration", 0)) * 1000, 2),
+        "requests": len(requests),
+        "script_requests": sum(1 for r in requests if r["type"] == "Script"),
+        "bytes": sum(r["bytes"] for r in requests),
+        "static_modules": modules,
+        "static_bytes": static_bytes,
+        "static_externals": externals,
+    }
+    for field in ("import_ms", "ttff_ms", "compile_ms", "bytes", "requests"):
+        if report[field] is not None:
+            harness_metrics.record(f"load.{field}", report[field], game=game_id, cold=cold)
+    return report
+
+
+def print_table(reports, top):
+    ranked = sorted((r for r in reports if "error" not in r), key=lambda r: -(r["import_ms"] or 0))
+    print(f"\n{'game':<28} {'import':>8} {'init':>8} {'ttff':>8} {'compile':>8} {'reqs':>5} {'KB':>8} {'mods':>5}")
+    for r in ranked[:top] if top else ranked:
+        print(f"{r['game']:<28} {r['import_ms'] or 0:8.1f} {r['init_ms'] or 0:8.1f} {r['ttff_ms'] or 0:8.1f} "
+              f"{r['compile_ms']:8.1f} {r['requests']:5d} {r['bytes'] / 1024:8.1f} {r['static_modules']:5d}")
+    for r in reports:
+        if "error" in r:
+            print(f"{r['game']:<28} ERROR {r['error']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile fetch, compile and first-frame time of every game module.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--warm", action="store_true", help="do not reload between games")
+    parser.add_argument("--top", type=int, default=0, help="only print the N slowest imports")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    reports = []
+    # sw.js would answer every module fetched once from Cache Storage (with V8's
+    # code cache), so cold runs keep the worker out of the page.
+    with hub_page(service_workers="allow" if args.warm else "block") as page:
+        cdp = cdp_session(page)
+        cdp.send("Performance.enable")
+        cdp.send("Network.enable")
+        cdp.send("Network.setCacheDisabled", {"cacheDisabled": not args.warm})
+        network = NetworkLog(cdp)
+        for game_id in game_ids(page, args.games):
+            try:
+                reports.append(profile_game(page, cdp, network, game_id, cold=not args.warm))
+            except Exception as e:
+                reports.append({"game": game_id, "error": str(e)})
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"cold": not args.warm, "games": reports}, f, indent=2)
+    print_table(reports, args.top)
+    print(f"\nTimes in ms (import = fetch + evaluate of the module graph). Report: {args.out}")
+    return 1 if any("error" in r for r in reports) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,52 @@
+"""Metric channel between verification scripts and the runner.
+
+The runner points HARNESS_METRICS_PATH at a scratch file for each script.
+Scripts (or the harness helpers they import) call `record()` and the runner
+attaches the collected rows to that script's result. Outside the runner the
+variable is unset and `record()` is a no-op.
+"""
+import json
+import os
+import sys
+import time
+
+METRICS_ENV = "HARNESS_METRICS_PATH"
+
+
+def script_name():
+    return os.path.basename(sys.argv[0]) if sys.argv and sys.argv[0] else ""
+
+
+def record(name, value, **tags):
+    """Append one metric row; returns the row so callers can print it."""
+    row = {"name": name, "value": value, "tags": tags, "script": script_name(), "ts": time.time()}
+    path = os.environ.get(METRICS_ENV)
+    if path:
+        # One short append per row keeps concurrent writers from interleaving.
+        with open(path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(row, default=str) + "\n")
+    return row
+
+
+def read(path):
+    rows = []
+    try:
+        with open(path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if line:
+                    try:
+                        rows.append(json.loads(line))
+                    except ValueError:
+                        pass
+    except OSError:
+        pass
+    return rows
+
+
+def values(rows, name, **tags):
+    """Values of rows named `name` whose tags include all of `tags`."""
+    return [
+        r["value"] for r in rows
+        if r.get("name") == name and all(r.get("tags", {}).get(k) == v for k, v in tags.items())
+    ]
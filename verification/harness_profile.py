@@ -0,0 +1,247 @@
+"""CPU profiles per game, hot-function aggregation and SVG flame graphs.
+
+Each game session is wrapped in CDP `Profiler.start` / `Profiler.stop` after
+a warm-up, and the raw profile is saved as
+verification/.harness/profiles/<game>.cpuprofile (loadable in DevTools).
+Self time is then aggregated by function and by source file across every
+game, so the hottest code is named project-wide rather than guessed:
+
+    python verification/harness_profile.py [--dwell 3] [--top 25] [game-glob ...]
+    python verification/harness_profile.py --from-dir verification/.harness/profiles   # re-aggregate
+
+Alongside the profiles go <game>.svg flame graphs and all.svg, which
+merges every game's call tree. Each frame shows its self and total
+milliseconds on hover.
+"""
+import argparse
+import glob
+import html
+import json
+import os
+import sys
+from urllib.parse import urlsplit
+
+import harness_metrics
+from harness_ready import enter_game, exit_game
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page
+
+OUT_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "profiles")
+SAMPLING_INTERVAL_US = 200
+# V8 bookkeeping nodes; reported on their own, never as "hot functions".
+META_FRAMES = {"(root)", "(program)", "(idle)", "(garbage collector)"}
+
+
+def capture(page, cdp, game_id, dwell_ms, warmup_ms):
+    enter_game(page, game_id)
+    page.wait_for_timeout(warmup_ms)
+    cdp.send("Profiler.start")
+    page.wait_for_timeout(dwell_ms)
+    profile = cdp.send("Profiler.stop")["profile"]
+    exit_game(page)
+    return profile
+
+
+def source_path(url):
+    """Repo-relative path for local scripts, host + path for CDN ones."""
+    if not url:
+        return ""
+    parts = urlsplit(url)
+    if parts.hostname in ("localhost", "127.0.0.1"):
+        return parts.path.lstrip("/")
+    return f"{parts.hostname}{parts.path}"
+
+
+def frame_label(call_frame):
+    name = call_frame["functionName"] or "(anonymous)"
+    path = source_path(call_frame.get("url"))
+    return f"{name} {path}:{call_frame.get('lineNumber', 0) + 1}" if path else name
+
+
+def self_times(profile):
+    """{node id: self ms}, from sample -> time delta pairs."""
+    times = {}
+    samples, deltas = profile.get("samples", []), profile.get("timeDeltas", [])
+    # timeDeltas[i + 1] is how long samples[i] was on the stack.
+    for i, node_id in enumerate(samples):
+        delta = deltas[i + 1] if i + 1 < len(deltas) else 0
+        times[node_id] = times.get(node_id, 0.0) + max(delta, 0) / 1000
+    return times
+
+
+def call_tree(profile):
+    """Nested {"name", "self", "total", "children": {name: node}} tree of the profile."""
+    nodes = {n["id"]: n for n in profile["nodes"]}
+    selfs = self_times(profile)
+    has_parent = {c for n in profile["nodes"] for c in n.get("children", ())}
+    roots = [n for n in profile["nodes"] if n["id"] not in has_parent]
+
+    def build(node):
+        out = {"name": frame_label(node["callFrame"]), "self": selfs.get(node["id"], 0.0), "children": {}}
+        for child_id in node.get("children", ()):
+            merge_into(out["children"], build(nodes[child_id]))
+        out["total"] = out["self"] + sum(c["total"] for c in out["children"].values())
+        return out
+
+    tree = {"name": "all", "self": 0.0, "children": {}}
+    for root in roots:
+        built = build(root)
+        for child in built["children"].values():
+            merge_into(tree["children"], child)
+    tree["total"] = sum(c["total"] for c in tree["children"].values())
+    return tree
+
+
+def merge_into(children, node):
+    """Merge `node` into the {name: node} dict `children`, summing times."""
+    existing = children.get(node["name"])
+    if existing is None:
+        children[node["name"]] = node
+        return
+    existing["self"] += node["self"]
+    existing["total"] += node["total"]
+    for child in node["children"].values():
+        merge_into(existing["children"], child)
+
+
+def aggregate(profiles):
+    """Self ms by function label and by source file, summed over {game: profile}."""
+    by_function, by_file, meta = {}, {}, {}
+    for game_id, profile in profiles.items():
+        nodes = {n["id"]: n for n in profile["nodes"]}
+        for node_id, ms in self_times(profile).items():
+            frame = nodes[node_id]["callFrame"]
+            if frame["functionName"] in META_FRAMES:
+                meta[frame["functionName"]] = meta.get(frame["functionName"], 0.0) + ms
+                continue
+            label = frame_label(frame)
+            entry = by_function.setdefault(label, {"self_ms": 0.0, "games": {}})
+            entry["self_ms"] += ms
+            entry["games"][game_id] = entry["games"].get(game_id, 0.0) + ms
+            path = source_path(frame.get("url")) or "(native)"
+            by_file[path] = by_file.get(path, 0.0) + ms
+    return by_function, by_file, meta
+
+
+# --- Flame graphs ---
+
+ROW_HEIGHT = 16
+WIDTH = 1200
+
+
+def _color(name):
+    # Warm palette keyed on the name, so one function keeps its colour across graphs.
+    h = sum(map(ord, name)) % 60
+    return f"hsl({h}, 80%, {55 + h % 15}%)"
+
+
+def flame_svg(tree, title):
+    rows = []
+
+    def walk(node, x, depth, scale):
+        width = node["total"] * scale
+        if width < 0.5:
+            return
+        rows.append((x, depth, width, node))
+        child_x = x
+        for child in sorted(node["children"].values(), key=lambda c: c["name"]):
+            walk(child, child_x, depth + 1, scale)
+            child_x += child["total"] * scale
+
+    scale = WIDTH / tree["total"] if tree["total"] else 0
+    walk(tree, 0, 0, scale)
+    depth = max((d for _, d, _, _ in rows), default=0) + 1
+    height = depth * ROW_HEIGHT + 30
+    out = [f'<svg xmlns="http://www.w3.org/2000/svg" width="{WIDTH}" height="{height}" '
+           f'font-family="monospace" font-size="11">',
+           f'<text x="4" y="14">{html.escape(title)} ({tree["total"]:.0f} ms sampled)</text>']
+    for x, d, w, node in rows:
+        y = height - (d + 1) * ROW_HEIGHT
+        label = html.escape(node["name"])
+        out.append(f'<g><title>{label}\nself {node["self"]:.1f} ms, total {node["total"]:.1f} ms</title>'
+                   f'<rect x="{x:.1f}" y="{y}" width="{w:.1f}" height="{ROW_HEIGHT - 1}" fill="{_color(node["name"])}"/>')
+        if w > 40:
+            chars = int(w / 7)
+            text = label if len(node["name"]) <= chars else html.escape(node["name"][:max(chars - 2, 1)]) + ".."
+            out.append(f'<text x="{x + 3:.1f}" y="{y + ROW_HEIGHT - 4}">{text}</text>')
+        out.append("</g>")
+    out.append("</svg>")
+    return "\n".join(out)
+
+
+def write_flame_graphs(profiles, out_dir):
+    merged = {"name": "all", "self": 0.0, "total": 0.0, "children": {}}
+    for game_id, profile in profiles.items():
+        tree = call_tree(profile)
+        with open(os.path.join(out_dir, f"{game_id}.svg"), "w") as f:
+            f.write(flame_svg(tree, game_id))
+        tree["name"] = game_id
+        merge_into(merged["children"], tree)
+        merged["total"] += tree["total"]
+    with open(os.path.join(out_dir, "all.svg"), "w") as f:
+        f.write(flame_svg(merged, "all games"))
+
+
+def print_report(by_function, by_file, meta, top):
+    total = sum(e["self_ms"] for e in by_function.values()) + sum(meta.values())
+    print(f"\n--- Hottest functions (self time, all games, {total:.0f} ms sampled) ---")
+    print(f"{'self ms':>9} {'share':>6}  {'function':<60} top games")
+    ranked = sorted(by_function.items(), key=lambda kv: -kv[1]["self_ms"])
+    for label, entry in ranked[:top]:
+        games = sorted(entry["games"].items(), key=lambda kv: -kv[1])[:3]
+        print(f"{entry['self_ms']:9.1f} {entry['self_ms'] / total:6.1%}  {label:<60} "
+              f"{', '.join(g for g, _ in games)}")
+    print("\n--- By source file ---")
+    for path, ms in sorted(by_file.items(), key=lambda kv: -kv[1])[:top]:
+        print(f"{ms:9.1f} {ms / total:6.1%}  {path}")
+    print("\n" + "  ".join(f"{name} {ms:.0f} ms" for name, ms in sorted(meta.items())))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Profile games over CDP and aggregate hot functions.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--dwell", type=float, default=3.0, help="seconds profiled per game")
+    parser.add_argument("--warmup", type=float, default=1.0, help="seconds before profiling starts")
+    parser.add_argument("--top", type=int, default=25)
+    parser.add_argument("--out", default=OUT_DIR)
+    parser.add_argument("--from-dir", help="aggregate existing .cpuprofile files instead of capturing")
+    args = parser.parse_args(argv)
+    os.makedirs(args.out, exist_ok=True)
+
+    profiles = {}
+    if args.from_dir:
+        for path in sorted(glob.glob(os.path.join(args.from_dir, "*.cpuprofile"))):
+            with open(path) as f:
+                profiles[os.path.basename(path)[:-len(".cpuprofile")]] = json.load(f)
+    else:
+        with hub_page() as page:
+            cdp = cdp_session(page)
+            cdp.send("Profiler.enable")
+            cdp.send("Profiler.setSamplingInterval", {"interval": SAMPLING_INTERVAL_US})
+            for game_id in game_ids(page, args.games, include_system=False):
+                print(f"Profiling {game_id}...")
+                try:
+                    profiles[game_id] = capture(page, cdp, game_id, args.dwell * 1000, args.warmup * 1000)
+                except Exception as e:
+                    print(f"  {game_id} failed: {e}")
+                    try:
+                        exit_game(page)
+                    except Exception:
+                        pass
+                    continue
+                with open(os.path.join(args.out, f"{game_id}.cpuprofile"), "w") as f:
+                    json.dump(profiles[game_id], f)
+
+    by_function, by_file, meta = aggregate(profiles)
+    for label, entry in sorted(by_function.items(), key=lambda kv: -kv[1]["self_ms"])[:args.top]:
+        harness_metrics.record("profile.self_ms", round(entry["self_ms"], 2), function=label)
+    write_flame_graphs(profiles, args.out)
+    with open(os.path.join(args.out, "hot_functions.json"), "w") as f:
+        json.dump({"functions": by_function, "files": by_file, "meta": meta}, f, indent=1)
+    print_report(by_function, by_file, meta, args.top)
+    print(f"\nProfiles and flame graphs in {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
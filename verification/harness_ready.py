@@ -0,0 +1,160 @@
+"""Event-driven readiness helpers built on `window.miniGameHub.lifecycle`.
+
+js/main.js emits hub-ready, game-initialized, first-frame-drawn,
+shutdown-complete and menu-ready. Each signal keeps a counter, so the helpers
+snapshot it, act, and wait for it to move past the snapshot. That replaces
+
+    page.evaluate("window.miniGameHub.transitionToState('IN_GAME', { gameId: 'snake-game' })")
+    time.sleep(2)
+
+with
+
+    enter_game(page, "snake-game")
+
+which returns as soon as the game has drawn its first frame. Every wait is
+recorded as `ready.wait_ms`. `ready.replaced_ms` is the nominal length of the
+fixed sleep the call site used to have; callers pass it as a constant, so it
+is not a measurement and the runner reports it only as such.
+
+hub-ready fires once the hub's DOMContentLoaded setup has finished. The
+#app-loader overlay waits for a click and is still covering the page at that
+point (`hub:loader-hidden` marks its dismissal). Scripts that click hub UI
+right after wait_hub_ready must click #app-loader first.
+
+Run directly to audit the fixed sleeps still left in the suite:
+
+    python verification/harness_ready.py
+"""
+import os
+import re
+import time
+
+import harness_metrics
+
+DEFAULT_TIMEOUT_MS = 15000
+
+# Nominal sleeps these helpers typically stand in for, in ms (not measured).
+HUB_SLEEP_MS = 2000
+ENTER_SLEEP_MS = 2000
+EXIT_SLEEP_MS = 1000
+
+_COUNT_JS = "name => (window.miniGameHub && window.miniGameHub.lifecycle) ? window.miniGameHub.lifecycle.count(name) : 0"
+_WAIT_JS = """([name, after]) => !!(window.miniGameHub && window.miniGameHub.lifecycle)
+    && window.miniGameHub.lifecycle.count(name) > after"""
+_LAST_JS = "name => window.miniGameHub.lifecycle.last[name] || null"
+_ENTER_JS = "gameId => window.miniGameHub.transitionToState('IN_GAME', { gameId })"
+_EXIT_JS = "() => window.miniGameHub.transitionToState('MENU')"
+
+
+def _record(signal, start, replaced_ms):
+    wait_ms = round((time.perf_counter() - start) * 1000, 2)
+    harness_metrics.record("ready.wait_ms", wait_ms, signal=signal)
+    if replaced_ms:
+        harness_metrics.record("ready.replaced_ms", replaced_ms, signal=signal)
+    return wait_ms
+
+
+# --- Sync API ---
+
+def signal_count(page, name):
+    return page.evaluate(_COUNT_JS, name)
+
+
+def wait_for_signal(page, name, after=0, timeout=DEFAULT_TIMEOUT_MS, replaced_ms=0):
+    """Block until `name` has fired more than `after` times; returns its detail."""
+    start = time.perf_counter()
+    page.wait_for_function(_WAIT_JS, arg=[name, after], timeout=timeout)
+    _record(name, start, replaced_ms)
+    return page.evaluate(_LAST_JS, name)
+
+
+def wait_hub_ready(page, timeout=DEFAULT_TIMEOUT_MS):
+    return wait_for_signal(page, "hub-ready", 0, timeout, HUB_SLEEP_MS)
+
+
+def enter_game(page, game_id, timeout=DEFAULT_TIMEOUT_MS, until="first-frame-drawn"):
+    """Start `game_id` and wait for `until` (or 'game-initialized')."""
+    after = signal_count(page, until)
+    page.evaluate(_ENTER_JS, game_id)
+    return wait_for_signal(page, until, after, timeout, ENTER_SLEEP_MS)
+
+
+def exit_game(page, timeout=DEFAULT_TIMEOUT_MS):
+    """Return to the menu and wait until it is rebuilt."""
+    after = signal_count(page, "menu-ready")
+    page.evaluate(_EXIT_JS)
+    return wait_for_signal(page, "menu-ready", after, timeout, EXIT_SLEEP_MS)
+
+
+# --- Async API ---
+
+async def async_signal_count(page, name):
+    return await page.evaluate(_COUNT_JS, name)
+
+
+async def async_wait_for_signal(page, name, after=0, timeout=DEFAULT_TIMEOUT_MS, replaced_ms=0):
+    start = time.perf_counter()
+    await page.wait_for_function(_WAIT_JS, arg=[name, after], timeout=timeout)
+    _record(name, start, replaced_ms)
+    return await page.evaluate(_LAST_JS, name)
+
+
+async def async_wait_hub_ready(page, timeout=DEFAULT_TIMEOUT_MS):
+    return await async_wait_for_signal(page, "hub-ready", 0, timeout, HUB_SLEEP_MS)
+
+
+async def async_enter_game(page, game_id, timeout=DEFAULT_TIMEOUT_MS, until="first-frame-drawn"):
+    after = await async_signal_count(page, until)
+    await page.evaluate(_ENTER_JS, game_id)
+    return await async_wait_for_signal(page, until, after, timeout, ENTER_SLEEP_MS)
+
+
+async def async_exit_game(page, timeout=DEFAULT_TIMEOUT_MS):
+    after = await async_signal_count(page, "menu-ready")
+    await page.evaluate(_EXIT_JS)
+    return await async_wait_for_signal(page, "menu-ready", after, timeout, EXIT_SLEEP_MS)
+
+
+# --- Sleep audit ---
+
+_SLEEP_PATTERNS = (
+    (re.compile(r"\btime\.sleep\(\s*([\d.]+)\s*\)"), 1000),
+    (re.compile(r"\basyncio\.sleep\(\s*([\d.]+)\s*\)"), 1000),
+    (re.compile(r"\bwait_for_timeout\(\s*([\d.]+)\s*\)"), 1),
+)
+
+
+def audit_sleeps(directory=None):
+    """Map script name -> list of fixed sleep durations (ms) found in its source."""
+    directory = directory or os.path.dirname(os.path.abspath(__file__))
+    found = {}
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".py") or name.startswith("harness_"):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8", errors="replace") as f:
+            source = f.read()
+        sleeps = [float(m.group(1)) * scale for pattern, scale in _SLEEP_PATTERNS for m in pattern.finditer(source)]
+        if sleeps:
+            found[name] = sleeps
+    return found
+
+
+def summarize_waits(rows):
+    """(waits, waited_ms, replaced_ms) from collected harness metrics; replaced_ms
+    is the sum of the nominal sleeps callers declared."""
+    waited = harness_metrics.values(rows, "ready.wait_ms")
+    replaced = harness_metrics.values(rows, "ready.replaced_ms")
+    return len(waited), sum(waited), sum(replaced)
+
+
+def main():
+    found = audit_sleeps()
+    total = sum(len(v) for v in found.values())
+    total_ms = sum(sum(v) for v in found.values())
+    for name, sleeps in sorted(found.items(), key=lambda kv: -sum(kv[1])):
+        print(f"{sum(sleeps) / 1000:8.1f}s  {len(sleeps):3d} sleeps  {name}")
+    print(f"\n{total} fixed sleeps in {len(found)} scripts, {total_ms / 1000:.1f}s of static waiting per full pass.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,266 @@
+"""Deterministic replay: seeded RNG, virtual frame clock and recorded input.
+
+`install(context)` adds an init script that, before any game code runs:
+
+* replaces `Math.random` with a seeded mulberry32 generator;
+* routes `requestAnimationFrame` through one shared tick per real frame that
+  advances a virtual clock by exactly `frame_ms`; rAF timestamps,
+  `performance.now()`, `Date.now()` and argument-less `new Date()` all read
+  that clock, so every frame sees the same delta no matter how slow the
+  machine was. Wall-clock time starts at a fixed epoch derived from the
+  install seed, so date-dependent code (daily seeds, clocks) replays too;
+* records trusted keyboard, pointer, mouse and wheel events against the
+  virtual frame they arrived on, and re-dispatches them on the same frame
+  during replay.
+
+Call `arm(page, seed)` just before entering a game. It reseeds the RNG now and
+restarts the frame counter at the game's `first-frame-drawn` signal, so
+variable module load time cannot shift inputs by a frame. The real clock is
+still exposed as `__harnessReplay.realNow()`, which the frame recorder in
+harness_frames.py uses.
+
+    python verification/harness_replay.py record neon-swarm --seconds 10 --headed -o swarm.json
+    python verification/harness_replay.py replay swarm.json --repeat 3
+
+`replay` runs the session repeatedly and checks that every run ends on the
+same canvas pixels, then prints frame-time spread across runs.
+"""
+import argparse
+import hashlib
+import json
+import statistics
+import sys
+
+import harness_frames
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_session import hub_page
+
+DEFAULT_SEED = 1
+FRAME_MS = 1000 / 60
+EPOCH_MS = 1704067200000  # 2024-01-01T00:00:00Z
+
+REPLAY_JS = """(() => {
+    if (window.__harnessReplay) return;
+    const FRAME_MS = %(frame_ms)s;
+    const realNow = performance.now.bind(performance);
+    const RealDate = Date;
+    const realRAF = window.requestAnimationFrame.bind(window);
+    const epoch = %(epoch)d;
+
+    let seed = %(seed)d >>> 0;
+    Math.random = () => {
+        seed = (seed + 0x6D2B79F5) >>> 0;
+        let t = seed;
+        t = Math.imul(t ^ (t >>> 15), t | 1);
+        t ^= t + Math.imul(t ^ (t >>> 7), t | 61);
+        return ((t ^ (t >>> 14)) >>> 0) / 4294967296;
+    };
+
+    const state = {
+        now: 0, frame: 0, origin: 0, armed: false,
+        recording: false, events: [], replay: null, replayIndex: 0,
+    };
+    performance.now = () => state.now;
+    const dateNow = () => Math.floor(epoch + state.now);
+    function ReplayDate(...args) {
+        if (!new.target) return new RealDate(dateNow()).toString();
+        return Reflect.construct(RealDate, args.length ? args : [dateNow()], new.target);
+    }
+    ReplayDate.prototype = RealDate.prototype;
+    ReplayDate.UTC = RealDate.UTC;
+    ReplayDate.parse = RealDate.parse;
+    ReplayDate.now = dateNow;
+    window.Date = ReplayDate;
+
+    let queue = new Map(), nextId = 1, scheduled = false;
+    const tick = () => {
+        scheduled = false;
+        state.now += FRAME_MS;
+        state.frame++;
+        dispatchReplay();
+        const callbacks = queue;
+        queue = new Map();
+        for (const cb of callbacks.values()) {
+            try { cb(state.now); } catch (e) { setTimeout(() => { throw e; }); }
+        }
+    };
+    window.requestAnimationFrame = (cb) => {
+        const id = nextId++;
+        queue.set(id, cb);
+        if (!scheduled) { scheduled = true; realRAF(tick); }
+        return id;
+    };
+    window.cancelAnimationFrame = (id) => { queue.delete(id); };
+
+    // --- Input ---
+    const FIELDS = ['key', 'code', 'keyCode', 'repeat', 'shiftKey', 'ctrlKey', 'altKey', 'metaKey',
+        'clientX', 'clientY', 'button', 'buttons', 'pointerId', 'pointerType', 'isPrimary',
+        'deltaX', 'deltaY', 'deltaMode'];
+    const TYPES = {
+        keydown: KeyboardEvent, keyup: KeyboardEvent,
+        pointerdown: PointerEvent, pointermove: PointerEvent, pointerup: PointerEvent,
+        mousedown: MouseEvent, mousemove: MouseEvent, mouseup: MouseEvent, click: MouseEvent,
+        wheel: WheelEvent,
+    };
+    const relFrame = () => state.frame - state.origin;
+    for (const type of Object.keys(TYPES)) {
+        window.addEventListener(type, (e) => {
+            if (!state.recording || !e.isTrusted) return;
+            const rec = { frame: relFrame(), type };
+            for (const f of FIELDS) if (f in e) rec[f] = e[f];
+            state.events.push(rec);
+        }, true);
+    }
+    const targetFor = (rec) => {
+        if ('clientX' in rec && TYPES[rec.type] !== KeyboardEvent) {
+            return document.elementFromPoint(rec.clientX, rec.clientY) || document.body;
+        }
+        return document.activeElement || document.body;
+    };
+    const dispatchReplay = () => {
+        const events = state.replay;
+        if (!events) return;
+        const frame = relFrame();
+        while (state.replayIndex < events.length && events[state.replayIndex].frame <= frame) {
+            const rec = events[state.replayIndex++];
+            const { frame: _, type, ...init } = rec;
+            targetFor(rec).dispatchEvent(new TYPES[type](type, { ...init, bubbles: true, cancelable: true, composed: true }));
+        }
+    };
+
+    window.addEventListener('minigamehub:first-frame-drawn', () => {
+        if (!state.armed) return;
+        state.armed = false;
+        state.origin = state.frame;
+    });
+
+    window.__harnessReplay = {
+        realNow,
+        arm(newSeed) { seed = newSeed >>> 0; state.armed = true; },
+        record() { state.events = []; state.recording = true; },
+        stopRecording() { state.recording = false; return { frames: relFrame(), events: state.events }; },
+        replay(events) { state.replay = events; state.replayIndex = 0; },
+        replayDone() { return !state.replay || state.replayIndex >= state.replay.length; },
+        frame: relFrame,
+    };
+})();"""
+
+_FRAME_JS = "() => window.__harnessReplay.frame()"
+_CANVAS_DIGEST_JS = """gameId => {
+    const root = document.getElementById(gameId) || document.body;
+    return Array.from(root.querySelectorAll('canvas')).map(c => {
+        try { return c.toDataURL(); } catch (e) { return 'tainted'; }
+    });
+}"""
+
+
+def script(seed=DEFAULT_SEED, frame_ms=FRAME_MS):
+    epoch = EPOCH_MS + (seed % 365) * 86400000
+    return REPLAY_JS % {"seed": seed, "frame_ms": repr(frame_ms), "epoch": epoch}
+
+
+def install(target, seed=DEFAULT_SEED, frame_ms=FRAME_MS):
+    """Add the determinism layer to a BrowserContext or Page (before navigation)."""
+    target.add_init_script(script(seed, frame_ms))
+
+
+def arm(page, seed=DEFAULT_SEED):
+    page.evaluate("seed => window.__harnessReplay.arm(seed)", seed)
+
+
+def start_recording(page):
+    page.evaluate("window.__harnessReplay.record()")
+
+
+def stop_recording(page):
+    return page.evaluate("window.__harnessReplay.stopRecording()")
+
+
+def start_replay(page, events):
+    page.evaluate("events => window.__harnessReplay.replay(events)", events)
+
+
+def wait_frames(page, frames, timeout=120000):
+    """Block until the armed game has run `frames` virtual frames."""
+    page.wait_for_function(f"n => ({_FRAME_JS})() >= n", arg=frames, timeout=timeout)
+
+
+def canvas_digest(page, game_id):
+    h = hashlib.sha256()
+    for data in page.evaluate(_CANVAS_DIGEST_JS, game_id):
+        h.update(data.encode())
+    return h.hexdigest()[:16]
+
+
+def record_session(game_id, seconds, seed, headed):
+    launch = {"headless": not headed}
+    with hub_page(launch_kwargs=launch, init_scripts=[script(seed)]) as page:
+        arm(page, seed)
+        enter_game(page, game_id)
+        start_recording(page)
+        print(f"Recording {game_id} for {seconds:.0f}s - play now.")
+        page.wait_for_timeout(seconds * 1000)
+        recording = stop_recording(page)
+        exit_game(page)
+    return {"game": game_id, "seed": seed, "frame_ms": FRAME_MS, **recording}
+
+
+def replay_session(page, session, measure=True):
+    """Replay `session` once; returns (canvas digest, frame stats or None)."""
+    arm(page, session["seed"])
+    enter_game(page, session["game"])
+    start_replay(page, session["events"])
+    if measure:
+        harness_frames.start(page)
+    wait_frames(page, session["frames"])
+    stats = harness_frames.frame_stats(harness_frames.stop(page)) if measure else None
+    digest = canvas_digest(page, session["game"])
+    exit_game(page)
+    return digest, stats
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Record and deterministically replay game sessions.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    rec = sub.add_parser("record")
+    rec.add_argument("game")
+    rec.add_argument("--seconds", type=float, default=10)
+    rec.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    rec.add_argument("--headed", action="store_true", help="show the browser so a person can play")
+    rec.add_argument("-o", "--out", required=True)
+    rep = sub.add_parser("replay")
+    rep.add_argument("session")
+    rep.add_argument("--repeat", type=int, default=2)
+    args = parser.parse_args(argv)
+
+    if args.command == "record":
+        session = record_session(args.game, args.seconds, args.seed, args.headed)
+        with open(args.out, "w") as f:
+            json.dump(session, f, indent=1)
+        print(f"Recorded {len(session['events'])} events over {session['frames']} frames to {args.out}")
+        return 0
+
+    with open(args.session) as f:
+        session = json.load(f)
+    digests, p95s = [], []
+    with hub_page(init_scripts=[script(session["seed"], session["frame_ms"])]) as page:
+        harness_frames.install(page)
+        for i in range(args.repeat):
+            # Reload so module state from the previous run cannot leak in.
+            if i:
+                page.reload()
+                wait_hub_ready(page)
+                harness_frames.install(page)
+            digest, stats = replay_session(page, session)
+            digests.append(digest)
+            p95s.append(stats["p95"])
+            print(f"Run {i + 1}: final frame {digest}, p50 {stats['p50']:.2f} ms, p95 {stats['p95']:.2f} ms")
+    identical = len(set(digests)) == 1
+    spread = statistics.pstdev(p95s) if len(p95s) > 1 else 0.0
+    print(f"\n{'Deterministic' if identical else 'DIVERGED'}: {len(set(digests))} distinct end states; "
+          f"p95 spread {spread:.2f} ms over {len(p95s)} runs")
+    return 0 if identical else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,338 @@
+"""SQLite results database for harness runs and the verification log.
+
+Every runner pass is recorded in verification/.harness/results.db:
+
+    runs            one row per harness_runner invocation (commit, wall time)
+    script_results  outcome (pass/fail/timeout/cached), return code, duration
+    metrics         every harness metric, with its game tag split out
+    artifacts       screenshots each script stored in harness_artifacts
+    log_entries     the human-written VERIFICATION_LOG.md entries
+
+Trend reports run on indexed queries:
+
+    python verification/harness_results.py slowest [--runs 20]
+    python verification/harness_results.py flaky [--runs 20]
+    python verification/harness_results.py history frame.p95_ms --game neon-swarm
+
+VERIFICATION_LOG.md is rendered from `log_entries`. `import-log` adopts the
+rows already in the file once. `add` (or append_log.py) inserts an entry, and
+`render` appends only the entries not yet written; `render --full` rewrites the
+whole file.
+"""
+import argparse
+import datetime
+import json
+import os
+import re
+import sqlite3
+import subprocess
+import sys
+
+from harness_server import REPO_ROOT
+
+DB_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "results.db")
+LOG_PATH = os.path.join(REPO_ROOT, "VERIFICATION_LOG.md")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    id INTEGER PRIMARY KEY,
+    started TEXT NOT NULL,
+    git_commit TEXT,
+    wall_time REAL,
+    workers INTEGER,
+    passed INTEGER,
+    failed INTEGER
+);
+CREATE TABLE IF NOT EXISTS script_results (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    script TEXT NOT NULL,
+    lane TEXT,
+    outcome TEXT NOT NULL,
+    returncode INTEGER,
+    duration REAL
+);
+CREATE INDEX IF NOT EXISTS idx_script_results_script ON script_results(script, run_id);
+CREATE TABLE IF NOT EXISTS metrics (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    script TEXT,
+    name TEXT NOT NULL,
+    game TEXT,
+    tags TEXT,
+    value REAL
+);
+CREATE INDEX IF NOT EXISTS idx_metrics_name ON metrics(name, game, run_id);
+CREATE TABLE IF NOT EXISTS artifacts (
+    run_id INTEGER NOT NULL REFERENCES runs(id),
+    script TEXT NOT NULL,
+    step TEXT NOT NULL,
+    sha256 TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_artifacts_script ON artifacts(script, run_id);
+CREATE TABLE IF NOT EXISTS log_entries (
+    id INTEGER PRIMARY KEY,
+    date TEXT NOT NULL,
+    agent TEXT,
+    action TEXT,
+    artifacts TEXT,
+    outcome TEXT,
+    notes TEXT,
+    run_id INTEGER REFERENCES runs(id),
+    rendered INTEGER NOT NULL DEFAULT 0
+);
+"""
+
+
+def connect(path=DB_PATH):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    db = sqlite3.connect(path)
+    db.row_factory = sqlite3.Row
+    db.executescript(SCHEMA)
+    return db
+
+
+def head_commit():
+    try:
+        out = subprocess.run(["git", "rev-parse", "--short", "HEAD"], cwd=REPO_ROOT,
+                             capture_output=True, text=True, check=True)
+    except (OSError, subprocess.CalledProcessError):
+        return None
+    return out.stdout.strip() or None
+
+
+def outcome(result):
+    if result.get("cached"):
+        return "cached"
+    if result.get("timed_out"):
+        return "timeout"
+    return "pass" if result.get("passed") else "fail"
+
+
+def record_run(db, results, wall_time, workers, commit=None, started=None):
+    """Store one runner pass; `results` are ScriptResult dicts (asdict + passed)."""
+    from harness_artifacts import ArtifactStore
+
+    started = started or datetime.datetime.now().isoformat(timespec="seconds")
+    failed = sum(1 for r in results if not r["passed"])
+    with db:
+        run_id = db.execute(
+            "INSERT INTO runs (started, git_commit, wall_time, workers, passed, failed) VALUES (?, ?, ?, ?, ?, ?)",
+            (started, commit, wall_time, workers, len(results) - failed, failed),
+        ).lastrowid
+        db.executemany(
+            "INSERT INTO script_results VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, r["name"], r["lane"], outcome(r), r["returncode"], r["duration"]) for r in results],
+        )
+        db.executemany(
+            "INSERT INTO metrics VALUES (?, ?, ?, ?, ?, ?)",
+            [(run_id, r["name"], m["name"], (m.get("tags") or {}).get("game"),
+              json.dumps(m.get("tags") or {}, sort_keys=True), m["value"])
+             for r in results if not r.get("cached") for m in r.get("metrics", [])
+             if isinstance(m.get("value"), (int, float))],
+        )
+        store = ArtifactStore()
+        rows = []
+        for r in results:
+            script = os.path.splitext(r["name"])[0]
+            for step, entry in store.manifest(script).items():
+                if entry.get("captured", "") >= started:
+                    rows.append((run_id, script, step, entry["sha256"]))
+        db.executemany("INSERT INTO artifacts VALUES (?, ?, ?, ?)", rows)
+    return run_id
+
+
+def _recent_runs_clause(runs):
+    return "run_id IN (SELECT id FROM runs ORDER BY id DESC LIMIT ?)", (runs,)
+
+
+def slowest(db, runs=20, limit=20):
+    clause, args = _recent_runs_clause(runs)
+    return db.execute(
+        f"""SELECT script, COUNT(*) AS n, AVG(duration) AS mean, MAX(duration) AS worst
+            FROM script_results WHERE outcome != 'cached' AND {clause}
+            GROUP BY script ORDER BY mean DESC LIMIT ?""", (*args, limit)).fetchall()
+
+
+def flaky(db, runs=20, limit=20):
+    """Scripts whose outcome flipped between consecutive executed runs."""
+    clause, args = _recent_runs_clause(runs)
+    rows = db.execute(
+        f"""SELECT script, outcome FROM script_results
+            WHERE outcome IN ('pass', 'fail', 'timeout') AND {clause}
+            ORDER BY script, run_id""", args).fetchall()
+    history = {}
+    for row in rows:
+        history.setdefault(row["script"], []).append(row["outcome"] == "pass")
+    report = []
+    for script, outcomes in history.items():
+        flips = sum(1 for a, b in zip(outcomes, outcomes[1:]) if a != b)
+        if flips:
+            report.append({"script": script, "runs": len(outcomes), "flips": flips,
+                           "pass_rate": sum(outcomes) / len(outcomes)})
+    report.sort(key=lambda r: (-r["flips"] / max(1, r["runs"] - 1), r["script"]))
+    return report[:limit]
+
+
+def history(db, name, game=None, limit=50):
+    query = """SELECT runs.id AS run_id, runs.started, runs.git_commit, AVG(metrics.value) AS value, COUNT(*) AS n
+               FROM metrics JOIN runs ON runs.id = metrics.run_id
+               WHERE metrics.name = ? {game}
+               GROUP BY runs.id ORDER BY runs.id DESC LIMIT ?"""
+    if game:
+        return db.execute(query.format(game="AND metrics.game = ?"), (name, game, limit)).fetchall()
+    return db.execute(query.format(game=""), (name, limit)).fetchall()
+
+
+# --- Verification log ---
+
+_TABLE_ROW = re.compile(r"^\|\s*(\d{4}-\d{2}-\d{2})\s*\|(.*)\|\s*$")
+_SECTION = re.compile(r"^## (\d{4}-\d{2}-\d{2}) - (.+)$")
+_FIELD = re.compile(r"^[-*\s]*\*\*(\w+):\*\*\s*(.*)$")
+
+
+def parse_log(text):
+    """Entries from the table rows and `## date - title` sections of the log."""
+    entries, section = [], None
+    for line in text.splitlines():
+        row = _TABLE_ROW.match(line)
+        if row:
+            cells = [c.strip() for c in row.group(2).split("|")] + [""] * 5
+            entries.append({"date": row.group(1), "agent": cells[0], "action": cells[1],
+                            "artifacts": cells[2], "outcome": cells[3], "notes": cells[4]})
+            continue
+        heading = _SECTION.match(line.strip())
+        if heading:
+            section = {"date": heading.group(1), "agent": heading.group(2), "action": "",
+                       "artifacts": "", "outcome": "", "notes": ""}
+            entries.append(section)
+            continue
+        field = _FIELD.match(line.strip())
+        if section is not None and field:
+            key = field.group(1).lower()
+            if key == "agent":
+                # `## date - Title` + **Agent:** puts the title in the heading.
+                section["notes"], section["agent"] = section["agent"], field.group(2)
+            elif key in section:
+                section[key] = field.group(2)
+    return entries
+
+
+def add_entry(db, date, agent, action, artifacts="", outcome="", notes="", run_id=None, rendered=False):
+    with db:
+        return db.execute(
+            "INSERT INTO log_entries (date, agent, action, artifacts, outcome, notes, run_id, rendered) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+            (date, agent, action, artifacts, outcome, notes, run_id, int(rendered))).lastrowid
+
+
+def import_log(db, path=LOG_PATH):
+    if db.execute("SELECT COUNT(*) FROM log_entries").fetchone()[0]:
+        return 0
+    with open(path, encoding="utf-8") as f:
+        entries = parse_log(f.read())
+    for e in entries:
+        add_entry(db, rendered=True, **e)
+    return len(entries)
+
+
+def _cell(value):
+    return (value or "").replace("|", "\\|").replace("\n", " ")
+
+
+def _render_row(e):
+    return "| " + " | ".join(_cell(e[k]) for k in ("date", "agent", "action", "artifacts", "outcome", "notes")) + " |"
+
+
+LOG_HEADER = """# Verification Log & Async Agent Tracker
+
+This file tracks the verification activities performed by asynchronous agents working on the Neon Arcade repository.
+It serves to justify the retention or deletion of verification artifacts (scripts, screenshots) and provides a history of quality assurance checks.
+It is rendered from verification/.harness/results.db by `python verification/harness_results.py render`.
+
+## Log
+
+| Date | Agent | Action | Artifacts | Outcome | Notes |
+| :--- | :--- | :--- | :--- | :--- | :--- |
+"""
+
+
+def render(db, path=LOG_PATH, full=False):
+    """Write pending entries to the log; returns how many were written."""
+    where = "" if full else "WHERE rendered = 0"
+    entries = db.execute(f"SELECT * FROM log_entries {where} ORDER BY id").fetchall()
+    if not entries and not full:
+        return 0
+    rows = "\n".join(_render_row(e) for e in entries) + "\n"
+    if full:
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(LOG_HEADER + rows)
+    else:
+        try:
+            with open(path, encoding="utf-8") as f:
+                text = f.read()
+        except FileNotFoundError:
+            text = None
+        lines = [line for line in (text or "").splitlines() if line.strip()]
+        with open(path, "a", encoding="utf-8") as f:
+            if text is None:
+                f.write(LOG_HEADER)
+            elif not lines or not lines[-1].lstrip().startswith("|"):
+                # A hand-written section ended the table; reopen one for new rows.
+                f.write("\n| Date | Agent | Action | Artifacts | Outcome | Notes |\n"
+                        "| :--- | :--- | :--- | :--- | :--- | :--- |\n")
+            elif not text.endswith("\n"):
+                f.write("\n")
+            f.write(rows)
+    with db:
+        db.execute("UPDATE log_entries SET rendered = 1 WHERE rendered = 0")
+    return len(entries)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Query harness results and render the verification log.")
+    parser.add_argument("--db", default=DB_PATH)
+    sub = parser.add_subparsers(dest="command", required=True)
+    for name in ("slowest", "flaky"):
+        p = sub.add_parser(name)
+        p.add_argument("--runs", type=int, default=20, help="look at the last N runs")
+        p.add_argument("--limit", type=int, default=20)
+    hist = sub.add_parser("history", help="metric values per run")
+    hist.add_argument("metric")
+    hist.add_argument("--game")
+    hist.add_argument("--limit", type=int, default=50)
+    sub.add_parser("import-log", help="adopt the rows already in VERIFICATION_LOG.md")
+    add = sub.add_parser("add", help="add a verification log entry and render it")
+    add.add_argument("--agent", required=True)
+    add.add_argument("--action", required=True)
+    add.add_argument("--artifacts", default="")
+    add.add_argument("--outcome", default="PASSED")
+    add.add_argument("--notes", default="")
+    add.add_argument("--date", default=datetime.date.today().isoformat())
+    ren = sub.add_parser("render")
+    ren.add_argument("--full", action="store_true", help="rewrite the whole log from the database")
+    args = parser.parse_args(argv)
+    db = connect(args.db)
+
+    if args.command == "slowest":
+        print(f"{'mean s':>8} {'worst s':>8} {'runs':>5}  script")
+        for r in slowest(db, args.runs, args.limit):
+            print(f"{r['mean']:8.2f} {r['worst']:8.2f} {r['n']:5d}  {r['script']}")
+    elif args.command == "flaky":
+        print(f"{'flips':>5} {'runs':>5} {'pass':>6}  script")
+        for r in flaky(db, args.runs, args.limit):
+            print(f"{r['flips']:5d} {r['runs']:5d} {r['pass_rate']:6.0%}  {r['script']}")
+    elif args.command == "history":
+        for r in history(db, args.metric, args.game, args.limit):
+            print(f"run {r['run_id']:<5} {r['started']}  {r['git_commit'] or '-':<12} {r['value']:12.3f}  (n={r['n']})")
+    elif args.command == "import-log":
+        print(f"Imported {import_log(db)} log entries.")
+    elif args.command == "add":
+        import_log(db)
+        add_entry(db, args.date, args.agent, args.action, args.artifacts, args.outcome, args.notes)
+        print(f"Rendered {render(db)} new entries to {LOG_PATH}.")
+    else:
+        print(f"Rendered {render(db, full=args.full)} entries to {LOG_PATH}.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,421 @@
+"""Parallel runner for the verification suite.
+
+Discovers every verify_/check_/screenshot_ script and runs them across a pool
+of worker processes. Each worker owns a private static server (see
+harness_server.py), and scripts run there see it through HARNESS_BASE_URL.
+
+When Playwright is installed each worker also launches one pooled Chromium
+(see harness_browser.py) and exports it through HARNESS_CDP_ENDPOINT.
+
+Scripts are sorted by their previous duration, longest first, before they are
+handed to the pool, so the slow ones start early and the short ones fill the
+gaps at the end.
+
+Scripts fall into three lanes:
+
+* portable   - import harness_server, so they follow the worker's port.
+* legacy     - hard-code localhost:8000 but expect someone else to serve it.
+               They share one threaded server on 8000 and still run in parallel.
+* exclusive  - bind port 8000 themselves. They run one at a time once the
+               pool has drained and the shared server is down.
+
+Passing results are cached under a hash of each script's transitive inputs
+(see harness_cache.py) and replayed while those inputs are unchanged; `--rerun`
+ignores the cache. Many legacy scripts catch their own exceptions and exit 0,
+so a pass whose output carries a traceback or an error/failure line is
+reported as a pass but never cached.
+
+`--changed-since REF` runs only the scripts whose inputs changed since REF
+(see harness_deps.py for how inputs are derived).
+
+Each run is stored in the results database (see harness_results.py) unless
+`--no-record` is given.
+
+Usage:
+    python verification/harness_runner.py [-j 8] [--timeout 300] [--changed-since main] [pattern ...]
+"""
+import argparse
+import datetime
+import fnmatch
+import json
+import os
+import re
+import signal
+import subprocess
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import asdict, dataclass, field
+from multiprocessing.util import Finalize
+
+import harness_metrics
+from harness_browser import CDP_ENDPOINT_ENV, BrowserPool
+from harness_cache import ResultCache
+from harness_cdn import default_mode
+from harness_ready import summarize_waits
+from harness_server import BASE_URL_ENV, REPO_ROOT, StaticServer
+
+VERIFICATION_DIR = os.path.join(REPO_ROOT, "verification")
+STATE_DIR = os.path.join(VERIFICATION_DIR, ".harness")
+DURATIONS_PATH = os.path.join(STATE_DIR, "durations.json")
+LAST_RUN_PATH = os.path.join(STATE_DIR, "last_run.json")
+
+SCRIPT_PREFIXES = ("verify_", "check_", "screenshot_")
+LEGACY_PORT = 8000
+DEFAULT_TIMEOUT = 300
+
+_SELF_SERVING = re.compile(r"HTTPServer|TCPServer|http\.server|socketserver")
+_USES_HARNESS = re.compile(r"^\s*(?:from|import)\s+harness_", re.M)
+# Output of a script that swallowed its own failure and still exited 0.
+_SWALLOWED = re.compile(r"^\s*(?:Traceback \(most recent call last\)|Error:|ERROR\b|FAIL\b|FAILED\b|EXCEPTION\b)", re.M)
+
+PORTABLE, LEGACY, EXCLUSIVE = "portable", "legacy", "exclusive"
+
+
+@dataclass
+class ScriptResult:
+    name: str
+    lane: str
+    returncode: int
+    duration: float
+    output: str
+    timed_out: bool = False
+    metrics: list = field(default_factory=list)
+    cached: bool = False
+
+    @property
+    def passed(self):
+        return self.returncode == 0 and not self.timed_out
+
+    @property
+    def cacheable(self):
+        return self.passed and not _SWALLOWED.search(self.output)
+
+
+def discover(patterns=None):
+    """Return script file names under verification/, optionally filtered."""
+    names = sorted(
+        name for name in os.listdir(VERIFICATION_DIR)
+        if name.endswith(".py") and name.startswith(SCRIPT_PREFIXES)
+    )
+    if patterns:
+        names = [n for n in names if any(fnmatch.fnmatch(n, p) or p in n for p in patterns)]
+    return names
+
+
+def classify(name):
+    with open(os.path.join(VERIFICATION_DIR, name), encoding="utf-8") as f:
+        source = f.read()
+    if _USES_HARNESS.search(source):
+        return PORTABLE
+    if _SELF_SERVING.search(source):
+        return EXCLUSIVE
+    return LEGACY
+
+
+def load_durations():
+    try:
+        with open(DURATIONS_PATH, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def save_durations(durations):
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(DURATIONS_PATH, "w", encoding="utf-8") as f:
+        json.dump(durations, f, indent=2, sort_keys=True)
+
+
+def schedule(names, durations):
+    """Longest-first order; scripts without history assume the mean duration."""
+    known = [durations[n] for n in names if n in durations]
+    default = sum(known) / len(known) if known else float(DEFAULT_TIMEOUT)
+    return sorted(names, key=lambda n: (-durations.get(n, default), n))
+
+
+def predicted_makespan(names, durations, workers):
+    """Makespan of greedy longest-first packing onto `workers` bins."""
+    known = [durations[n] for n in names if n in durations]
+    default = sum(known) / len(known) if known else 0.0
+    bins = [0.0] * max(1, workers)
+    for name in schedule(names, durations):
+        i = bins.index(min(bins))
+        bins[i] += durations.get(name, default)
+    return max(bins)
+
+
+# --- Worker process state ---
+# Populated once per worker by _init_worker so every task in that process
+# reuses the same server and browser.
+_worker_server = None
+_worker_pool = None
+_worker_env = None
+_worker_reported = False
+
+
+def _init_worker(extra_env, use_browser_pool):
+    global _worker_server, _worker_pool, _worker_env
+    _worker_server = StaticServer().start()
+    _worker_env = {**os.environ, **extra_env, BASE_URL_ENV: _worker_server.base_url}
+    if use_browser_pool:
+        try:
+            _worker_pool = BrowserPool().start()
+            _worker_env[CDP_ENDPOINT_ENV] = _worker_pool.endpoint
+            # Pool workers leave through multiprocessing's shutdown hooks, not atexit.
+            Finalize(_worker_pool, _worker_pool.stop, exitpriority=10)
+        except Exception as e:
+            # Missing Playwright or browsers: scripts fall back to cold launches.
+            print(f"Browser pool unavailable ({e}); scripts will launch their own.")
+            _worker_pool = None
+
+
+def run_script(name, lane, timeout, env=None, script_args=()):
+    """Run one script from the repo root and capture its combined output."""
+    env = env if env is not None else (_worker_env or dict(os.environ))
+    fd, metrics_path = tempfile.mkstemp(prefix="harness-metrics-", suffix=".jsonl")
+    os.close(fd)
+    env = {**env, "PYTHONUNBUFFERED": "1", harness_metrics.METRICS_ENV: metrics_path}
+    if lane != PORTABLE:
+        env.pop(BASE_URL_ENV, None)
+        env.pop(CDP_ENDPOINT_ENV, None)
+    cmd = [sys.executable, os.path.join("verification", name), *script_args]
+    start = time.perf_counter()
+    # A fresh session lets a timeout take down Chromium along with the script.
+    proc = subprocess.Popen(
+        cmd, cwd=REPO_ROOT, env=env, start_new_session=True,
+        stdout=subprocess.PIPE, stderr=subprocess.STDOUT, text=True, errors="replace",
+    )
+    try:
+        output, _ = proc.communicate(timeout=timeout)
+        result = ScriptResult(name, lane, proc.returncode, time.perf_counter() - start, output)
+    except subprocess.TimeoutExpired:
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+        output, _ = proc.communicate()
+        result = ScriptResult(name, lane, -1, time.perf_counter() - start, output, timed_out=True)
+    result.metrics = harness_metrics.read(metrics_path)
+    os.unlink(metrics_path)
+    return result
+
+
+def _run_pooled(name, lane, timeout, script_args):
+    global _worker_reported
+    result = run_script(name, lane, timeout, script_args=script_args)
+    if _worker_pool and not _worker_reported:
+        # Report the one-off launch cost once per worker, next to the
+        # per-script acquisition latencies.
+        result.metrics.append({"name": "browser.pool_launch_ms", "value": _worker_pool.launch_ms,
+                               "tags": {"pooled": False}, "script": name, "ts": time.time()})
+        _worker_reported = True
+    return result
+
+
+def run_suite(names, workers, timeout, extra_env=None, on_result=None, use_browser_pool=True,
+              script_args=(), cache=None, rerun=False):
+    """Run `names` and return their ScriptResults in completion order.
+
+    With a ResultCache, scripts whose inputs are unchanged since a passing run
+    are replayed from it (unless `rerun`), and new passing results are stored.
+    """
+    extra_env = extra_env or {}
+    durations = load_durations()
+    results = []
+
+    def record(result):
+        results.append(result)
+        if on_result:
+            on_result(result)
+
+    keys = {}
+    if cache is not None:
+        keys = {name: cache.key(name, script_args) for name in names}
+        if not rerun:
+            pending = []
+            for name in names:
+                entry = cache.get(keys[name])
+                if entry:
+                    record(ScriptResult(**{**entry, "cached": True}))
+                else:
+                    pending.append(name)
+            names = pending
+
+    lanes = {name: classify(name) for name in names}
+    pooled = schedule([n for n in names if lanes[n] != EXCLUSIVE], durations)
+    exclusive = schedule([n for n in names if lanes[n] == EXCLUSIVE], durations)
+
+    shared = None
+    if any(lanes[n] == LEGACY for n in pooled):
+        try:
+            shared = StaticServer(host="localhost", port=LEGACY_PORT).start()
+        except OSError:
+            print(f"Port {LEGACY_PORT} in use; legacy scripts will use the existing server.")
+
+    try:
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(extra_env, use_browser_pool)) as pool:
+            futures = [pool.submit(_run_pooled, n, lanes[n], timeout, tuple(script_args)) for n in pooled]
+            for future in as_completed(futures):
+                record(future.result())
+    finally:
+        if shared:
+            shared.stop()
+
+    env = {**os.environ, **extra_env}
+    for name in exclusive:
+        record(run_script(name, EXCLUSIVE, timeout, env, script_args))
+
+    for result in results:
+        if result.cached:
+            continue
+        if not result.timed_out:
+            durations[result.name] = round(result.duration, 3)
+        if cache is not None and result.cacheable:
+            cache.put(keys[result.name], {k: v for k, v in asdict(result).items() if k != "cached"})
+    save_durations(durations)
+    if cache is not None:
+        cache.prune()
+    return results
+
+
+def summarize(results, wall_time, workers):
+    total = sum(r.duration for r in results)
+    failed = [r for r in results if not r.passed]
+    print("\n--- Summary ---")
+    cached = [r for r in results if r.cached]
+    total -= sum(r.duration for r in cached)
+    for r in sorted(results, key=lambda r: -r.duration):
+        status = "TIMEOUT" if r.timed_out else ("PASS" if r.passed else f"FAIL({r.returncode})")
+        if r.cached:
+            status = "CACHED"
+        print(f"{status:<10} {r.duration:7.2f}s  {r.lane:<9} {r.name}")
+    print(f"\nPassed: {len(results) - len(failed)}/{len(results)}")
+    print(f"Wall time: {wall_time:.2f}s  Total work: {total:.2f}s  "
+          f"Ideal ({workers} workers): {total / max(1, workers):.2f}s")
+    if cached:
+        print(f"Cache: {len(cached)} scripts replayed, {sum(r.duration for r in cached):.2f}s of work skipped")
+    summarize_browser(results)
+    summarize_readiness(results)
+    summarize_cdn(results)
+
+    os.makedirs(STATE_DIR, exist_ok=True)
+    with open(LAST_RUN_PATH, "w", encoding="utf-8") as f:
+        json.dump({
+            "wall_time": round(wall_time, 3),
+            "workers": workers,
+            "results": [{**asdict(r), "passed": r.passed} for r in results],
+        }, f, indent=2)
+    return failed
+
+
+def summarize_browser(results):
+    rows = [m for r in results for m in r.metrics]
+    pooled = harness_metrics.values(rows, "browser.acquire_ms", pooled=True)
+    cold = harness_metrics.values(rows, "browser.acquire_ms", pooled=False)
+    cold += harness_metrics.values(rows, "browser.pool_launch_ms")
+    if not pooled and not cold:
+        return
+    line = "Browser:"
+    if pooled:
+        line += f" {len(pooled)} pooled contexts, mean acquire {sum(pooled) / len(pooled):.1f} ms"
+    if cold:
+        line += f"{',' if pooled else ''} {len(cold)} cold launches, mean {sum(cold) / len(cold):.1f} ms"
+    print(line)
+
+
+def summarize_readiness(results):
+    waits, waited_ms, replaced_ms = summarize_waits([m for r in results for m in r.metrics])
+    if waits:
+        print(f"Readiness: {waits} signal waits took {waited_ms / 1000:.2f}s "
+              f"(in place of {replaced_ms / 1000:.2f}s of nominal fixed sleeps removed)")
+
+
+def summarize_cdn(results):
+    rows = [m for r in results for m in r.metrics]
+    hits = harness_metrics.values(rows, "cdn.hits")
+    if not hits:
+        return
+    misses = sum(harness_metrics.values(rows, "cdn.misses"))
+    served = sum(harness_metrics.values(rows, "cdn.bytes_served"))
+    recorded = sum(harness_metrics.values(rows, "cdn.recorded"))
+    line = f"CDN mirror: {sum(hits)} hits, {misses} misses, {served / 1e6:.1f} MB served from disk"
+    if recorded:
+        line += f", {recorded} newly recorded"
+    print(line)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="Run verification scripts in parallel.")
+    parser.add_argument("patterns", nargs="*", help="glob or substring filters on script names")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--timeout", type=float, default=DEFAULT_TIMEOUT, help="per-script timeout in seconds")
+    parser.add_argument("--list", action="store_true", help="print the schedule and exit")
+    parser.add_argument("--no-browser-pool", action="store_true", help="let every script launch its own Chromium")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print output of failing scripts")
+    parser.add_argument("--rerun", action="store_true", help="run every script even if a cached pass exists")
+    parser.add_argument("--no-cache", action="store_true", help="neither read nor write the result cache")
+    parser.add_argument("--no-record", action="store_true", help="do not store this run in the results database")
+    parser.add_argument("--changed-since", metavar="REF",
+                        help="only run scripts whose JS/HTML/harness inputs changed since this git ref")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    names = discover(args.patterns)
+    if not names:
+        print("No scripts matched.")
+        return 1
+    if args.changed_since:
+        from harness_deps import affected, changed_files
+
+        changed = changed_files(args.changed_since)
+        selected = affected(names, changed)
+        print(f"{len(changed)} files changed since {args.changed_since}: "
+              f"{len(selected)}/{len(names)} scripts affected.")
+        if not selected:
+            return 0
+        names = selected
+
+    durations = load_durations()
+    if args.list:
+        for name in schedule(names, durations):
+            print(f"{durations.get(name, 0):7.2f}s  {classify(name):<9} {name}")
+        print(f"Predicted wall time ({args.workers} workers): "
+              f"{predicted_makespan(names, durations, args.workers):.2f}s")
+        return 0
+
+    print(f"Running {len(names)} scripts on {args.workers} workers...")
+
+    def progress(result):
+        mark = "c" if result.cached else ("." if result.passed else "F")
+        print(mark, end="", flush=True)
+
+    started = datetime.datetime.now().isoformat(timespec="seconds")
+    start = time.perf_counter()
+    if not args.no_cache:
+        # Settle the CDN mode once (it may probe the network) and export it to
+        # the scripts, so their cache keys name the mode they actually ran in.
+        default_mode()
+    cache = None if args.no_cache else ResultCache()
+    results = run_suite(names, args.workers, args.timeout, on_result=progress,
+                        use_browser_pool=not args.no_browser_pool, cache=cache, rerun=args.rerun)
+    wall_time = time.perf_counter() - start
+    failed = summarize(results, wall_time, args.workers)
+    if not args.no_record:
+        from harness_results import connect, head_commit, record_run
+
+        rows = [{**asdict(r), "passed": r.passed} for r in results]
+        run_id = record_run(connect(), rows, wall_time, args.workers, head_commit(), started)
+        print(f"Recorded as run {run_id} in the results database.")
+
+    if args.verbose:
+        for r in failed:
+            print(f"\n=== {r.name} ===\n{r.output}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
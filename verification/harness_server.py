@@ -0,0 +1,144 @@
+"""Shared static-asset server for the verification suite.
+
+Scripts used to start their own single-threaded HTTPServer on port 8000 and
+sleep while it booted. Import this instead:
+
+    from harness_server import serve
+
+    with serve() as base_url:
+        page.goto(f"{base_url}/index.html")
+
+`serve()` reuses the server the runner exported through HARNESS_BASE_URL when
+there is one, otherwise it starts a threaded keep-alive server on an ephemeral
+port and returns as soon as the socket is accepting connections.
+
+Scripts that still hard-code localhost:8000 are not ported; harness_runner.py
+serves them from its shared legacy server instead.
+
+Run directly to serve the repo by hand:
+
+    python verification/harness_server.py [--port 8000]
+"""
+import argparse
+import os
+import socket
+import threading
+from contextlib import contextmanager
+from functools import partial
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASE_URL_ENV = "HARNESS_BASE_URL"
+
+
+class QuietHandler(SimpleHTTPRequestHandler):
+    # HTTP/1.1 keeps connections alive, so a page load reuses a handful of
+    # sockets instead of opening one per module import.
+    protocol_version = "HTTP/1.1"
+    # Idle keep-alive connections must not pin handler threads forever.
+    timeout = 30
+
+    extensions_map = {
+        **SimpleHTTPRequestHandler.extensions_map,
+        ".js": "text/javascript",
+        ".mjs": "text/javascript",
+        ".wasm": "application/wasm",
+    }
+
+    def log_message(self, format, *args):
+        pass
+
+    def handle_one_request(self):
+        # Browsers drop keep-alive sockets mid-request when a page navigates
+        # away; that is not a server error worth a traceback.
+        try:
+            super().handle_one_request()
+        except (ConnectionResetError, BrokenPipeError):
+            self.close_connection = True
+
+
+class StaticServer:
+    """Threaded static file server bound to an ephemeral port."""
+
+    def __init__(self, directory=REPO_ROOT, host="127.0.0.1", port=0, handler=QuietHandler):
+        self.directory = directory
+        self.host = host
+        self.port = port
+        self.handler = handler
+        self.ready = threading.Event()
+        self._httpd = None
+        self._thread = None
+
+    @property
+    def base_url(self):
+        return f"http://{self.host}:{self.port}"
+
+    def url(self, path=""):
+        return f"{self.base_url}/{path.lstrip('/')}"
+
+    def start(self, timeout=5):
+        handler = partial(self.handler, directory=self.directory)
+        self._httpd = ThreadingHTTPServer((self.host, self.port), handler)
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._serve, name=f"harness-server-{self.port}", daemon=True)
+        self._thread.start()
+        if not self.ready.wait(timeout):
+            self.stop()
+            raise RuntimeError(f"Static server on port {self.port} did not become ready within {timeout}s")
+        return self
+
+    def _serve(self):
+        # The socket is already listening once the constructor returns, so a
+        # single successful connect is proof the server will answer.
+        with socket.create_connection((self.host, self.port), timeout=1):
+            pass
+        self.ready.set()
+        self._httpd.serve_forever(poll_interval=0.1)
+
+    def stop(self):
+        if self._httpd:
+            if self.ready.is_set():
+                self._httpd.shutdown()
+            self._httpd.server_close()
+            self._httpd = None
+        self.ready.clear()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+
+@contextmanager
+def serve(directory=REPO_ROOT):
+    """Yield a base URL backed by the runner's server or a private one."""
+    shared = os.environ.get(BASE_URL_ENV)
+    if shared:
+        yield shared.rstrip("/")
+        return
+    with StaticServer(directory) as server:
+        yield server.base_url
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve the repo for verification scripts.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0, help="0 picks a free port")
+    parser.add_argument("--directory", default=REPO_ROOT)
+    args = parser.parse_args()
+
+    server = StaticServer(args.directory, args.host, args.port).start()
+    # Machine-readable so wrappers can pick the URL off stdout.
+    print(f"{BASE_URL_ENV}={server.base_url}", flush=True)
+    try:
+        server._thread.join()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,57 @@
+"""Hub session and CDP helpers shared by the game-sweep tools.
+
+    from harness_session import hub_page, game_ids, cdp_session
+
+    with hub_page() as page:
+        for game_id in game_ids(page, ["neon-*"]):
+            ...
+
+`hub_page()` stacks the shared server, the pooled browser, the CDN mirror and
+the hub-ready signal, and yields a page sitting on the hub menu.
+"""
+import fnmatch
+from contextlib import contextmanager
+
+from harness_browser import browser_context
+from harness_ready import wait_hub_ready
+from harness_server import serve
+
+
+@contextmanager
+def hub_page(path="index.html", launch_kwargs=None, init_scripts=(), **context_options):
+    """Yield a page on the hub once `hub-ready` has fired."""
+    from playwright.sync_api import sync_playwright
+
+    with serve() as base_url, sync_playwright() as p, \
+            browser_context(p, launch_kwargs, **context_options) as context:
+        for script in init_scripts:
+            context.add_init_script(script)
+        page = context.new_page()
+        page.goto(f"{base_url}/{path}")
+        wait_hub_ready(page)
+        yield page
+
+
+def game_ids(page, patterns=None, include_system=True):
+    """Registry IDs in registry order, optionally filtered by glob patterns."""
+    ids = page.evaluate("""(includeSystem) => Object.entries(window.miniGameHub.gameRegistry)
+        .filter(([, g]) => includeSystem || g.category !== 'System')
+        .map(([id]) => id)""", include_system)
+    if patterns:
+        ids = [i for i in ids if any(fnmatch.fnmatch(i, p) for p in patterns)]
+    return ids
+
+
+def cdp_session(page):
+    return page.context.new_cdp_session(page)
+
+
+def collect_garbage(cdp):
+    # A second pass picks up objects freed by finalizers of the first.
+    cdp.send("HeapProfiler.collectGarbage")
+    cdp.send("HeapProfiler.collectGarbage")
+
+
+def performance_metrics(cdp):
+    """Performance.getMetrics as a {name: value} dict (Performance must be enabled)."""
+    return {m["name"]: m["value"] for m in cdp.send("Performance.getMetrics")["metrics"]}
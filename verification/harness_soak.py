@@ -0,0 +1,219 @@
+"""Virtual-time soak testing: simulate long play sessions in a fraction of wall time.
+
+Each game runs in a fresh page whose clock is under CDP virtual time
+(`Emulation.setVirtualTimePolicy`). The tool hands Chromium a budget of one
+sampling interval at a time. Timers and animation frames run as fast as the
+CPU allows, with no real-time waiting. After each budget expires it samples:
+
+* JS heap and DOM node count (after a forced GC);
+* entity counts: lengths of arrays and sizes of Maps/Sets on the current game
+  instance (`miniGameHub.getCurrentGame()`) and one level below it, e.g.
+  `particles`, `enemies`, `engine.history`. A game can add its own counters by
+  implementing `getSoakStats()` and returning a `{name: number}` object;
+* frame cost: script time per animation frame during the interval.
+
+A series is flagged when it keeps growing: a good linear fit (harness_leaks'
+least squares) with growth past the thresholds below. Games are split across
+`-j` worker processes, each with its own browser page. Every registry entry
+is soaked, including the System category.
+
+    python verification/harness_soak.py [--minutes 30] [--interval 60] [-j 4] [game-glob ...]
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import harness_metrics
+from harness_leaks import linear_fit
+from harness_ready import enter_game, wait_hub_ready
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, collect_garbage, game_ids, hub_page, performance_metrics
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "soak.json")
+
+MIN_R2 = 0.8
+HEAP_GROWTH_BYTES = 10 * 1024 * 1024
+NODE_GROWTH = 200
+ENTITY_GROWTH = 50
+FRAME_COST_RATIO = 2.0
+# grows() drops the warm-up sample and needs 3 more, so fewer intervals could
+# never flag anything.
+MIN_STEPS = 4
+MAX_BUDGET_WAIT_S = 600
+
+FRAME_COUNTER_JS = """(() => {
+    window.__harnessSoakFrames = 0;
+    const raf = window.requestAnimationFrame.bind(window);
+    const tick = () => { window.__harnessSoakFrames++; raf(tick); };
+    raf(tick);
+})()"""
+
+ENTITY_COUNTS_JS = """() => {
+    const game = window.miniGameHub && window.miniGameHub.getCurrentGame();
+    const out = {};
+    if (!game) return out;
+    const count = (v) => Array.isArray(v) ? v.length : (v instanceof Map || v instanceof Set) ? v.size : null;
+    const visit = (obj, prefix, depth) => {
+        for (const key of Object.keys(obj).slice(0, 200)) {
+            let v;
+            try { v = obj[key]; } catch (e) { continue; }
+            const n = count(v);
+            if (n !== null) out[prefix + key] = n;
+            else if (depth === 0 && v && typeof v === 'object' && !(v instanceof Node) && !ArrayBuffer.isView(v)) {
+                visit(v, prefix + key + '.', depth + 1);
+            }
+        }
+    };
+    visit(game, '', 0);
+    if (typeof game.getSoakStats === 'function') {
+        try { Object.assign(out, game.getSoakStats()); } catch (e) { /* ignore */ }
+    }
+    return out;
+}"""
+
+
+def run_budget(page, cdp, budget_ms, expired):
+    """Advance virtual time by `budget_ms` and wait for Chromium to report it spent."""
+    expired.clear()
+    cdp.send("Emulation.setVirtualTimePolicy", {"policy": "advance", "budget": budget_ms})
+    deadline = time.monotonic() + MAX_BUDGET_WAIT_S
+    while not expired:
+        if time.monotonic() > deadline:
+            raise TimeoutError(f"virtual time budget of {budget_ms} ms did not expire")
+        # Any round trip lets the sync API dispatch the expiry event.
+        page.wait_for_timeout(20)
+
+
+def soak_game(page, game_id, minutes, interval_s):
+    cdp = cdp_session(page)
+    cdp.send("Performance.enable")
+    expired = []
+    cdp.on("Emulation.virtualTimeBudgetExpired", lambda _: expired.append(True))
+    enter_game(page, game_id)
+    page.evaluate(FRAME_COUNTER_JS)
+    # Take the clock over; it stays paused between budgets.
+    cdp.send("Emulation.setVirtualTimePolicy", {"policy": "pause"})
+
+    samples = []
+    steps = max(MIN_STEPS, int(minutes * 60 / interval_s))
+    wall_start = time.perf_counter()
+    prev_frames = prev_script = 0
+    for step in range(steps + 1):
+        if step:
+            run_budget(page, cdp, interval_s * 1000, expired)
+        collect_garbage(cdp)
+        metrics = performance_metrics(cdp)
+        frames = page.evaluate("window.__harnessSoakFrames")
+        script = metrics.get("ScriptDuration", 0)
+        samples.append({
+            "sim_s": step * interval_s,
+            "heap": metrics.get("JSHeapUsedSize", 0),
+            "nodes": metrics.get("Nodes", 0),
+            "frames": frames - prev_frames,
+            "frame_cost_ms": round((script - prev_script) * 1000 / max(1, frames - prev_frames), 3) if step else None,
+            "entities": page.evaluate(ENTITY_COUNTS_JS),
+        })
+        prev_frames, prev_script = frames, script
+    wall = time.perf_counter() - wall_start
+    return {"game": game_id, "simulated_s": steps * interval_s, "wall_s": round(wall, 1),
+            "speedup": round(steps * interval_s / wall, 1) if wall else None, "samples": samples}
+
+
+def grows(ys, threshold):
+    """Steady, non-trivial growth across the series (first sample excluded as warm-up)."""
+    ys = ys[1:]
+    if len(ys) < 3:
+        return False
+    slope, _, r2 = linear_fit(list(range(len(ys))), ys)
+    return slope > 0 and r2 >= MIN_R2 and ys[-1] - ys[0] > threshold
+
+
+def analyse(report):
+    samples = report["samples"]
+    flags = []
+    if grows([s["heap"] for s in samples], HEAP_GROWTH_BYTES):
+        flags.append(f"heap +{(samples[-1]['heap'] - samples[1]['heap']) / 1e6:.1f} MB")
+    if grows([s["nodes"] for s in samples], NODE_GROWTH):
+        flags.append(f"DOM nodes +{samples[-1]['nodes'] - samples[1]['nodes']:.0f}")
+    keys = set().union(*(s["entities"] for s in samples))
+    for key in sorted(keys):
+        ys = [s["entities"].get(key, 0) for s in samples]
+        if grows(ys, max(ENTITY_GROWTH, ys[1] if len(ys) > 1 else 0)):
+            flags.append(f"{key} {ys[1]} -> {ys[-1]}")
+    costs = [s["frame_cost_ms"] for s in samples if s["frame_cost_ms"] is not None]
+    if len(costs) >= 4:
+        quarter = max(1, len(costs) // 4)
+        early, late = sum(costs[:quarter]) / quarter, sum(costs[-quarter:]) / quarter
+        if early and late / early > FRAME_COST_RATIO:
+            flags.append(f"frame cost {early:.2f} -> {late:.2f} ms")
+    report["flags"] = flags
+    game = report["game"]
+    harness_metrics.record("soak.heap_growth_bytes", samples[-1]["heap"] - samples[1]["heap"], game=game)
+    harness_metrics.record("soak.speedup", report["speedup"], game=game)
+    return report
+
+
+def _soak_chunk(game_list, minutes, interval_s):
+    reports = []
+    with hub_page() as hub:
+        url = hub.url
+        for game_id in game_list:
+            # Virtual time cannot be switched off again, so every game gets its own page.
+            page = hub.context.new_page()
+            try:
+                page.goto(url)
+                wait_hub_ready(page)
+                reports.append(analyse(soak_game(page, game_id, minutes, interval_s)))
+            except Exception as e:
+                reports.append({"game": game_id, "error": str(e), "flags": []})
+            finally:
+                page.close()
+            print(f"  soaked {game_id}", flush=True)
+    return reports
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fast-forward games through long sessions under virtual time.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--minutes", type=float, default=30, help="simulated minutes per game")
+    parser.add_argument("--interval", type=float, default=60, help="simulated seconds between samples")
+    parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1)
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    with hub_page() as page:
+        # System entries (trophy room, hall of fame, ...) stay open for long sessions too.
+        games = game_ids(page, args.games)
+    if not games:
+        print(f"No registry games match {' '.join(args.games) or '*'}; nothing to soak.")
+        return 1
+    if args.minutes * 60 / args.interval < MIN_STEPS:
+        print(f"Note: {args.minutes:g} min at {args.interval:g}s intervals is under {MIN_STEPS} samples; "
+              f"soaking {MIN_STEPS * args.interval / 60:g} simulated minutes so growth can be detected.")
+    chunks = [games[i::args.workers] for i in range(args.workers) if games[i::args.workers]]
+    print(f"Soaking {len(games)} games for {args.minutes:.0f} simulated minutes on {len(chunks)} workers...")
+    reports = []
+    with ProcessPoolExecutor(max_workers=len(chunks)) as pool:
+        for chunk_reports in pool.map(_soak_chunk, chunks, [args.minutes] * len(chunks), [args.interval] * len(chunks)):
+            reports += chunk_reports
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"minutes": args.minutes, "interval_s": args.interval, "games": reports}, f, indent=1)
+
+    print(f"\n{'game':<28} {'speedup':>8}  findings")
+    for r in sorted(reports, key=lambda r: (not r["flags"] and "error" not in r, r["game"])):
+        if "error" in r:
+            print(f"{r['game']:<28} {'-':>8}  ERROR {r['error']}")
+        else:
+            print(f"{r['game']:<28} {r['speedup'] or 0:7.1f}x  {'; '.join(r['flags']) or 'stable'}")
+    flagged = [r for r in reports if r["flags"] or "error" in r]
+    print(f"\n{len(flagged)}/{len(reports)} games show unbounded growth or failed. Report: {args.out}")
+    return 1 if flagged else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,212 @@
+"""Cold/warm startup benchmark for the hub under CPU-throttled device profiles.
+
+index.html is loaded repeatedly at each CDP `Emulation.setCPUThrottlingRate`
+(default 1x, 4x and 6x) in three cache modes:
+
+    cold  fresh browser context per load: empty HTTP cache, no service worker
+    warm  one context with service workers blocked, primed once, then reloaded
+    sw    service workers allowed; primed until sw.js controls the page and has
+          filled its cache, then reloaded
+
+Every milestone is measured in ms from navigation start (User Timing marks in
+js/main.js and js/core/ArcadeHub.js):
+
+    api          `window.miniGameHub` defined             (mark hub:api)
+    ready        DOMContentLoaded setup finished          (hub-ready signal)
+    loader       #app-loader dismissed                    (mark hub:loader-hidden)
+    hub_frame    first ArcadeHub WebGL frame rendered     (mark hub:first-frame)
+    interactive  menu grid populated and the main thread free of long tasks for
+                 QUIET_MS (end of the last long task, or hub-ready if later)
+
+The loader waits for a click, so the init script clicks it the moment the hub
+is ready; `loader` therefore measures the earliest a user could dismiss it.
+
+Playwright routing disables the HTTP cache, and the CDN mirror uses it. When
+the mirror is active the warm numbers only cover what the service worker or
+the memory cache serves. Use HARNESS_CDN_MODE=off on a networked box for true
+warm-cache numbers.
+
+    python verification/harness_startup.py [--runs 10] [--cpu 1 4 6] [--modes cold warm sw]
+"""
+import argparse
+import json
+import os
+import sys
+from contextlib import contextmanager
+
+import harness_metrics
+from harness_browser import connect
+from harness_cdn import OFF, default_mode, mirror_context
+from harness_frames import percentile
+from harness_server import REPO_ROOT, serve
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "startup.json")
+MODES = ("cold", "warm", "sw")
+MILESTONES = ("api", "ready", "loader", "hub_frame", "interactive")
+QUIET_MS = 500
+MAX_SETTLE_MS = 20000
+
+STARTUP_JS = """(() => {
+    const t = window.__harnessStartup = { longTasks: [], done: false };
+    try {
+        new PerformanceObserver((list) => {
+            for (const e of list.getEntries()) t.longTasks.push(e.startTime + e.duration);
+        }).observe({ type: 'longtask', buffered: true });
+    } catch (e) { /* longtask unsupported: interactive falls back to hub-ready */ }
+    window.addEventListener('minigamehub:hub-ready', (e) => {
+        t.ready = e.detail.time;
+        const loader = document.getElementById('app-loader');
+        if (loader) loader.click();
+        const settle = () => {
+            const now = performance.now();
+            const busyUntil = Math.max(t.ready, ...t.longTasks);
+            if (document.querySelector('#menu-grid button') && now - busyUntil >= %d) {
+                t.interactive = busyUntil;
+            } else if (now - t.ready < %d) {
+                return setTimeout(settle, 50);
+            }
+            t.done = true;
+        };
+        settle();
+    }, { once: true });
+})()""" % (QUIET_MS, MAX_SETTLE_MS)
+
+_RESULT_JS = """() => {
+    const t = window.__harnessStartup;
+    const mark = (name) => {
+        const entry = performance.getEntriesByName(name, 'mark')[0];
+        return entry ? entry.startTime : null;
+    };
+    const resources = performance.getEntriesByType('resource');
+    const nav = performance.getEntriesByType('navigation')[0];
+    return {
+        api: mark('hub:api'),
+        ready: t.ready ?? null,
+        loader: mark('hub:loader-hidden'),
+        hub_frame: mark('hub:first-frame'),
+        interactive: t.interactive ?? null,
+        requests: resources.length + 1,
+        transfer_bytes: resources.reduce((n, r) => n + (r.transferSize || 0), nav ? nav.transferSize || 0 : 0),
+        controlled: !!(navigator.serviceWorker && navigator.serviceWorker.controller),
+    };
+}"""
+
+
+@contextmanager
+def bench_context(browser, service_workers):
+    context = browser.new_context(service_workers="allow" if service_workers else "block")
+    context.add_init_script(STARTUP_JS)
+    try:
+        with mirror_context(context):
+            yield context
+    finally:
+        context.close()
+
+
+def throttled_page(context, rate):
+    page = context.new_page()
+    cdp = page.context.new_cdp_session(page)
+    cdp.send("Emulation.setCPUThrottlingRate", {"rate": rate})
+    return page
+
+
+def load(page, url):
+    page.goto(url)
+    page.wait_for_function("window.__harnessStartup && window.__harnessStartup.done",
+                           timeout=MAX_SETTLE_MS + 60000)
+    return page.evaluate(_RESULT_JS)
+
+
+def prime_service_worker(page, url):
+    """Load until sw.js controls the page; the controlled load fills its cache."""
+    load(page, url)
+    page.evaluate("navigator.serviceWorker.ready.then(() => true)")
+    load(page, url)
+    # Let the stale-while-revalidate cache.put()s of that load settle.
+    page.wait_for_timeout(1000)
+
+
+def bench(browser, url, mode, rate, runs):
+    samples = []
+    if mode == "cold":
+        for _ in range(runs):
+            with bench_context(browser, service_workers=False) as context:
+                samples.append(load(throttled_page(context, rate), url))
+        return samples
+    with bench_context(browser, service_workers=mode == "sw") as context:
+        page = throttled_page(context, rate)
+        if mode == "sw":
+            prime_service_worker(page, url)
+        else:
+            load(page, url)
+        for _ in range(runs):
+            samples.append(load(page, url))
+    return samples
+
+
+def summarize(samples):
+    out = {"runs": len(samples)}
+    for key in MILESTONES + ("transfer_bytes", "requests"):
+        values = [s[key] for s in samples if s[key] is not None]
+        out[key] = {"p50": percentile(values, 50), "p95": percentile(values, 95), "n": len(values)}
+    out["controlled"] = sum(1 for s in samples if s["controlled"])
+    return out
+
+
+def _fmt(stat):
+    if stat["p50"] is None:
+        return f"{'-':>15}"
+    return f"{stat['p50']:7.0f}/{stat['p95']:<7.0f}"
+
+
+def print_report(reports):
+    print(f"\n{'cpu':>4} {'mode':<5} " + " ".join(f"{m:>15}" for m in MILESTONES) + f" {'KB p50':>8}")
+    print(f"{'':>4} {'':<5} " + " ".join(f"{'p50/p95 ms':>15}" for _ in MILESTONES))
+    for r in reports:
+        s = r["summary"]
+        kb = (s["transfer_bytes"]["p50"] or 0) / 1024
+        line = f"{r['cpu']:>3g}x {r['mode']:<5} " + " ".join(_fmt(s[m]) for m in MILESTONES) + f" {kb:8.0f}"
+        if r["mode"] == "sw" and s["controlled"] < s["runs"]:
+            line += f"  (only {s['controlled']}/{s['runs']} loads SW-controlled)"
+        print(line)
+
+
+def main(argv=None):
+    from playwright.sync_api import sync_playwright
+
+    parser = argparse.ArgumentParser(description="Benchmark hub startup across cache modes and CPU throttling.")
+    parser.add_argument("--runs", type=int, default=10, help="measured loads per mode and CPU profile")
+    parser.add_argument("--cpu", type=float, nargs="+", default=[1, 4, 6], help="CPU throttling rates")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    if "warm" in args.modes and default_mode() != OFF:
+        print("Note: the CDN mirror's routing disables the HTTP cache; warm loads only hit the memory cache.")
+    reports = []
+    with serve() as base_url, sync_playwright() as p:
+        browser = connect(p)
+        try:
+            for rate in args.cpu:
+                for mode in args.modes:
+                    print(f"  {rate:g}x {mode}...", flush=True)
+                    samples = bench(browser, f"{base_url}/index.html", mode, rate, args.runs)
+                    summary = summarize(samples)
+                    reports.append({"cpu": rate, "mode": mode, "summary": summary, "samples": samples})
+                    for m in MILESTONES:
+                        if summary[m]["p50"] is not None:
+                            harness_metrics.record(f"startup.{m}_ms", round(summary[m]["p50"], 1),
+                                                   mode=mode, cpu=rate)
+        finally:
+            browser.close()
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"runs": args.runs, "quiet_ms": QUIET_MS, "reports": reports}, f, indent=1)
+    print_report(reports)
+    print(f"\nReport: {args.out}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,286 @@
+"""Service worker cache effectiveness for sw.js (stale-while-revalidate).
+
+verify_sw.py only checks that main.js registers the worker. This tool drives
+a real session with the worker in control and classifies every page request
+from CDP Network events:
+
+    sw-cache     served by sw.js from Cache Storage
+                 (`serviceWorkerResponseSource == "cache-storage"`)
+    sw-network   passed through sw.js to the network or HTTP cache
+    http-cache   not intercepted by the worker, served by the HTTP cache
+    network      not intercepted by the worker, fetched from the network
+
+The session has four phases:
+
+    first-visit    initial load; the worker installs and claims the page
+    repeat-visit   reload with the worker in control
+    games          every registry entry, System ones included, launched once
+                   (modules fetched lazily)
+    games-repeat   reload, then every game launched again
+
+After each game launch the tool samples the worker cache: entries, body bytes
+and `navigator.storage.estimate().usage`. That series shows how Cache
+Storage grows over a session.
+
+Requests whose URLs never reach the cache are listed with the reason sw.js
+skips them: cross-origin (CDN responses are opaque or CORS, so
+`type !== 'basic'`), a non-200 status, a non-GET method, or the analytics
+exclusion.
+
+Playwright cannot route requests the worker makes itself. With the CDN mirror
+active, the worker's CDN fetches still go to the real network, so run this on
+a networked box.
+
+    python verification/harness_swcache.py [game-glob ...]
+
+Exits non-zero if a same-origin GET 200 asset is never cached, because that
+is a sw.js bug.
+"""
+import argparse
+import json
+import os
+import re
+import sys
+from urllib.parse import urldefrag, urlsplit
+
+import harness_metrics
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "swcache.json")
+SOURCES = ("sw-cache", "sw-network", "http-cache", "network")
+
+
+def cache_name():
+    with open(os.path.join(REPO_ROOT, "sw.js"), encoding="utf-8") as f:
+        match = re.search(r"CACHE_NAME\s*=\s*['\"]([^'\"]+)['\"]", f.read())
+    return match.group(1) if match else "neon-arcade-v1"
+
+
+_CACHE_STATS_JS = """async (name) => {
+    const sizes = window.__harnessSwSizes = window.__harnessSwSizes || {};
+    const cache = await caches.open(name);
+    const urls = (await cache.keys()).map(r => r.url);
+    for (const url of urls) {
+        if (!(url in sizes)) {
+            const response = await cache.match(url);
+            sizes[url] = response ? (await response.blob()).size : 0;
+        }
+    }
+    const estimate = navigator.storage && navigator.storage.estimate ? await navigator.storage.estimate() : {};
+    return { urls, entries: urls.length, bytes: urls.reduce((n, u) => n + (sizes[u] || 0), 0),
+             usage: estimate.usage ?? null };
+}"""
+
+
+_RESET_JS = """async () => {
+    for (const registration of await navigator.serviceWorker.getRegistrations()) await registration.unregister();
+    for (const key of await caches.keys()) await caches.delete(key);
+}"""
+
+
+class SwNetworkLog:
+    """Page requests over CDP, tagged with the current phase."""
+
+    def __init__(self, cdp):
+        self.phase = None
+        self.requests = []
+        self._by_id = {}
+        cdp.send("Network.enable")
+        cdp.on("Network.requestWillBeSent", self._sent)
+        cdp.on("Network.responseReceived", self._response)
+        cdp.on("Network.dataReceived", self._data)
+        cdp.on("Network.loadingFinished", self._finished)
+
+    def _sent(self, event):
+        url = event["request"]["url"]
+        if not url.startswith("http"):
+            return
+        request = {"phase": self.phase, "url": urldefrag(url)[0], "method": event["request"]["method"],
+                   "type": event.get("type"), "status": None, "source": "network", "bytes": 0, "encoded": 0}
+        self._by_id[event["requestId"]] = request
+        self.requests.append(request)
+
+    def _response(self, event):
+        request = self._by_id.get(event["requestId"])
+        if not request:
+            return
+        response = event["response"]
+        request["status"] = response.get("status")
+        if response.get("fromServiceWorker"):
+            cached = response.get("serviceWorkerResponseSource") == "cache-storage"
+            request["source"] = "sw-cache" if cached else "sw-network"
+        elif response.get("fromDiskCache") or response.get("fromPrefetchCache"):
+            request["source"] = "http-cache"
+
+    def _data(self, event):
+        request = self._by_id.get(event["requestId"])
+        if request:
+            request["bytes"] += event.get("dataLength", 0)
+
+    def _finished(self, event):
+        request = self._by_id.pop(event["requestId"], None)
+        if request:
+            request["encoded"] = event.get("encodedDataLength", 0)
+            request["bytes"] = request["bytes"] or request["encoded"]
+
+    def breakdown(self, phase):
+        rows = [r for r in self.requests if r["phase"] == phase]
+        out = {s: {"requests": 0, "bytes": 0} for s in SOURCES}
+        for r in rows:
+            out[r["source"]]["requests"] += 1
+            out[r["source"]]["bytes"] += r["bytes"]
+        total = sum(v["bytes"] for v in out.values())
+        out["total"] = {"requests": len(rows), "bytes": total}
+        out["hit_ratio"] = round(out["sw-cache"]["bytes"] / total, 3) if total else None
+        return out
+
+
+def skip_reason(request, origin):
+    """Why sw.js would not have cached this request (None if it should have)."""
+    if "google-analytics" in request["url"]:
+        return "excluded by sw.js (analytics)"
+    if request["method"] != "GET":
+        return f"{request['method']} (Cache.put only stores GET)"
+    if urlsplit(request["url"]).netloc != origin:
+        return "cross-origin (type !== 'basic')"
+    if request["status"] is None:
+        return "no response (failed or aborted)"
+    if request["status"] != 200:
+        return f"status {request['status']}"
+    return None
+
+
+def never_cached(requests, cached_urls, origin):
+    cached = set(cached_urls)
+    found = {}
+    for r in requests:
+        if r["url"] in cached:
+            continue
+        reason = skip_reason(r, origin) or "same-origin, not in cache"
+        entry = found.setdefault(r["url"], {"url": r["url"], "reason": reason, "requests": 0, "bytes": 0})
+        entry["requests"] += 1
+        entry["bytes"] += r["bytes"]
+    return sorted(found.values(), key=lambda e: (e["reason"], -e["bytes"]))
+
+
+def wait_controlled(page):
+    page.evaluate("navigator.serviceWorker.ready.then(() => true)")
+    page.wait_for_function("!!navigator.serviceWorker.controller")
+
+
+def launch_all(page, games, log, phase, name, growth=None):
+    log.phase = phase
+    for game_id in games:
+        try:
+            enter_game(page, game_id)
+            exit_game(page)
+        except Exception as e:
+            print(f"  {game_id}: {e}")
+            try:
+                page.evaluate("window.miniGameHub.transitionToState('MENU')")
+            except Exception:
+                pass
+        if growth is not None:
+            stats = page.evaluate(_CACHE_STATS_JS, name)
+            growth.append({"game": game_id, "entries": stats["entries"], "bytes": stats["bytes"], "usage": stats["usage"]})
+
+
+def run_session(page, patterns):
+    name = cache_name()
+    origin = urlsplit(page.url).netloc
+    cdp = cdp_session(page)
+    log = SwNetworkLog(cdp)
+
+    # hub_page() already loaded the hub once; start from no worker and no cache.
+    page.evaluate(_RESET_JS)
+    log.phase = "first-visit"
+    page.reload()
+    wait_hub_ready(page)
+    wait_controlled(page)
+
+    log.phase = "repeat-visit"
+    page.reload()
+    wait_hub_ready(page)
+
+    # System entries (trophy room, hall of fame, ...) load through the worker too.
+    games = game_ids(page, patterns)
+    growth = []
+    launch_all(page, games, log, "games", name, growth)
+
+    log.phase = "games-repeat"
+    page.reload()
+    wait_hub_ready(page)
+    launch_all(page, games, log, "games-repeat", name)
+
+    # The worker's cache.put()s finish after the responses are delivered.
+    page.wait_for_timeout(1000)
+    final = page.evaluate(_CACHE_STATS_JS, name)
+    return {
+        "cache": name,
+        "games": len(games),
+        "phases": {p: log.breakdown(p) for p in ("first-visit", "repeat-visit", "games", "games-repeat")},
+        "growth": growth,
+        "final": {k: final[k] for k in ("entries", "bytes", "usage")},
+        "never_cached": never_cached(log.requests, final["urls"], origin),
+    }
+
+
+def print_report(report):
+    print(f"\n{'phase':<14} " + " ".join(f"{s:>19}" for s in SOURCES) + f" {'hit ratio':>10}")
+    for phase, b in report["phases"].items():
+        cells = " ".join(f"{b[s]['requests']:5d} / {b[s]['bytes'] / 1024:9.0f}KB" for s in SOURCES)
+        ratio = f"{b['hit_ratio']:.0%}" if b["hit_ratio"] is not None else "-"
+        print(f"{phase:<14} {cells} {ratio:>10}")
+
+    growth = report["growth"]
+    if growth:
+        print(f"\nCache growth over {len(growth)} game launches: "
+              f"{growth[0]['entries']} -> {growth[-1]['entries']} entries, "
+              f"{growth[0]['bytes'] / 1e6:.1f} -> {growth[-1]['bytes'] / 1e6:.1f} MB")
+        steps = sorted(zip(growth, growth[1:]), key=lambda p: p[0]["bytes"] - p[1]["bytes"])[:5]
+        for prev, cur in steps:
+            if cur["bytes"] > prev["bytes"]:
+                print(f"  +{(cur['bytes'] - prev['bytes']) / 1024:8.0f} KB  {cur['game']}")
+
+    reasons = {}
+    for e in report["never_cached"]:
+        bucket = reasons.setdefault(e["reason"], [0, 0])
+        bucket[0] += 1
+        bucket[1] += e["bytes"]
+    print(f"\nNever cached: {len(report['never_cached'])} URLs")
+    for reason, (count, size) in sorted(reasons.items(), key=lambda kv: -kv[1][1]):
+        print(f"  {count:4d} URLs {size / 1024:9.0f} KB  {reason}")
+    for e in report["never_cached"]:
+        if e["reason"] == "same-origin, not in cache":
+            print(f"    {e['url']}")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Measure how much sw.js serves from its cache.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    with hub_page(service_workers="allow") as page:
+        report = run_session(page, args.games)
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(report, f, indent=1)
+    print_report(report)
+
+    for phase in ("repeat-visit", "games-repeat"):
+        if report["phases"][phase]["hit_ratio"] is not None:
+            harness_metrics.record("sw.hit_ratio", report["phases"][phase]["hit_ratio"], phase=phase)
+    harness_metrics.record("sw.cache_bytes", report["final"]["bytes"])
+    harness_metrics.record("sw.never_cached", len(report["never_cached"]))
+
+    missing = [e for e in report["never_cached"] if e["reason"] == "same-origin, not in cache"]
+    print(f"\nReport: {args.out}")
+    return 1 if missing else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
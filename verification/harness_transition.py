@@ -0,0 +1,217 @@
+"""Game transition latency benchmark for `transitionToState`.
+
+js/main.js brackets both directions of a game transition with User Timing
+marks:
+
+    MENU -> IN_GAME   enter-start, import-start, import-end, construct-end,
+                      init-end, first-frame
+    IN_GAME -> MENU   shutdown-start, shutdown-end, menu-ready
+
+Each game is entered and left `--reps` times per module state:
+
+    warm  the game module is already in the module map (one unmeasured
+          launch first), so only construct/init/first frame remain
+    cold  the hub is reloaded with the HTTP cache disabled before every
+          launch, so the import fetches, parses and evaluates the module again.
+          The page blocks service workers: sw.js would otherwise serve every
+          rep after the first from Cache Storage, with V8's code cache
+
+Phases reported (ms, p50 over reps):
+
+    enter: setup (enter-start -> import-start), import, construct, init,
+           first_frame, total (enter-start -> first-frame)
+    exit:  shutdown, menu (shutdown-end -> menu-ready), total
+
+Regressions are flagged with harness_baseline's Mann-Whitney gate. Every rep
+is a sample of `transition.enter_ms` / `transition.exit_ms` tagged with game
+and mode. `--record` stores them for HEAD and `--base REF` compares against a
+recorded commit. The exact one-sided Mann-Whitney test needs at least 4
+samples per side to reach p < 0.05 (3 vs 3 bottoms out at exactly 0.05), so
+`--cold-reps` below 4 leaves cold keys ungated; the default of 5 adds one rep
+of headroom:
+
+    python verification/harness_transition.py [--reps 10] [--cold-reps 5] [--record] [--base main] [game-glob ...]
+"""
+import argparse
+import json
+import os
+import sys
+
+import harness_metrics
+from harness_baseline import BaselineStore, compare, metric_key, resolve_commit
+from harness_frames import percentile
+from harness_ready import enter_game, exit_game, wait_hub_ready
+from harness_server import REPO_ROOT
+from harness_session import cdp_session, game_ids, hub_page
+
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "transition.json")
+MODES = ("warm", "cold")
+
+ENTER_PHASES = (
+    ("setup", "enter-start", "import-start"),
+    ("import", "import-start", "import-end"),
+    ("construct", "import-end", "construct-end"),
+    ("init", "construct-end", "init-end"),
+    ("first_frame", "init-end", "first-frame"),
+    ("total", "enter-start", "first-frame"),
+)
+EXIT_PHASES = (
+    ("shutdown", "shutdown-start", "shutdown-end"),
+    ("menu", "shutdown-end", "menu-ready"),
+    ("total", "shutdown-start", "menu-ready"),
+)
+
+_TAKE_MARKS_JS = """gameId => {
+    const prefix = `game:${gameId}:`;
+    const marks = Object.fromEntries(performance.getEntriesByType('mark')
+        .filter(m => m.name.startsWith(prefix))
+        .map(m => [m.name.slice(prefix.length), m.startTime]));
+    performance.clearMarks();
+    return marks;
+}"""
+
+
+def phases(marks, spec):
+    out = {}
+    for name, start, end in spec:
+        if start in marks and end in marks:
+            out[name] = round(marks[end] - marks[start], 2)
+    return out
+
+
+def transition(page, game_id):
+    """One MENU -> game -> MENU round trip; returns (enter, exit) phase dicts."""
+    page.evaluate("performance.clearMarks()")
+    enter_game(page, game_id)
+    enter = phases(page.evaluate(_TAKE_MARKS_JS, game_id), ENTER_PHASES)
+    exit_game(page)
+    leave = phases(page.evaluate(_TAKE_MARKS_JS, game_id), EXIT_PHASES)
+    return enter, leave
+
+
+def bench_game(page, cdp, game_id, mode, reps):
+    samples = []
+    if mode == "warm":
+        transition(page, game_id)  # load the module once
+    for _ in range(reps):
+        if mode == "cold":
+            cdp.send("Network.setCacheDisabled", {"cacheDisabled": True})
+            page.reload()
+            wait_hub_ready(page)
+        samples.append(transition(page, game_id))
+    if mode == "cold":
+        cdp.send("Network.setCacheDisabled", {"cacheDisabled": False})
+    return samples
+
+
+def summarize(samples):
+    def p50s(rows, spec):
+        return {name: percentile([r[name] for r in rows if name in r], 50) for name, _, _ in spec}
+
+    enters = [e for e, _ in samples]
+    exits = [x for _, x in samples]
+    return {
+        "enter": p50s(enters, ENTER_PHASES),
+        "exit": p50s(exits, EXIT_PHASES),
+        "enter_p95": percentile([e["total"] for e in enters if "total" in e], 95),
+        "exit_p95": percentile([x["total"] for x in exits if "total" in x], 95),
+    }
+
+
+def sample_rows(reports):
+    """Per-rep totals as harness metric rows, for BaselineStore/compare."""
+    rows = []
+    for r in reports:
+        for enter, leave in r.get("samples", []):
+            tags = {"game": r["game"], "mode": r["mode"]}
+            if "total" in enter:
+                rows.append({"name": "transition.enter_ms", "value": enter["total"], "tags": tags})
+            if "total" in leave:
+                rows.append({"name": "transition.exit_ms", "value": leave["total"], "tags": tags})
+    return rows
+
+
+def _ms(value):
+    return f"{value:8.1f}" if value is not None else f"{'-':>8}"
+
+
+def print_report(reports, regressed):
+    enter_cols = [name for name, _, _ in ENTER_PHASES]
+    exit_cols = [name for name, _, _ in EXIT_PHASES]
+    print(f"\n{'game':<26} {'mode':<5} " + " ".join(f"{c[:8]:>8}" for c in enter_cols)
+          + f" {'enter95':>8} | " + " ".join(f"{c[:8]:>8}" for c in exit_cols) + "  (p50 ms)")
+    for r in reports:
+        if "error" in r:
+            print(f"{r['game']:<26} {r['mode']:<5} ERROR {r['error']}")
+            continue
+        s = r["summary"]
+        flags = [d for d in ("enter", "exit") if (r["game"], r["mode"], d) in regressed]
+        print(f"{r['game']:<26} {r['mode']:<5} " + " ".join(_ms(s["enter"][c]) for c in enter_cols)
+              + f" {_ms(s['enter_p95'])} | " + " ".join(_ms(s["exit"][c]) for c in exit_cols)
+              + (f"  REGRESSION ({', '.join(flags)})" if flags else ""))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark MENU <-> IN_GAME transition latency per game.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--reps", type=int, default=10, help="warm repetitions per game")
+    parser.add_argument("--cold-reps", type=int, default=5,
+                        help="cold repetitions per game (each reloads the hub; at least 4 for the gate)")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    parser.add_argument("--record", action="store_true", help="store the samples as the HEAD baseline")
+    parser.add_argument("--base", help="flag regressions against the baseline recorded for this git ref")
+    parser.add_argument("--min-effect", type=float, default=0.10, help="smallest relative slowdown to flag")
+    parser.add_argument("--out", default=OUT_PATH)
+    args = parser.parse_args(argv)
+
+    reports = []
+    with hub_page(service_workers="block") as page:
+        cdp = cdp_session(page)
+        cdp.send("Network.enable")
+        for game_id in game_ids(page, args.games, include_system=False):
+            for mode in args.modes:
+                reps = args.reps if mode == "warm" else args.cold_reps
+                try:
+                    samples = bench_game(page, cdp, game_id, mode, reps)
+                except Exception as e:
+                    reports.append({"game": game_id, "mode": mode, "error": str(e)})
+                    page.reload()
+                    wait_hub_ready(page)
+                    continue
+                summary = summarize(samples)
+                reports.append({"game": game_id, "mode": mode, "summary": summary, "samples": samples})
+                for direction in ("enter", "exit"):
+                    if summary[direction]["total"] is not None:
+                        harness_metrics.record(f"transition.{direction}_ms", round(summary[direction]["total"], 2),
+                                               game=game_id, mode=mode)
+            print(f"  measured {game_id}", flush=True)
+
+    head = {}
+    for row in sample_rows(reports):
+        head.setdefault(metric_key(row["name"], row["tags"]), []).append(row["value"])
+    regressed = set()
+    if args.base:
+        base = BaselineStore().samples(resolve_commit(args.base))
+        for row in compare(base, head, min_effect=args.min_effect):
+            if row["verdict"] == "REGRESSION":
+                name, tags = row["key"].split("[", 1)
+                tags = dict(t.split("=", 1) for t in tags.rstrip("]").split(","))
+                regressed.add((tags["game"], tags["mode"], name.split(".")[1].split("_")[0]))
+    if args.record:
+        store = BaselineStore()
+        stored = store.add(resolve_commit("HEAD"), sample_rows(reports))
+        store.save()
+        print(f"Recorded {stored} samples for HEAD.")
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump({"reps": args.reps, "cold_reps": args.cold_reps, "base": args.base,
+                   "regressions": sorted(map(list, regressed)), "games": reports}, f, indent=1)
+    print_report(reports, regressed)
+    errors = [r for r in reports if "error" in r]
+    print(f"\n{len(regressed)} regressions, {len(errors)} errors. Report: {args.out}")
+    return 1 if regressed or errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,240 @@
+"""Visual regression engine for verification screenshots.
+
+Golden images live in verification/goldens/<game>/<view>.png. Candidates are
+read from a directory laid out the same way, or flat (`<game>.png`, view
+"default") like verification/screenshots/. Each pair is compared with
+vectorised NumPy:
+
+* per-pixel diff: share of unmasked pixels whose largest channel delta
+  exceeds `--pixel-threshold`;
+* perceptual hash: Hamming distance between 63-bit DCT hashes, taken after
+  the golden's pixels are copied into the candidate's masked areas;
+* block SSIM on luminance (reported, not gated).
+
+Animated regions (particles, clocks, scrolling tickers) are excluded with
+rectangles in verification/goldens/masks.json:
+
+    {"neon-swarm/default": [[0, 0, 1280, 40]], "*/default": [[1180, 0, 100, 40]]}
+
+Pairs are compared in a process pool; a red heatmap of every failing pair
+(masked areas tinted blue) is written to verification/.harness/visual/.
+
+    python verification/harness_visual.py compare verification/screenshots
+    python verification/harness_visual.py approve verification/screenshots [game ...]
+
+Needs NumPy and Pillow on top of Playwright: `pip install numpy Pillow`.
+"""
+import argparse
+import fnmatch
+import json
+import os
+import shutil
+import sys
+from concurrent.futures import ProcessPoolExecutor
+
+try:
+    import numpy as np
+    from PIL import Image
+except ImportError as e:
+    raise ImportError(f"harness_visual needs NumPy and Pillow (pip install numpy Pillow): {e}") from e
+
+from harness_server import REPO_ROOT
+
+GOLDEN_DIR = os.path.join(REPO_ROOT, "verification", "goldens")
+MASKS_PATH = os.path.join(GOLDEN_DIR, "masks.json")
+OUT_DIR = os.path.join(REPO_ROOT, "verification", ".harness", "visual")
+DEFAULT_VIEW = "default"
+
+_LUMA = np.array([0.299, 0.587, 0.114], dtype=np.float32)
+
+
+def load_rgb(path):
+    with Image.open(path) as im:
+        return np.asarray(im.convert("RGB"), dtype=np.float32)
+
+
+def build_mask(shape, rects):
+    """Boolean mask, True where pixels are compared."""
+    mask = np.ones(shape[:2], dtype=bool)
+    for x, y, w, h in rects:
+        mask[max(0, y):max(0, y + h), max(0, x):max(0, x + w)] = False
+    return mask
+
+
+def _dct_matrix(n):
+    k = np.arange(n)[:, None]
+    i = np.arange(n)[None, :]
+    m = np.cos(np.pi * (2 * i + 1) * k / (2 * n)) * np.sqrt(2 / n)
+    m[0] /= np.sqrt(2)
+    return m
+
+
+_DCT32 = _dct_matrix(32)
+
+
+def phash(rgb):
+    """63-bit perceptual hash: the low 8x8 DCT band minus its DC term, against its median."""
+    gray = Image.fromarray((rgb @ _LUMA).astype(np.uint8)).resize((32, 32), Image.LANCZOS)
+    coeffs = _DCT32 @ np.asarray(gray, dtype=np.float32) @ _DCT32.T
+    low = coeffs[:8, :8].flatten()
+    return low[1:] > np.median(low[1:])
+
+
+def block_ssim(a, b, mask, block=8):
+    """Mean SSIM over non-overlapping luminance blocks that are fully unmasked."""
+    ya, yb = a @ _LUMA, b @ _LUMA
+    h, w = (ya.shape[0] // block) * block, (ya.shape[1] // block) * block
+    shape = (h // block, block, w // block, block)
+    ba = ya[:h, :w].reshape(shape).transpose(0, 2, 1, 3).reshape(h // block, w // block, -1)
+    bb = yb[:h, :w].reshape(shape).transpose(0, 2, 1, 3).reshape(h // block, w // block, -1)
+    keep = mask[:h, :w].reshape(shape).transpose(0, 2, 1, 3).reshape(h // block, w // block, -1).all(-1)
+    if not keep.any():
+        return 1.0
+    ba, bb = ba[keep], bb[keep]
+    mu_a, mu_b = ba.mean(-1), bb.mean(-1)
+    var_a, var_b = ba.var(-1), bb.var(-1)
+    cov = ((ba - mu_a[:, None]) * (bb - mu_b[:, None])).mean(-1)
+    c1, c2 = (0.01 * 255) ** 2, (0.03 * 255) ** 2
+    ssim = ((2 * mu_a * mu_b + c1) * (2 * cov + c2)) / ((mu_a ** 2 + mu_b ** 2 + c1) * (var_a + var_b + c2))
+    return float(ssim.mean())
+
+
+def heatmap(candidate, delta, mask):
+    """Grayscale candidate with differences in red and masked areas in blue."""
+    base = np.repeat((candidate @ _LUMA)[..., None] * 0.4, 3, axis=-1)
+    intensity = np.clip(delta / max(float(delta.max()), 1.0), 0, 1)
+    base[..., 0] = np.maximum(base[..., 0], intensity * 255)
+    base[~mask, 2] = np.maximum(base[~mask, 2], 120)
+    return Image.fromarray(base.astype(np.uint8))
+
+
+def compare_pair(job):
+    """Compare one golden/candidate pair; returns a JSON-friendly result."""
+    key, golden_path, candidate_path, rects, opts = job
+    result = {"key": key, "golden": golden_path, "candidate": candidate_path}
+    golden, candidate = load_rgb(golden_path), load_rgb(candidate_path)
+    if golden.shape != candidate.shape:
+        result.update(passed=False, reason=f"size {candidate.shape[1]}x{candidate.shape[0]} "
+                                           f"!= golden {golden.shape[1]}x{golden.shape[0]}")
+        return result
+
+    mask = build_mask(golden.shape, rects)
+    delta = np.abs(golden - candidate).max(axis=-1)
+    changed = (delta > opts["pixel_threshold"]) & mask
+    compared = int(mask.sum()) or 1
+    ratio = float(changed.sum()) / compared
+    # Masked areas take the golden's pixels so animation there cannot move the hash.
+    distance = int(np.count_nonzero(phash(golden) != phash(np.where(mask[..., None], candidate, golden))))
+    result.update(
+        diff_ratio=round(ratio, 6),
+        phash_distance=distance,
+        ssim=round(block_ssim(golden, candidate, mask), 4),
+    )
+    result["passed"] = ratio <= opts["max_diff_ratio"] and distance <= opts["max_hash_distance"]
+    if not result["passed"]:
+        reasons = []
+        if ratio > opts["max_diff_ratio"]:
+            reasons.append(f"{ratio:.2%} pixels differ")
+        if distance > opts["max_hash_distance"]:
+            reasons.append(f"phash distance {distance}")
+        result["reason"] = ", ".join(reasons)
+        os.makedirs(opts["out_dir"], exist_ok=True)
+        out = os.path.join(opts["out_dir"], key.replace("/", "__") + ".diff.png")
+        heatmap(candidate, np.where(mask, delta, 0), mask).save(out, optimize=False)
+        result["heatmap"] = out
+    return result
+
+
+def image_key(root, path):
+    """<game>/<view> for nested layouts, <stem>/default for flat ones."""
+    rel = os.path.relpath(path, root)[:-len(".png")].replace(os.sep, "/")
+    return rel if "/" in rel else f"{rel}/{DEFAULT_VIEW}"
+
+
+def list_images(root):
+    found = {}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            if name.endswith(".png") and not name.endswith(".diff.png"):
+                path = os.path.join(dirpath, name)
+                found[image_key(root, path)] = path
+    return found
+
+
+def load_masks(path=MASKS_PATH):
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return {}
+
+
+def rects_for(masks, key):
+    return [rect for pattern, rects in masks.items() if fnmatch.fnmatch(key, pattern) for rect in rects]
+
+
+def compare_dirs(candidate_dir, golden_dir=GOLDEN_DIR, workers=None, **opts):
+    goldens, candidates = list_images(golden_dir), list_images(candidate_dir)
+    masks = load_masks(os.path.join(golden_dir, "masks.json"))
+    jobs = [(key, goldens[key], candidates[key], rects_for(masks, key), opts)
+            for key in sorted(candidates) if key in goldens]
+    missing = sorted(set(candidates) - set(goldens))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        results = list(pool.map(compare_pair, jobs, chunksize=4))
+    return results, missing
+
+
+def approve(candidate_dir, patterns=None, golden_dir=GOLDEN_DIR):
+    approved = []
+    for key, path in sorted(list_images(candidate_dir).items()):
+        if patterns and not any(fnmatch.fnmatch(key, p) or fnmatch.fnmatch(key.split("/")[0], p) for p in patterns):
+            continue
+        dest = os.path.join(golden_dir, *key.split("/")) + ".png"
+        os.makedirs(os.path.dirname(dest), exist_ok=True)
+        shutil.copyfile(path, dest)
+        approved.append(key)
+    return approved
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare screenshots against golden images.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    cmp_ = sub.add_parser("compare")
+    cmp_.add_argument("candidates")
+    cmp_.add_argument("--goldens", default=GOLDEN_DIR)
+    cmp_.add_argument("--pixel-threshold", type=float, default=24, help="per-channel delta (0-255) that counts as changed")
+    cmp_.add_argument("--max-diff-ratio", type=float, default=0.01)
+    cmp_.add_argument("--max-hash-distance", type=int, default=6)
+    cmp_.add_argument("-j", "--workers", type=int, default=None)
+    cmp_.add_argument("--out", default=OUT_DIR)
+    apr = sub.add_parser("approve", help="promote candidates to goldens")
+    apr.add_argument("candidates")
+    apr.add_argument("patterns", nargs="*", help="key or game globs (default: all)")
+    apr.add_argument("--goldens", default=GOLDEN_DIR)
+    args = parser.parse_args(argv)
+
+    if args.command == "approve":
+        approved = approve(args.candidates, args.patterns, args.goldens)
+        print(f"Approved {len(approved)} golden images.")
+        return 0
+
+    results, missing = compare_dirs(
+        args.candidates, args.goldens, args.workers, pixel_threshold=args.pixel_threshold,
+        max_diff_ratio=args.max_diff_ratio, max_hash_distance=args.max_hash_distance, out_dir=args.out,
+    )
+    for r in results:
+        status = "PASS" if r["passed"] else "FAIL"
+        detail = r.get("reason") or f"{r['diff_ratio']:.3%} diff, phash {r['phash_distance']}, ssim {r['ssim']}"
+        print(f"{status}  {r['key']:<40} {detail}")
+    for key in missing:
+        print(f"NEW   {key:<40} no golden (run `approve` to accept)")
+    failed = [r for r in results if not r["passed"]]
+    os.makedirs(args.out, exist_ok=True)
+    with open(os.path.join(args.out, "summary.json"), "w") as f:
+        json.dump({"results": results, "missing": missing}, f, indent=2)
+    print(f"\n{len(results) - len(failed)}/{len(results)} passed, {len(missing)} without golden. Heatmaps: {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
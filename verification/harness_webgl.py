@@ -0,0 +1,265 @@
+"""WebGL resource accounting across game transitions.
+
+The modules that render with three.js mix the global r128 build, the
+importmap `three` module and a pinned jsdelivr copy, so no single
+`WebGLRenderer` class can be wrapped for all of them. The init script below
+therefore counts at the WebGL API, which every renderer goes through:
+
+* live contexts, textures, buffers, programs, shaders, framebuffers,
+  renderbuffers and vertex arrays, per context, with lost contexts released;
+* draw calls and triangles per animation frame, with running peaks.
+
+Renderers built from the global `THREE` are additionally registered so their
+`renderer.info` (geometries, textures, programs, calls, triangles) is
+reported too.
+
+Verification mode enters each game, measures peak per-frame draw calls and
+triangles against verification/webgl_budgets.json, returns to the menu and
+asserts the live GL resource counts are back at the menu baseline:
+
+    python verification/harness_webgl.py [--dwell 2] [game-glob ...]
+"""
+import argparse
+import json
+import os
+import sys
+
+import harness_metrics
+from harness_ready import enter_game, exit_game
+from harness_server import REPO_ROOT
+from harness_session import game_ids, hub_page
+
+BUDGETS_PATH = os.path.join(REPO_ROOT, "verification", "webgl_budgets.json")
+OUT_PATH = os.path.join(REPO_ROOT, "verification", ".harness", "webgl.json")
+
+RESOURCES = ("Texture", "Buffer", "Program", "Shader", "Framebuffer", "Renderbuffer", "VertexArray")
+
+INSTRUMENT_JS = """(() => {
+    if (window.__harnessGL) return;
+    const RESOURCES = %s;
+    const contexts = new Set();
+    const frame = { calls: 0, triangles: 0 };
+    const peaks = { calls: 0, triangles: 0, frames: 0 };
+    const renderers = [];
+    const stateOf = (gl) => {
+        if (!gl.__harness) {
+            gl.__harness = { lost: false, live: Object.fromEntries(RESOURCES.map(r => [r, 0])) };
+            contexts.add(gl);
+        }
+        return gl.__harness;
+    };
+
+    const TRIANGLES = 4, TRIANGLE_STRIP = 5, TRIANGLE_FAN = 6;
+    const triangles = (mode, count, instances = 1) => {
+        if (mode === TRIANGLES) return Math.floor(count / 3) * instances;
+        if (mode === TRIANGLE_STRIP || mode === TRIANGLE_FAN) return Math.max(0, count - 2) * instances;
+        return 0;
+    };
+
+    const patch = (proto) => {
+        if (!proto) return;
+        for (const r of RESOURCES) {
+            const create = proto['create' + r], del = proto['delete' + r];
+            if (!create) continue;
+            proto['create' + r] = function (...a) {
+                const obj = create.apply(this, a);
+                if (obj) stateOf(this).live[r]++;
+                return obj;
+            };
+            proto['delete' + r] = function (obj) {
+                if (obj && !obj.__harnessDeleted) {
+                    obj.__harnessDeleted = true;
+                    stateOf(this).live[r]--;
+                }
+                return del.call(this, obj);
+            };
+        }
+        const draws = {
+            drawArrays: (a) => triangles(a[0], a[2]),
+            drawElements: (a) => triangles(a[0], a[1]),
+            drawArraysInstanced: (a) => triangles(a[0], a[2], a[3]),
+            drawElementsInstanced: (a) => triangles(a[0], a[1], a[4]),
+            drawRangeElements: (a) => triangles(a[0], a[3]),
+        };
+        for (const [name, tris] of Object.entries(draws)) {
+            const orig = proto[name];
+            if (!orig) continue;
+            proto[name] = function (...a) {
+                frame.calls++;
+                frame.triangles += tris(a);
+                return orig.apply(this, a);
+            };
+        }
+    };
+    patch(window.WebGLRenderingContext && WebGLRenderingContext.prototype);
+    patch(window.WebGL2RenderingContext && WebGL2RenderingContext.prototype);
+
+    const getContext = HTMLCanvasElement.prototype.getContext;
+    HTMLCanvasElement.prototype.getContext = function (type, ...rest) {
+        const ctx = getContext.call(this, type, ...rest);
+        if (ctx && /webgl/.test(type)) {
+            stateOf(ctx);
+            this.addEventListener('webglcontextlost', () => { stateOf(ctx).lost = true; });
+        }
+        return ctx;
+    };
+
+    const tick = () => {
+        peaks.calls = Math.max(peaks.calls, frame.calls);
+        peaks.triangles = Math.max(peaks.triangles, frame.triangles);
+        if (frame.calls) peaks.frames++;
+        frame.calls = 0;
+        frame.triangles = 0;
+        requestAnimationFrame(tick);
+    };
+    requestAnimationFrame(tick);
+
+    // Register renderers created from the global (r128) THREE build.
+    const wrapThree = () => {
+        const T = window.THREE;
+        if (!T || !T.WebGLRenderer || T.WebGLRenderer.__harness) return;
+        const Orig = T.WebGLRenderer;
+        const Wrapped = function (...a) {
+            const r = new Orig(...a);
+            const entry = { ref: new WeakRef(r), disposed: false };
+            const dispose = r.dispose.bind(r);
+            r.dispose = () => { entry.disposed = true; return dispose(); };
+            renderers.push(entry);
+            return r;
+        };
+        Wrapped.prototype = Orig.prototype;
+        Wrapped.__harness = true;
+        try { T.WebGLRenderer = Wrapped; } catch (e) { /* frozen namespace */ }
+    };
+    document.addEventListener('DOMContentLoaded', wrapThree);
+    wrapThree();
+
+    window.__harnessGL = {
+        snapshot() {
+            const live = Object.fromEntries(RESOURCES.map(r => [r, 0]));
+            let liveContexts = 0;
+            for (const gl of contexts) {
+                const s = gl.__harness;
+                if (s.lost || (gl.isContextLost && gl.isContextLost())) continue;
+                liveContexts++;
+                for (const r of RESOURCES) live[r] += s.live[r];
+            }
+            const info = renderers
+                .map(e => ({ r: e.ref.deref(), disposed: e.disposed }))
+                .filter(e => e.r && !e.disposed)
+                .map(({ r }) => ({
+                    geometries: r.info.memory.geometries,
+                    textures: r.info.memory.textures,
+                    programs: r.info.programs ? r.info.programs.length : 0,
+                    calls: r.info.render.calls,
+                    triangles: r.info.render.triangles,
+                }));
+            return { contexts: liveContexts, live, peaks: { ...peaks }, renderers: info };
+        },
+        resetPeaks() {
+            peaks.calls = 0; peaks.triangles = 0; peaks.frames = 0;
+        },
+    };
+})();""" % json.dumps(list(RESOURCES))
+
+
+def snapshot(page):
+    return page.evaluate("window.__harnessGL.snapshot()")
+
+
+def reset_peaks(page):
+    page.evaluate("window.__harnessGL.resetPeaks()")
+
+
+def load_budgets(path=BUDGETS_PATH):
+    with open(path, encoding="utf-8") as f:
+        budgets = json.load(f)
+    return budgets
+
+
+def budget_for(budgets, game_id):
+    return {**budgets.get("default", {}), **budgets.get("games", {}).get(game_id, {})}
+
+
+def resource_delta(before, after):
+    delta = {r: after["live"][r] - before["live"][r] for r in RESOURCES}
+    delta["contexts"] = after["contexts"] - before["contexts"]
+    return {k: v for k, v in delta.items() if v}
+
+
+def check_game(page, game_id, budget, dwell_ms):
+    before = snapshot(page)
+    enter_game(page, game_id)
+    reset_peaks(page)
+    page.wait_for_timeout(dwell_ms)
+    in_game = snapshot(page)
+    exit_game(page)
+    # Let one frame pass so context-loss events and deferred disposals land.
+    page.evaluate("() => new Promise(r => requestAnimationFrame(() => requestAnimationFrame(r)))")
+    after = snapshot(page)
+
+    peaks = in_game["peaks"]
+    problems = []
+    leaked = resource_delta(before, after)
+    tolerance = budget.get("resource_tolerance", 0)
+    if any(v > tolerance for v in leaked.values()):
+        problems.append("leaked " + ", ".join(f"{k}+{v}" for k, v in leaked.items() if v > tolerance))
+    if peaks["calls"] > budget["draw_calls"]:
+        problems.append(f"draw calls {peaks['calls']} > {budget['draw_calls']}")
+    if peaks["triangles"] > budget["triangles"]:
+        problems.append(f"triangles {peaks['triangles']} > {budget['triangles']}")
+
+    harness_metrics.record("webgl.peak_draw_calls", peaks["calls"], game=game_id)
+    harness_metrics.record("webgl.peak_triangles", peaks["triangles"], game=game_id)
+    harness_metrics.record("webgl.leaked_resources", sum(max(0, v) for v in leaked.values()), game=game_id)
+    return {
+        "game": game_id,
+        "webgl": bool(peaks["frames"]),
+        "peak_draw_calls": peaks["calls"],
+        "peak_triangles": peaks["triangles"],
+        "in_game_live": in_game["live"],
+        "renderers": in_game["renderers"],
+        "leaked": leaked,
+        "problems": problems,
+    }
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Check WebGL resource cleanup and per-frame budgets.")
+    parser.add_argument("games", nargs="*", help="registry ID globs (default: all)")
+    parser.add_argument("--dwell", type=float, default=2.0, help="seconds to render in each game")
+    parser.add_argument("--budgets", default=BUDGETS_PATH)
+    parser.add_argument("--out", default=OUT_PATH)
+    parser.add_argument("--all", action="store_true", help="also list games that never touched WebGL")
+    args = parser.parse_args(argv)
+    budgets = load_budgets(args.budgets)
+
+    reports = []
+    with hub_page(init_scripts=[INSTRUMENT_JS]) as page:
+        for game_id in game_ids(page, args.games):
+            try:
+                reports.append(check_game(page, game_id, budget_for(budgets, game_id), args.dwell * 1000))
+            except Exception as e:
+                reports.append({"game": game_id, "webgl": True, "problems": [f"error: {e}"]})
+                try:
+                    exit_game(page)
+                except Exception:
+                    pass
+
+    os.makedirs(os.path.dirname(args.out), exist_ok=True)
+    with open(args.out, "w") as f:
+        json.dump(reports, f, indent=2)
+
+    print(f"{'game':<28} {'calls':>7} {'triangles':>10}  result")
+    for r in reports:
+        if not r.get("webgl") and not r["problems"] and not args.all:
+            continue
+        status = "; ".join(r["problems"]) or "OK"
+        print(f"{r['game']:<28} {r.get('peak_draw_calls', 0):7d} {r.get('peak_triangles', 0):10d}  {status}")
+    failed = [r for r in reports if r["problems"]]
+    print(f"\n{len(failed)} games over budget or not releasing WebGL resources. Report: {args.out}")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
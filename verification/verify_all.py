@@ -1,38 +1,17 @@
 
 import asyncio
-import os
-import subprocess
-import sys
-import time
 from playwright.async_api import async_playwright
-
-def start_server():
-    """Starts a local HTTP server."""
-    # check if port 8000 is in use
-    try:
-        subprocess.check_output(["lsof", "-t", "-i", ":8000"])
-        print("Port 8000 is in use. Killing process...")
-        subprocess.call(["kill", "$(lsof -t -i :8000)"], shell=True)
-        time.sleep(1)
-    except subprocess.CalledProcessError:
-        pass
-
-    process = subprocess.Popen([sys.executable, "-m", "http.server", "8000"],
-                               stdout=subprocess.DEVNULL,
-                               stderr=subprocess.DEVNULL)
-    time.sleep(2) # Wait for server to start
-    return process
+from harness_browser import async_browser_context
+from harness_ready import async_exit_game, async_signal_count, async_wait_for_signal
+from harness_server import serve
 
 async def run_test():
-    server_process = start_server()
-
-    try:
-        async with async_playwright() as p:
-            browser = await p.chromium.launch(headless=True)
-            context = await browser.new_context(
-                viewport={'width': 1280, 'height': 720},
-                user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-            )
+    with serve() as base_url:
+        async with async_playwright() as p, async_browser_context(
+            p,
+            viewport={'width': 1280, 'height': 720},
+            user_agent='Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+        ) as context:
             page = await context.new_page()
 
             # Enable console logging
@@ -40,7 +19,7 @@ async def run_test():
             page.on("pageerror", lambda exc: print(f"ERROR: {exc}"))
 
             print("Loading Hub...")
-            await page.goto("http://localhost:8000/index.html")
+            await page.goto(f"{base_url}/index.html")
             await page.wait_for_load_state("networkidle")
 
             # 1. Verify Store
@@ -91,8 +70,9 @@ async def run_test():
             hf_card = page.locator("h3", has_text="Hall of Fame")
             if await hf_card.count() > 0:
                 print("SUCCESS: Hall of Fame card found.")
+                after = await async_signal_count(page, "first-frame-drawn")
                 await hf_card.click()
-                await page.wait_for_timeout(2000)
+                await async_wait_for_signal(page, "first-frame-drawn", after, replaced_ms=2000)
                 await page.screenshot(path="verification/verify_hof_loaded.png")
 
                 # Check for "HIGH_SCORE_DATABASE"
@@ -105,8 +85,7 @@ async def run_test():
                 # Exit HOF
                 # HOF has a back button or exit button?
                 # In HallOfFame.js (from my memory/trace) it has "EXIT SYSTEM".
-                await page.evaluate("window.miniGameHub.goBack()")
-                await page.wait_for_timeout(1000)
+                await async_exit_game(page)
             else:
                 print("FAILURE: Hall of Fame card not found.")
 
@@ -114,8 +93,9 @@ async def run_test():
             print("Testing Trophy Room Transition...")
             # We are in Grid View now.
             # Click Trophy Button in Menu
+            after = await async_signal_count(page, "first-frame-drawn")
             await page.click("#trophy-btn-menu")
-            await page.wait_for_timeout(3000) # Wait for 3D load
+            await async_wait_for_signal(page, "first-frame-drawn", after, replaced_ms=3000) # Wait for 3D load
 
             # Check if TrophyRoom canvas is active?
             # TrophyRoom creates a new canvas or attaches to #trophy-room-container
@@ -133,14 +113,9 @@ async def run_test():
             # Exit Trophy Room
             # Trophy Room should have an exit mechanism (Exit Area or similar)
             # Or we can just go back via console for this test
-            await page.evaluate("window.miniGameHub.goBack()")
-            await page.wait_for_timeout(1000)
+            await async_exit_game(page)
 
             print("All verifications complete.")
 
-            await browser.close()
-    finally:
-        server_process.kill()
-
 if __name__ == "__main__":
     asyncio.run(run_test())
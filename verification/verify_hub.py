@@ -1,13 +1,16 @@
+import sys
+
 from playwright.sync_api import sync_playwright, expect
-import time
+from harness_browser import browser_context
+from harness_server import serve
 
-def verify_hub(page):
+def verify_hub(page, base_url):
     # Capture console logs
     page.on("console", lambda msg: print(f"BROWSER LOG: {msg.text}"))
     page.on("pageerror", lambda err: print(f"BROWSER ERROR: {err}"))
 
     print("Navigating to hub...")
-    page.goto("http://localhost:8000")
+    page.goto(base_url)
 
     print("Waiting for loader...")
     # Click to dismiss loader
@@ -61,13 +64,11 @@ def verify_hub(page):
     print("Verification Complete.")
 
 if __name__ == "__main__":
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with serve() as base_url, sync_playwright() as p, browser_context(p) as context:
+        page = context.new_page()
         try:
-            verify_hub(page)
+            verify_hub(page, base_url)
         except Exception as e:
             print(f"Error: {e}")
             page.screenshot(path="verification/error.png")
-        finally:
-            browser.close()
+            sys.exit(1)
@@ -1,38 +1,16 @@
-import threading
-from http.server import HTTPServer, SimpleHTTPRequestHandler
 import sys
+import harness_metrics
 from playwright.sync_api import sync_playwright
-import time
-import socket
-
-def get_free_port():
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        s.bind(('', 0))
-        return s.getsockname()[1]
-
-# Use a fixed port to avoid complexity, but retry if busy?
-# The instructions say verify_hub expects 8000.
-PORT = 8000
-
-def run_server():
-    try:
-        server = HTTPServer(('localhost', PORT), SimpleHTTPRequestHandler)
-        server.serve_forever()
-    except OSError:
-        print(f"Port {PORT} in use, assuming server already running.")
+from harness_browser import browser_context
+from harness_ready import enter_game
+from harness_server import serve
 
 def verify():
-    # Start server in thread
-    server_thread = threading.Thread(target=run_server, daemon=True)
-    server_thread.start()
-    time.sleep(2) # Wait for server
-
-    with sync_playwright() as p:
-        browser = p.chromium.launch(headless=True)
-        page = browser.new_page()
+    with serve() as base_url, sync_playwright() as p, browser_context(p) as context:
+        page = context.new_page()
 
         try:
-            page.goto(f"http://localhost:{PORT}/index.html")
+            page.goto(f"{base_url}/index.html")
 
             # Dismiss loader
             try:
@@ -48,12 +26,8 @@ def verify():
             # Force 2D view
             page.evaluate("window.is3DView = false;")
 
-            # Enter game
-            page.evaluate("window.miniGameHub.transitionToState('IN_GAME', { gameId: 'neon-zip-game' })")
-            page.wait_for_selector("#neon-zip-game", state="visible", timeout=5000)
-
-            # Wait for game initialization
-            page.wait_for_timeout(1000)
+            # Enter game and wait for its first frame
+            enter_game(page, 'neon-zip-game')
 
             # Inject spy and test
             result = page.evaluate("""() => {
@@ -98,7 +72,16 @@ def verify():
                 ps.emit(100, 100, '#fff', 2500);
                 const limitCheck = ps.particles.length;
 
-                return { drawCheck, limitCheck };
+                // Timing sample for the baseline store: draw a full pool repeatedly.
+                const t0 = performance.now();
+                for (let i = 0; i < 50; i++) {
+                    ctx.save();
+                    ps.draw(ctx);
+                    ctx.restore();
+                }
+                const drawMs = (performance.now() - t0) / 50;
+
+                return { drawCheck, limitCheck, drawMs };
             }""")
 
             if 'error' in result:
@@ -107,6 +90,8 @@ def verify():
 
             print(f"Draw Check: {result['drawCheck']}")
             print(f"Particle Count (emit 2500): {result['limitCheck']}")
+            print(f"Full-pool draw: {result['drawMs']:.3f} ms")
+            harness_metrics.record("particles.full_draw_ms", round(result['drawMs'], 4), game='neon-zip-game')
 
             failed = False
 
@@ -136,8 +121,6 @@ def verify():
         except Exception as e:
             print(f"Error: {e}")
             sys.exit(1)
-        finally:
-            browser.close()
 
 if __name__ == "__main__":
     verify()